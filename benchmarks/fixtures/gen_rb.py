@@ -11,6 +11,7 @@ Existing files (preserved):
 
 import os
 import textwrap
+from concurrent.futures import ThreadPoolExecutor
 
 BASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "webapp_rb")
 
@@ -27,20 +28,63 @@ EXISTING_FILES = {
     "utils/logging.rb",
 }
 
+MAX_WORKERS = 8
+
+
+def _scan_existing(base):
+    """Return the relative paths of all files under ``base``, from a single walk."""
+    found = set()
+    for root, _, files in os.walk(base):
+        for name in files:
+            found.add(os.path.relpath(os.path.join(root, name), base).replace(os.sep, "/"))
+    return found
+
+
+# Files already on disk, so w() can skip them without a stat per call.
+ON_DISK = _scan_existing(BASE)
+
+# Manifest of (full_path, data) pairs queued by w() and written by flush().
+WRITES = []
+
 
 def w(path, content):
-    """Write a file only if it does not already exist."""
+    """Queue a file for writing only if it does not already exist.
+
+    ``content`` is dedented and encoded exactly once, here, and only for files
+    that are actually queued; skipped files never pay for it.
+
+    Returns the queued ``(full_path, data)`` pair, or None when skipped.
+    """
     if path in EXISTING_FILES:
         print(f"  SKIP (existing): {path}")
-        return
-    full = os.path.join(BASE, path)
-    if os.path.exists(full):
+        return None
+    if path in ON_DISK:
         print(f"  SKIP (on disk):  {path}")
-        return
-    os.makedirs(os.path.dirname(full), exist_ok=True)
-    with open(full, "w") as f:
-        f.write(textwrap.dedent(content).lstrip())
-    print(f"  CREATED: {path}")
+        return None
+    full = os.path.join(BASE, path)
+    entry = (full, textwrap.dedent(content).lstrip().encode())
+    WRITES.append(entry)
+    return entry
+
+
+def _write_one(entry):
+    full, data = entry
+    with open(full, "wb") as f:
+        f.write(data)
+    return full
+
+
+def flush(writes):
+    """Write every queued file, fanning out to a thread pool when there are several."""
+    for d in {os.path.dirname(full) for full, _ in writes}:
+        os.makedirs(d, exist_ok=True)
+    if len(writes) <= 1:
+        written = [_write_one(entry) for entry in writes]
+    else:
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
+            written = list(ex.map(_write_one, writes))
+    for full in written:
+        print(f"  CREATED: {os.path.relpath(full, BASE)}")
 
 
 # ─── utils/helpers.rb ───
@@ -56,6 +100,13 @@ w(
       Logging.get_logger(name)
     end
 
+    TICK_CLOCK = defined?(Process::CLOCK_MONOTONIC_COARSE) ? Process::CLOCK_MONOTONIC_COARSE : Process::CLOCK_MONOTONIC
+
+    # Current monotonic time in whole seconds; for TTL bookkeeping, not wall time.
+    def current_tick
+      Process.clock_gettime(TICK_CLOCK, :second)
+    end
+
     # Validate that a request hash has required fields.
     def validate_request(request)
       raise ArgumentError, 'Request must be a Hash' unless request.is_a?(Hash)
@@ -150,6 +201,17 @@ w(
         @field = field
         super(message, code: 400)
       end
+
+      @preallocated = {}
+
+      # Shared frozen instance for a fixed message. Its backtrace is set once,
+      # so raising it on hot failure paths skips capturing the stack.
+      def self.preallocated(message, field)
+        @preallocated[[message, field]] ||= new(message, field: field).tap do |err|
+          err.set_backtrace(["preallocated #{name}: #{message}"])
+          err.freeze
+        end
+      end
     end
 
     # Raised when a payment operation fails.
@@ -219,6 +281,13 @@ w(
     require_relative '../exceptions'
     require_relative 'pool'
 
+    # A statement prepared once on a connection and executed with new binds.
+    PreparedStatement = Struct.new(:connection, :sql) do
+      def execute(*params)
+        connection.execute_query(sql, params)
+      end
+    end
+
     # High-level database connection.
     class DatabaseConnection
       def initialize(pool)
@@ -244,6 +313,32 @@ w(
         end
       end
 
+      # Prepare a statement for repeated execution.
+      def prepare(sql)
+        get_logger('database.connection').info("Preparing: #{sql[0, 80]}...")
+        PreparedStatement.new(self, sql.frozen? ? sql : sql.dup.freeze)
+      end
+
+      # Execute one statement for each set of params on a single connection,
+      # like a prepared statement batch. Returns the total affected rows.
+      def execute_batch(sql, param_sets)
+        return 0 if param_sets.empty?
+
+        with_connection { param_sets.sum { |params| execute_query(sql, params)[:affected] } }
+      end
+
+      # Run the block against one pinned connection in a single transaction,
+      # committing on success and rolling back if it raises.
+      def with_connection
+        begin_transaction
+        result = yield self
+        commit
+        result
+      rescue StandardError
+        rollback
+        raise
+      end
+
       # Find a record by ID.
       def find_by_id(table, id)
         result = execute_query("SELECT * FROM #{table} WHERE id = ?", [id])
@@ -471,8 +566,12 @@ w(
 
     # Payment queries.
     class PaymentQueries
+      UPDATE_STATUS_SQL = 'UPDATE payments SET status = ? WHERE transaction_id = ?'
+      STATUS_BATCH_SIZE = 30
+
       def initialize(db)
         @db = db
+        @prepared = {}
       end
 
       def find_by_transaction_id(txn_id)
@@ -490,6 +589,26 @@ w(
         result[:rows]
       end
 
+      # Yield payments with the given status in pages of at most batch_size,
+      # using keyset pagination on transaction_id so no full result set is held
+      # and the caller can start work on the first page right away.
+      def stream_user_payments(status, batch_size: 500)
+        last_id = ''
+        loop do
+          result = @db.execute_query(
+            'SELECT * FROM payments WHERE status = ? AND transaction_id > ? ORDER BY transaction_id LIMIT ?',
+            [status, last_id, batch_size]
+          )
+          rows = result[:rows]
+          break if rows.empty?
+
+          yield rows
+          break if rows.length < batch_size
+
+          last_id = rows.last[:transaction_id]
+        end
+      end
+
       def create_payment(user_id, amount, currency, txn_id)
         @db.insert('payments', {
           user_id: user_id, amount: amount, currency: currency,
@@ -499,10 +618,27 @@ w(
 
       def update_status(txn_id, status)
         get_logger('database.queries').info("Updating payment #{txn_id} to #{status}")
-        result = @db.execute_query('UPDATE payments SET status = ? WHERE transaction_id = ?', [status, txn_id])
+        result = prepared(UPDATE_STATUS_SQL).execute(status, txn_id)
         result[:affected] > 0
       end
 
+      # Update many [transaction_id, status] pairs through one reused statement,
+      # flushing every STATUS_BATCH_SIZE rows and once more at the end.
+      def update_statuses(pairs)
+        get_logger('database.queries').info("Updating #{pairs.size} payment statuses")
+        affected = 0
+        batch = []
+        pairs.each_with_index do |(txn_id, status), i|
+          batch << [status, txn_id]
+          next unless ((i + 1) % STATUS_BATCH_SIZE).zero?
+
+          affected += @db.execute_batch(UPDATE_STATUS_SQL, batch)
+          batch = []
+        end
+        affected += @db.execute_batch(UPDATE_STATUS_SQL, batch) unless batch.empty?
+        affected
+      end
+
       def calculate_revenue(start_date, end_date)
         result = @db.execute_query(
           "SELECT SUM(amount) as total FROM payments WHERE status = 'completed' AND created_at BETWEEN ? AND ?",
@@ -511,6 +647,13 @@ w(
         row = result[:rows].first
         row ? (row[:total] || 0).to_f : 0.0
       end
+
+      private
+
+      # Prepared statements keyed by SQL text, so each is parsed only once.
+      def prepared(sql)
+        @prepared[sql] ||= @db.prepare(sql)
+      end
     end
     """,
 )
@@ -992,40 +1135,134 @@ w(
 
     # Central event bus.
     class EventDispatcher
+      NO_HANDLERS = [].freeze
+
       def initialize
         @handlers = {}
-        @event_log = []
-      end
-
-      # Register a handler for an event type.
-      def on(event_type, &handler)
+        # Events published from any thread, dispatched later by drain.
+        @inbox = Thread::Queue.new
+        # Event log kept as parallel columns; types are interned to small integer ids.
+        @type_ids = {}
+        @type_names = []
+        @log_types = []
+        @log_data = []
+        @log_timestamps = []
+        @log_processed = []
+      end
+
+      # Register a handler (callable or block) for an event type.
+      def on(event_type, callable = nil, &block)
         @handlers[event_type] ||= []
-        @handlers[event_type] << handler
+        @handlers[event_type] << (callable || block)
         get_logger('events.dispatcher').info("Handler registered for: #{event_type}")
       end
 
       # Emit an event to all registered handlers.
       def emit(event_type, data = {})
         event = { type: event_type, data: data, timestamp: Time.now.to_i, processed: false }
-        @event_log << event
-        handlers = @handlers[event_type] || []
-        get_logger('events.dispatcher').info("Emitting #{event_type} to #{handlers.length} handlers")
+        idx = append_log(event_type, data, event[:timestamp])
+        handlers = @handlers[event_type] || NO_HANDLERS
+        log = get_logger('events.dispatcher')
+        log.info("Emitting #{event_type} to #{handlers.length} handlers")
         invoked = 0
         handlers.each do |handler|
           begin
             handler.call(event)
             invoked += 1
           rescue StandardError => e
-            get_logger('events.dispatcher').error("Handler error for #{event_type}: #{e}")
+            log.error("Handler error for #{event_type}: #{e}")
           end
         end
         event[:processed] = true
+        @log_processed[idx] = true
+        invoked
+      end
+
+      # Emit a batch of events of one type. Handlers are looked up once and run
+      # handler by handler over the whole batch; the log columns grow in one
+      # concat per column. Returns the number of successful handler calls.
+      def emit_many(event_type, data_list)
+        handlers = @handlers[event_type] || NO_HANDLERS
+        log = get_logger('events.dispatcher')
+        log.info("Emitting #{data_list.length} x #{event_type} to #{handlers.length} handlers")
+        now = Time.now.to_i
+        events = data_list.map { |data| { type: event_type, data: data, timestamp: now, processed: false } }
+        invoked = 0
+        handlers.each do |handler|
+          events.each do |event|
+            handler.call(event)
+            invoked += 1
+          rescue StandardError => e
+            log.error("Handler error for #{event_type}: #{e}")
+          end
+        end
+        events.each { |event| event[:processed] = true }
+        append_log_batch(event_type, data_list, now)
         invoked
       end
 
+      # Queue an event from any thread without touching handlers or the log.
+      def publish(event_type, data = {})
+        @inbox << [event_type, data]
+      end
+
+      # Dispatch the events queued so far on the calling thread. Returns how
+      # many were dispatched.
+      def drain
+        count = @inbox.size
+        count.times do
+          event_type, data = @inbox.pop
+          emit(event_type, data)
+        end
+        count
+      end
+
       # Get total event count.
       def event_count
-        @event_log.length
+        @log_types.length
+      end
+
+      # Count logged events of one type.
+      def count_of(event_type)
+        id = @type_ids[event_type]
+        id ? @log_types.count(id) : 0
+      end
+
+      # Materialize the logged event at index i as a Hash.
+      def event_at(i)
+        return nil unless i < @log_types.length
+
+        {
+          type: @type_names[@log_types[i]],
+          data: @log_data[i],
+          timestamp: @log_timestamps[i],
+          processed: @log_processed[i]
+        }
+      end
+
+      private
+
+      def type_id(event_type)
+        @type_ids[event_type] ||= begin
+          @type_names << event_type
+          @type_names.length - 1
+        end
+      end
+
+      def append_log_batch(event_type, data_list, timestamp)
+        n = data_list.length
+        @log_types.concat(Array.new(n, type_id(event_type)))
+        @log_data.concat(data_list)
+        @log_timestamps.concat(Array.new(n, timestamp))
+        @log_processed.concat(Array.new(n, true))
+      end
+
+      def append_log(event_type, data, timestamp)
+        @log_types << type_id(event_type)
+        @log_data << data
+        @log_timestamps << timestamp
+        @log_processed << false
+        @log_types.length - 1
       end
     end
     """,
@@ -1035,11 +1272,19 @@ w(
 w(
     "events/handlers.rb",
     """\
+    # frozen_string_literal: true
+
     # Default event handlers.
 
     require_relative '../utils/helpers'
     require_relative 'dispatcher'
 
+    EVENT_USER_REGISTERED = 'auth.user_registered'
+    EVENT_LOGIN_SUCCESS = 'auth.login_success'
+    EVENT_LOGIN_FAILED = 'auth.login_failed'
+    EVENT_PAYMENT_COMPLETED = 'payment.completed'
+    EVENT_PAYMENT_REFUNDED = 'payment.refunded'
+
     # Log when a user registers.
     def on_user_registered(event)
       get_logger('events.handlers').info("User registered: #{event[:data][:email]}")
@@ -1067,11 +1312,11 @@ w(
 
     # Register all default event handlers.
     def register_default_handlers(dispatcher)
-      dispatcher.on('auth.user_registered') { |e| on_user_registered(e) }
-      dispatcher.on('auth.login_success') { |e| on_login_success(e) }
-      dispatcher.on('auth.login_failed') { |e| on_login_failed(e) }
-      dispatcher.on('payment.completed') { |e| on_payment_completed(e) }
-      dispatcher.on('payment.refunded') { |e| on_payment_refunded(e) }
+      dispatcher.on(EVENT_USER_REGISTERED, method(:on_user_registered))
+      dispatcher.on(EVENT_LOGIN_SUCCESS, method(:on_login_success))
+      dispatcher.on(EVENT_LOGIN_FAILED, method(:on_login_failed))
+      dispatcher.on(EVENT_PAYMENT_COMPLETED, method(:on_payment_completed))
+      dispatcher.on(EVENT_PAYMENT_REFUNDED, method(:on_payment_refunded))
       get_logger('events.handlers').info('Default handlers registered')
     end
     """,
@@ -1081,16 +1326,23 @@ w(
 w(
     "cache/base_cache.rb",
     """\
+    # frozen_string_literal: true
+
     # Cache interface and base class.
 
     # Base cache with stats tracking.
     class BaseCache
       attr_reader :name
+      # The RateLimiter built on this cache by rate_limit_middleware, kept here
+      # so it is released along with the cache.
+      attr_accessor :rate_limiter
 
       def initialize(name)
         @name = name
         @hits = 0
         @misses = 0
+        @hit_rate_permille = nil
+        @hit_rate = nil
       end
 
       def get(key)
@@ -1109,10 +1361,199 @@ w(
         raise NotImplementedError, 'Subclass must implement clear'
       end
 
+      # Drop every entry without waiting for the memory to be reclaimed.
+      # Returns the number of entries removed. Backends without a cheaper path
+      # fall back to clear.
+      def clear_async
+        clear
+      end
+
+      # Increment a counter in one call, starting a TTL window when the key is new.
+      # Returns [new_value, first_insert].
+      def incr_with_ttl(key, window)
+        raise NotImplementedError, 'Subclass must implement incr_with_ttl'
+      end
+
+      # hit_rate comes from integer per-mille math, rounded half up, and its
+      # String is rebuilt only when the rounded rate changes.
       def stats
         total = @hits + @misses
-        rate = total > 0 ? (@hits.to_f / total * 100) : 0.0
-        { backend: @name, hits: @hits, misses: @misses, hit_rate: "#{rate.round(1)}%" }
+        permille = total > 0 ? (@hits * 1000 + total / 2) / total : 0
+        unless permille == @hit_rate_permille
+          @hit_rate_permille = permille
+          @hit_rate = "#{permille / 10}.#{permille % 10}%".freeze
+        end
+        { backend: @name, hits: @hits, misses: @misses, hit_rate: @hit_rate }
+      end
+    end
+    """,
+)
+
+# ─── cache/expiration_heap.rb ───
+w(
+    "cache/expiration_heap.rb",
+    """\
+    # frozen_string_literal: true
+
+    # Min-heap of cache expiry timestamps.
+
+    # Binary min-heap of [expiry, key] pairs.
+    #
+    # Re-pushing a key supersedes its previous entry: the latest expiry is kept
+    # in @live and superseded or deleted entries are dropped lazily once they
+    # reach the top of the heap.
+    class ExpirationHeap
+      def initialize
+        @heap = []
+        @live = {}
+      end
+
+      def size
+        @live.size
+      end
+
+      def push(entry)
+        expiry, key = entry
+        @live[key] = expiry
+        @heap << entry
+        sift_up(@heap.size - 1)
+      end
+
+      def update(key, new_expiry)
+        push([new_expiry, key])
+      end
+
+      def delete(key)
+        !@live.delete(key).nil?
+      end
+
+      def peek
+        discard_stale
+        @heap.first
+      end
+
+      def pop
+        discard_stale
+        return nil if @heap.empty?
+
+        entry = remove_top
+        @live.delete(entry[1])
+        entry
+      end
+
+      def clear
+        @heap.clear
+        @live.clear
+      end
+
+      private
+
+      def discard_stale
+        while (top = @heap.first) && @live[top[1]] != top[0]
+          remove_top
+        end
+      end
+
+      def remove_top
+        top = @heap.first
+        last = @heap.pop
+        unless @heap.empty?
+          @heap[0] = last
+          sift_down(0)
+        end
+        top
+      end
+
+      def sift_up(i)
+        while i > 0
+          parent = (i - 1) / 2
+          break if @heap[parent][0] <= @heap[i][0]
+
+          @heap[parent], @heap[i] = @heap[i], @heap[parent]
+          i = parent
+        end
+      end
+
+      def sift_down(i)
+        n = @heap.size
+        loop do
+          left = 2 * i + 1
+          right = left + 1
+          smallest = i
+          smallest = left if left < n && @heap[left][0] < @heap[smallest][0]
+          smallest = right if right < n && @heap[right][0] < @heap[smallest][0]
+          break if smallest == i
+
+          @heap[smallest], @heap[i] = @heap[i], @heap[smallest]
+          i = smallest
+        end
+      end
+    end
+    """,
+)
+
+# ─── cache/count_min_sketch.rb ───
+w(
+    "cache/count_min_sketch.rb",
+    """\
+    # frozen_string_literal: true
+
+    # Count-Min sketch for TinyLFU cache admission.
+
+    # Approximate key frequencies in four rows of 4-bit counters, packed sixteen
+    # to an Integer word. Counters saturate at 15 and are all halved once
+    # sample_size increments have been recorded, so stale popularity fades.
+    class CountMinSketch
+      DEPTH = 4
+      SEEDS = [0x97cb3127, 0xb4b82e39, 0x5bd1e995, 0xc2b2ae35].freeze
+      MAX_COUNT = 15
+      HALF_MASK = 0x7777_7777_7777_7777
+
+      def initialize(width_bits: 14)
+        @width_bits = width_bits
+        @rows = Array.new(DEPTH) { Array.new((1 << width_bits) / 16, 0) }
+        @sample_size = 10 << width_bits
+        @additions = 0
+      end
+
+      def estimate(key)
+        h = key.hash
+        min = MAX_COUNT
+        DEPTH.times do |d|
+          c = counter(d, slot(h, d))
+          min = c if c < min
+        end
+        min
+      end
+
+      # Conservative update: only the counters at the current minimum grow.
+      def increment(key)
+        h = key.hash
+        slots = Array.new(DEPTH) { |d| slot(h, d) }
+        min = slots.each_with_index.map { |i, d| counter(d, i) }.min
+        return if min >= MAX_COUNT
+
+        slots.each_with_index { |i, d| add_one(d, i) if counter(d, i) == min }
+        age if (@additions += 1) >= @sample_size
+      end
+
+      private
+
+      def slot(h, d)
+        (((h ^ SEEDS[d]) * 0x9E3779B1) & 0xFFFF_FFFF) >> (32 - @width_bits)
+      end
+
+      def counter(d, i)
+        (@rows[d][i >> 4] >> ((i & 15) << 2)) & MAX_COUNT
+      end
+
+      def add_one(d, i)
+        @rows[d][i >> 4] += 1 << ((i & 15) << 2)
+      end
+
+      def age
+        @rows.each { |row| row.map! { |word| (word >> 1) & HALF_MASK } }
+        @additions /= 2
       end
     end
     """,
@@ -1122,60 +1563,114 @@ w(
 w(
     "cache/redis_cache.rb",
     """\
+    # frozen_string_literal: true
+
     # Redis-backed cache.
 
     require_relative '../utils/helpers'
     require_relative 'base_cache'
+    require_relative 'expiration_heap'
 
     # Redis cache implementation.
+    #
+    # Each key maps to a single Entry holding its value and expiry tick, so every
+    # operation costs one hash lookup. A nil expiry never expires.
     class RedisCache < BaseCache
+      Entry = Struct.new(:value, :expiry)
+
       def initialize(host = 'localhost', port = 6379)
         super('redis')
         @store = {}
-        @expiry = {}
-        get_logger('cache.redis').info("RedisCache created: #{host}:#{port}")
+        @exp_heap = ExpirationHeap.new
+        @log = get_logger('cache.redis')
+        @log.info("RedisCache created: #{host}:#{port}")
       end
 
       def get(key)
-        if @store.key?(key)
-          exp = @expiry[key] || Float::INFINITY
-          if Time.now.to_i > exp
+        now = current_tick
+        sweep_expired(now)
+        entry = @store[key]
+        if entry
+          if entry.expiry && now > entry.expiry
             @store.delete(key)
-            @expiry.delete(key)
+            @exp_heap.delete(key)
             @misses += 1
             return nil
           end
           @hits += 1
-          return @store[key]
+          return entry.value
         end
         @misses += 1
         nil
       end
 
       def set(key, value, ttl = 300)
-        @store[key] = value
-        @expiry[key] = Time.now.to_i + ttl
-        get_logger('cache.redis').info("Redis SET #{key} (ttl=#{ttl})")
+        now = current_tick
+        sweep_expired(now)
+        entry = Entry.new(value, now + ttl)
+        @store[key] = entry
+        @exp_heap.push([entry.expiry, key])
+        @log.debug { "Redis SET #{key} (ttl=#{ttl})" }
       end
 
       def delete(key)
-        @expiry.delete(key)
+        @exp_heap.delete(key)
         !@store.delete(key).nil?
       end
 
       def clear
         count = @store.size
         @store.clear
-        @expiry.clear
-        get_logger('cache.redis').info("Redis FLUSHDB: #{count} keys")
+        @exp_heap.clear
+        @log.debug { "Redis FLUSHDB: #{count} keys" }
         count
       end
 
+      # Like UNLINK/FLUSHDB ASYNC: detach the current keyspace in O(1) and
+      # leave reclaiming it to the GC.
+      def clear_async
+        count = @store.size
+        @store = {}
+        @exp_heap = ExpirationHeap.new
+        @log.debug { "Redis FLUSHDB ASYNC: #{count} keys" }
+        count
+      end
+
+      # Remove every entry whose TTL has passed; O(k log n) for k expired keys.
+      def sweep_expired(now = current_tick)
+        swept = 0
+        while (top = @exp_heap.peek) && top[0] < now
+          _, key = @exp_heap.pop
+          entry = @store[key]
+          next unless entry&.expiry && now > entry.expiry
+
+          @store.delete(key)
+          swept += 1
+        end
+        swept
+      end
+
+      def incr_with_ttl(key, window)
+        now = current_tick
+        entry = @store[key]
+        if entry.nil? || (entry.expiry && now > entry.expiry)
+          entry = Entry.new(1, now + window)
+          @store[key] = entry
+          @exp_heap.push([entry.expiry, key])
+          return [1, true]
+        end
+        entry.value += 1
+        [entry.value, false]
+      end
+
       def incr(key, amount = 1)
-        current = @store[key] || 0
-        new_val = current + amount
-        @store[key] = new_val
-        new_val
+        entry = @store[key]
+        if entry
+          entry.value += amount
+        else
+          @store[key] = Entry.new(amount, nil)
+          amount
+        end
       end
     end
     """,
@@ -1185,69 +1680,163 @@ w(
 w(
     "cache/memory_cache.rb",
     """\
+    # frozen_string_literal: true
+
     # In-memory LRU cache.
 
     require_relative '../utils/helpers'
     require_relative 'base_cache'
-
-    # LRU memory cache.
+    require_relative 'expiration_heap'
+    require_relative 'count_min_sketch'
+
+    # LRU memory cache backed by a hash index and an intrusive doubly-linked list.
+    #
+    # The list runs from least recently used (head side) to most recently used
+    # (tail side), so get/set/eviction are all O(1) pointer rewires. Expired
+    # entries are reclaimed from an ExpirationHeap before choosing an LRU victim.
+    # When full, a new key is admitted only if a CountMinSketch estimates it is
+    # used at least as often as the victim (TinyLFU), so one-off scans cannot
+    # flush the hot set.
     class MemoryCache < BaseCache
+      Node = Struct.new(:key, :value, :expiry, :prev, :nxt)
+
       def initialize(max_size = 1000)
         super('memory')
-        @store = {}
-        @expiry = {}
+        @index = {}
+        @exp_heap = ExpirationHeap.new
+        @cms = CountMinSketch.new
+        @head = Node.new
+        @tail = Node.new
+        @head.nxt = @tail
+        @tail.prev = @head
         @max_size = max_size
-        get_logger('cache.memory').info("MemoryCache created: max_size=#{max_size}")
+        @log = get_logger('cache.memory')
+        @log.info("MemoryCache created: max_size=#{max_size}")
       end
 
       def get(key)
-        if @store.key?(key)
-          exp = @expiry[key] || Float::INFINITY
-          if Time.now.to_i > exp
-            @store.delete(key)
-            @expiry.delete(key)
+        now = current_tick
+        sweep_expired(now)
+        @cms.increment(key)
+        node = @index[key]
+        if node
+          if now > node.expiry
+            unlink(node)
+            @index.delete(key)
+            @exp_heap.delete(key)
             @misses += 1
             return nil
           end
           @hits += 1
-          # Move to end for LRU
-          val = @store.delete(key)
-          @store[key] = val
-          return val
+          # Move to tail for LRU
+          unlink(node)
+          append(node)
+          return node.value
         end
         @misses += 1
         nil
       end
 
       def set(key, value, ttl = 300)
-        if @store.key?(key)
-          @store.delete(key)
-        elsif @store.size >= @max_size
-          first_key = @store.keys.first
-          if first_key
-            @store.delete(first_key)
-            @expiry.delete(first_key)
-            get_logger('cache.memory').info("LRU evicted: #{first_key}")
-          end
+        write(key, value, ttl, admit: true)
+      end
+
+      # Remove every entry whose TTL has passed; O(k log n) for k expired keys.
+      def sweep_expired(now = current_tick)
+        swept = 0
+        while (top = @exp_heap.peek) && top[0] < now
+          _, key = @exp_heap.pop
+          swept += 1 if evict_if_stale(key, now)
         end
-        @store[key] = value
-        @expiry[key] = Time.now.to_i + ttl
+        swept
       end
 
       def delete(key)
-        @expiry.delete(key)
-        !@store.delete(key).nil?
+        node = @index.delete(key)
+        return false unless node
+
+        @exp_heap.delete(key)
+        unlink(node)
+        true
       end
 
       def clear
-        count = @store.size
-        @store.clear
-        @expiry.clear
+        count = @index.size
+        @index.clear
+        @exp_heap.clear
+        @head.nxt = @tail
+        @tail.prev = @head
         count
       end
 
+      def incr_with_ttl(key, window)
+        node = @index[key]
+        if node.nil? || current_tick > node.expiry
+          # Counters skip admission: a rejected write would restart the window
+          # on every call and the count would never grow.
+          write(key, 1, window, admit: false)
+          return [1, true]
+        end
+        node.value += 1
+        unlink(node)
+        append(node)
+        [node.value, false]
+      end
+
       def size
-        @store.size
+        @index.size
+      end
+
+      private
+
+      # Store key => value. With admit: true a new key only displaces the LRU
+      # victim of a full cache if the sketch rates it at least as popular;
+      # returns nil when the write is rejected.
+      def write(key, value, ttl, admit:)
+        now = current_tick
+        sweep_expired(now)
+        @cms.increment(key)
+        node = @index[key]
+        if node
+          unlink(node)
+        else
+          if @index.size >= @max_size
+            victim = @head.nxt
+            return nil if admit && @cms.estimate(key) < @cms.estimate(victim.key)
+
+            unlink(victim)
+            @index.delete(victim.key)
+            @exp_heap.delete(victim.key)
+            @log.debug { "LRU evicted: #{victim.key}" }
+          end
+          node = Node.new(key)
+          @index[key] = node
+        end
+        node.value = value
+        node.expiry = now + ttl
+        @exp_heap.push([node.expiry, key])
+        append(node)
+      end
+
+      def evict_if_stale(key, now)
+        node = @index[key]
+        return false unless node && now > node.expiry
+
+        unlink(node)
+        @index.delete(key)
+        true
+      end
+
+      def unlink(node)
+        node.prev.nxt = node.nxt
+        node.nxt.prev = node.prev
+      end
+
+      def append(node)
+        node.prev = @tail.prev
+        node.nxt = @tail
+        @tail.prev.nxt = node
+        @tail.prev = node
       end
     end
     """,
@@ -1257,21 +1846,65 @@ w(
 w(
     "validators/common.rb",
     """\
+    # frozen_string_literal: true
+
     # Common validation utilities.
 
     require_relative '../utils/helpers'
     require_relative '../exceptions'
 
-    EMAIL_REGEX = /\\A[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\\.[a-zA-Z]{2,}\\z/
+    EMAIL_REGEX = /\\A[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\\.[a-zA-Z]{2,}\\z/.freeze
+    # Matches only already-normalized (stripped, lowercase) addresses.
+    CLEAN_EMAIL_REGEX = /\\A[a-z0-9._%+-]+@[a-z0-9.-]+\\.[a-z]{2,}\\z/.freeze
+    # Set EMAIL_FAST_SCAN=0 to validate with the regexes above instead of the byte scan.
+    EMAIL_FAST_SCAN = ENV.fetch('EMAIL_FAST_SCAN', '1') != '0'
+
+    EMAIL_LOCAL_BYTES = Array.new(256, false).tap do |table|
+      [*'a'..'z', *'A'..'Z', *'0'..'9', '.', '_', '%', '+', '-'].each { |c| table[c.ord] = true }
+    end.freeze
+    EMAIL_DOMAIN_BYTES = Array.new(256, false).tap do |table|
+      [*'a'..'z', *'A'..'Z', *'0'..'9', '.', '-'].each { |c| table[c.ord] = true }
+    end.freeze
+
+    # Byte-scan equivalent of EMAIL_REGEX (CLEAN_EMAIL_REGEX with lowercase: true).
+    def fast_email_ok?(email, lowercase: false)
+      at = nil
+      last_dot = nil
+      i = 0
+      email.each_byte do |b|
+        return false if lowercase && b >= 65 && b <= 90
+        if b == 64 # '@'
+          return false if at
+
+          at = i
+        elsif at
+          return false unless EMAIL_DOMAIN_BYTES[b]
+
+          last_dot = i if b == 46 # '.'
+        else
+          return false unless EMAIL_LOCAL_BYTES[b]
+        end
+        i += 1
+      end
+      return false unless at&.positive? && last_dot && last_dot > at + 1 && i - last_dot > 2
+
+      (last_dot + 1...i).all? { |j| (email.getbyte(j) | 0x20).between?(97, 122) }
+    end
+
+    def email_format_ok?(email, lowercase: false)
+      return fast_email_ok?(email, lowercase: lowercase) if EMAIL_FAST_SCAN
+
+      (lowercase ? CLEAN_EMAIL_REGEX : EMAIL_REGEX).match?(email)
+    end
 
     # Validate email format.
     def validate_email(email)
-      raise ValidationError.new('Email is required', field: :email) unless email && !email.empty?
+      raise ValidationError.preallocated('Email is required', :email) if email.nil? || email.empty?
+      return email if email.is_a?(String) && email_format_ok?(email, lowercase: true)
 
       clean = email.strip.downcase
-      unless EMAIL_REGEX.match?(clean)
-        raise ValidationError.new("Invalid email: #{email}", field: :email)
-      end
+      raise ValidationError.preallocated('Invalid email', :email) unless email_format_ok?(clean)
+
       clean
     end
 
@@ -1309,6 +1942,8 @@ w(
 w(
     "validators/user.rb",
     """\
+    # frozen_string_literal: true
+
     # User input validation.
 
     require_relative '../utils/helpers'
@@ -1316,37 +1951,42 @@ w(
     require_relative 'common'
 
     module UserValidator
+      ALLOWED_ROLES = %w[user admin moderator].freeze
+
       # Validate user data — name collision with PaymentValidator, ApiV1Auth, ApiV2Auth.
       def self.validate(data)
         get_logger('validators.user').info('Validating user data')
-        raise ValidationError.new('Email required', field: :email) unless data[:email]
-        raise ValidationError.new('Name required', field: :name) unless data[:name]
+        email = data[:email]
+        name = data[:name]
+        password = data[:password]
+        role = data[:role]
+        raise ValidationError.preallocated('Email required', :email) unless email
+        raise ValidationError.preallocated('Name required', :name) unless name
 
         result = {}
-        result[:email] = validate_email(data[:email])
-        result[:name] = validate_string(data[:name], :name, min_len: 1, max_len: 100)
-        if data[:password]
-          raise ValidationError.new('Password too short', field: :password) if data[:password].length < 8
+        result[:email] = validate_email(email)
+        result[:name] = validate_string(name, :name, min_len: 1, max_len: 100)
+        if password
+          raise ValidationError.preallocated('Password too short', :password) if password.length < 8
 
-          result[:password] = data[:password]
+          result[:password] = password
         end
-        if data[:role]
-          allowed = %w[user admin moderator]
-          unless allowed.include?(data[:role])
-            raise ValidationError.new('Invalid role', field: :role)
-          end
+        if role
+          raise ValidationError.preallocated('Invalid role', :role) unless ALLOWED_ROLES.include?(role)
 
-          result[:role] = data[:role]
+          result[:role] = role
         end
         result
       end
 
       # Validate login data.
       def self.validate_login(data)
-        raise ValidationError.new('Email required', field: :email) unless data[:email]
-        raise ValidationError.new('Password required', field: :password) unless data[:password]
+        email = data[:email]
+        password = data[:password]
+        raise ValidationError.preallocated('Email required', :email) unless email
+        raise ValidationError.preallocated('Password required', :password) unless password
 
-        { email: validate_email(data[:email]), password: data[:password] }
+        { email: validate_email(email), password: password }
       end
     end
     """,
@@ -1356,6 +1996,8 @@ w(
 w(
     "validators/payment.rb",
     """\
+    # frozen_string_literal: true
+
     # Payment input validation.
 
     require_relative '../utils/helpers'
@@ -1364,6 +2006,7 @@ w(
 
     PAYMENT_CURRENCIES = %w[USD EUR GBP JPY CAD].freeze
     PAYMENT_METHODS = %w[card bank_transfer wallet].freeze
+    REFUND_REASON_MAX_BYTES = 500
 
     module PaymentValidator
       # Validate payment data — name collision with UserValidator, ApiV1Auth, ApiV2Auth.
@@ -1387,9 +2030,17 @@ w(
 
         result = { transaction_id: data[:transaction_id] }
         result[:amount] = validate_positive_number(data[:amount], :amount) if data[:amount]
-        result[:reason] = data[:reason].to_s[0, 500] if data[:reason]
+        reason = data[:reason]
+        result[:reason] = clamp_bytes(reason.to_s, REFUND_REASON_MAX_BYTES) if reason
         result
       end
+
+      # Truncate to at most max bytes without splitting a multibyte character.
+      def self.clamp_bytes(str, max)
+        return str if str.bytesize <= max
+
+        str.byteslice(0, max).scrub('')
+      end
     end
     """,
 )
@@ -1398,8 +2049,11 @@ w(
 w(
     "middleware/auth_middleware.rb",
     """\
+    # frozen_string_literal: true
+
     # Auth middleware (services layer).
 
+    require 'set'
     require_relative '../utils/helpers'
     require_relative '../auth/tokens'
     require_relative '../auth/middleware'
@@ -1407,7 +2061,7 @@ w(
 
     # Authentication middleware for the services layer.
     class AuthMiddleware
-      PUBLIC_PATHS = %w[/health /login /register].freeze
+      PUBLIC_PATHS = Set[*%w[/health /login /register]].freeze
 
       def initialize(app)
         @app = app
@@ -1438,6 +2092,8 @@ w(
 w(
     "middleware/rate_limit.rb",
     """\
+    # frozen_string_literal: true
+
     # Rate limiting middleware.
 
     require_relative '../utils/helpers'
@@ -1446,35 +2102,54 @@ w(
 
     # Rate limiter using a cache backend.
     class RateLimiter
+      KEY_PREFIX = 'ratelimit:'
+      MAX_CACHED_KEYS = 10_000
+
       def initialize(cache, limit: 100, window: 60)
         @cache = cache
         @limit = limit
         @window = window
+        @keys = {}
+        @key_count = 0
       end
 
       def check(key)
-        cache_key = "ratelimit:#{key}"
-        current = @cache.get(cache_key)
-        if current.nil?
-          @cache.set(cache_key, 1, @window)
-          return { allowed: true, remaining: @limit - 1 }
-        end
-        if current >= @limit
-          get_logger('middleware.rate_limit').info("Rate limit exceeded: #{key}")
+        tally("#{KEY_PREFIX}#{key}")
+      end
+
+      # Same as check("ip:path"), reusing the composed cache key across requests.
+      def check_client(ip, path)
+        by_path = @keys[ip] ||= {}
+        tally(by_path[path] || remember_key(ip, path))
+      end
+
+      private
+
+      def tally(cache_key)
+        count, = @cache.incr_with_ttl(cache_key, @window)
+        if count > @limit
+          get_logger('middleware.rate_limit').info("Rate limit exceeded: #{cache_key}")
           return { allowed: false, remaining: 0 }
         end
-        @cache.set(cache_key, current + 1, @window)
-        { allowed: true, remaining: @limit - current - 1 }
+        { allowed: true, remaining: @limit - count }
+      end
+
+      def remember_key(ip, path)
+        if @key_count >= MAX_CACHED_KEYS
+          @keys.clear
+          @key_count = 0
+        end
+        @key_count += 1
+        (@keys[ip] ||= {})[path] = "#{KEY_PREFIX}#{ip}:#{path}".freeze
       end
     end
 
     # Apply rate limiting to a request.
     def rate_limit_middleware(request, cache)
       validate_request(request)
-      ip = request[:ip] || 'unknown'
-      path = request[:path] || '/'
-      limiter = RateLimiter.new(cache)
-      result = limiter.check("#{ip}:#{path}")
+      # One limiter per cache backend, reused across requests.
+      limiter = cache.rate_limiter ||= RateLimiter.new(cache)
+      result = limiter.check_client(request[:ip] || 'unknown', request[:path] || '/')
       raise RateLimitError.new(retry_after: 60) unless result[:allowed]
 
       request[:rate_limit] = result
@@ -1487,6 +2162,8 @@ w(
 w(
     "middleware/cors.rb",
     """\
+    # frozen_string_literal: true
+
     # CORS middleware.
 
     require_relative '../utils/helpers'
@@ -1494,8 +2171,14 @@ w(
     DEFAULT_ORIGINS = ['http://localhost:3000', 'https://app.example.com'].freeze
 
     # CORS policy configuration.
+    #
+    # Response headers are precomputed per allowed origin, so headers() is a
+    # hash lookup returning a shared frozen Hash for known origins.
     class CorsPolicy
-      attr_accessor :allowed_origins, :allowed_methods, :allow_credentials, :max_age
+      EMPTY_HEADERS = {}.freeze
+
+      attr_reader :allowed_origins, :allowed_methods, :max_age
+      attr_accessor :allow_credentials
 
       def initialize(
         allowed_origins: DEFAULT_ORIGINS,
@@ -1507,34 +2190,53 @@ w(
         @allowed_methods = allowed_methods
         @allow_credentials = allow_credentials
         @max_age = max_age
+        build_header_table
       end
 
       def origin_allowed?(origin)
-        @allowed_origins.include?('*') || @allowed_origins.include?(origin)
+        @wildcard || @headers_by_origin.key?(origin)
       end
 
       def headers(origin)
-        return {} unless origin_allowed?(origin)
+        hdrs = @headers_by_origin[origin]
+        return hdrs if hdrs
+        return EMPTY_HEADERS unless @wildcard
 
+        header_set(origin)
+      end
+
+      private
+
+      def build_header_table
+        @wildcard = @allowed_origins.include?('*')
+        @methods_csv = @allowed_methods.join(', ').freeze
+        @max_age_s = @max_age.to_s.freeze
+        @headers_by_origin = @allowed_origins.each_with_object({}) { |o, h| h[o] = header_set(o) }
+      end
+
+      def header_set(origin)
         {
           'Access-Control-Allow-Origin' => origin,
-          'Access-Control-Allow-Methods' => @allowed_methods.join(', '),
-          'Access-Control-Max-Age' => @max_age.to_s
-        }
+          'Access-Control-Allow-Methods' => @methods_csv,
+          'Access-Control-Max-Age' => @max_age_s
+        }.freeze
       end
     end
 
+    DEFAULT_CORS_POLICY = CorsPolicy.new
+
     # Apply CORS headers to a request.
     def cors_middleware(request, policy = nil)
       validate_request(request)
-      cors = policy || CorsPolicy.new
+      cors = policy || DEFAULT_CORS_POLICY
       origin = request[:origin] || ''
+      hdrs = CorsPolicy::EMPTY_HEADERS
       if origin && !origin.empty?
         hdrs = cors.headers(origin)
         get_logger('middleware.cors').warn("CORS rejected: #{origin}") if hdrs.empty?
-        return request.merge(cors_headers: hdrs)
       end
-      request.merge(cors_headers: {})
+      request[:cors_headers] = hdrs
+      request
     end
     """,
 )
@@ -1543,6 +2245,8 @@ w(
 w(
     "middleware/logging_middleware.rb",
     """\
+    # frozen_string_literal: true
+
     # Request logging middleware.
 
     require_relative '../utils/helpers'
@@ -1557,7 +2261,9 @@ w(
       method = request[:method]
       path = request[:path]
       get_logger('middleware.logging').info("[#{request_id}] #{method} #{path}")
-      request.merge(request_id: request_id, start_time: Time.now.to_f)
+      request[:request_id] = request_id
+      request[:start_time] = Time.now.to_f
+      request
     end
 
     # Log response details.
@@ -1775,7 +2481,7 @@ w(
         body = request[:body]
         headers = request[:headers] || {}
         idempotency_key = headers['Idempotency-Key'] || ''
-        get_logger('api.v2.payments').info("V2 create payment (idempotency=#{idempotency_key[0, 12]})")
+        get_logger('api.v2.payments').info("V2 create payment (idempotency=#{PaymentValidator.clamp_bytes(idempotency_key, 12)})")
         payment_data = PaymentValidator.validate(body)
         processor = PaymentProcessor.new(db, events)
         result = processor.process_payment(
@@ -1813,19 +2519,25 @@ w(
 
     require_relative '../utils/helpers'
 
-    # Payment statuses.
+    # Payment statuses, stored as integers; NAMES gives the serialized form.
     module PaymentStatus
-      PENDING = 'pending'
-      PROCESSING = 'processing'
-      COMPLETED = 'completed'
-      FAILED = 'failed'
-      REFUNDED = 'refunded'
+      PENDING = 0
+      PROCESSING = 1
+      COMPLETED = 2
+      FAILED = 3
+      REFUNDED = 4
+      NAMES = %w[pending processing completed failed refunded].freeze
+
+      # Accept a status id or name; unknown names fall back to PENDING.
+      def self.coerce(status)
+        status.is_a?(Integer) ? status : NAMES.index(status.to_s) || PENDING
+      end
     end
 
     # Payment record.
     class Payment
-      attr_reader :id, :user_id, :amount, :currency, :transaction_id, :created_at
-      attr_accessor :status, :completed_at
+      attr_reader :id, :user_id, :amount, :currency, :transaction_id, :created_at, :status
+      attr_accessor :completed_at
 
       def initialize(id:, user_id:, amount:, currency:, transaction_id:, status: PaymentStatus::PENDING, created_at: nil, completed_at: nil)
         @id = id
@@ -1833,11 +2545,19 @@ w(
         @amount = amount
         @currency = currency
         @transaction_id = transaction_id
-        @status = status
+        @status = PaymentStatus.coerce(status)
         @created_at = created_at || Time.now.to_i
         @completed_at = completed_at
       end
 
+      def status=(status)
+        @status = PaymentStatus.coerce(status)
+      end
+
+      def status_name
+        PaymentStatus::NAMES[@status]
+      end
+
       def complete
         @status = PaymentStatus::COMPLETED
         @completed_at = Time.now.to_i
@@ -1865,7 +2585,7 @@ w(
           amount: @amount,
           currency: @currency,
           transaction_id: @transaction_id,
-          status: @status,
+          status: status_name,
           created_at: @created_at,
           completed_at: @completed_at
         }
@@ -1880,19 +2600,26 @@ w(
     """\
     # Shared type definitions as modules of constants.
 
+    # User roles, stored as integers; NAMES gives the serialized form.
     module UserRole
-      USER = 'user'
-      ADMIN = 'admin'
-      MODERATOR = 'moderator'
+      USER = 0
+      ADMIN = 1
+      MODERATOR = 2
+      NAMES = %w[user admin moderator].freeze
+
+      # Accept a role id or name; unknown names fall back to USER.
+      def self.coerce(role)
+        role.is_a?(Integer) ? role : NAMES.index(role.to_s) || USER
+      end
     end
 
     module EventType
-      USER_REGISTERED = 'user.registered'
-      LOGIN_SUCCESS = 'auth.login_success'
-      LOGIN_FAILED = 'auth.login_failed'
-      PAYMENT_COMPLETED = 'payment.completed'
-      PAYMENT_REFUNDED = 'payment.refunded'
-      PASSWORD_CHANGED = 'auth.password_changed'
+      USER_REGISTERED = 'user.registered'.freeze
+      LOGIN_SUCCESS = 'auth.login_success'.freeze
+      LOGIN_FAILED = 'auth.login_failed'.freeze
+      PAYMENT_COMPLETED = 'payment.completed'.freeze
+      PAYMENT_REFUNDED = 'payment.refunded'.freeze
+      PASSWORD_CHANGED = 'auth.password_changed'.freeze
     end
 
     module NotificationChannel
@@ -2064,36 +2791,74 @@ w(
     require_relative '../services/payment/processor'
     require_relative '../events/dispatcher'
 
+    # Logger for this file's tasks, looked up once on first use.
+    module PaymentTasks
+      def self.log
+        @log ||= get_logger('tasks.payment')
+      end
+    end
+
+    # Max payments per bulk UPDATE, keeping statements well under length limits.
+    PAYMENT_BATCH_SIZE = 500
+
+    # Set many payment statuses in one statement per batch of
+    # [transaction_id, status] pairs, using UPDATE ... SET status = CASE.
+    def bulk_update_status(db, updates, batch_size: PAYMENT_BATCH_SIZE)
+      affected = 0
+      updates.each_slice(batch_size) do |chunk|
+        whens = Array.new(chunk.size, 'WHEN ? THEN ?').join(' ')
+        in_list = Array.new(chunk.size, '?').join(', ')
+        result = db.execute_query(
+          "UPDATE payments SET status = CASE transaction_id #{whens} END WHERE transaction_id IN (#{in_list})",
+          chunk.flatten + chunk.map(&:first)
+        )
+        affected += result[:affected]
+      end
+      affected
+    end
+
     # Process pending payments.
     def process_pending_payments(db, events)
-      get_logger('tasks.payment').info('Processing pending payments')
+      PaymentTasks.log.info('Processing pending payments')
       queries = PaymentQueries.new(db)
-      pending = queries.find_user_payments('', 'pending')
       processed = 0
       failed = 0
-      pending.each do |payment|
+      # Each page is updated as soon as it arrives, in its own transaction, so a
+      # failing bulk UPDATE rolls back that page alone.
+      queries.stream_user_payments('pending', batch_size: PAYMENT_BATCH_SIZE) do |page|
+        ids = page.map { |payment| payment[:transaction_id] }
         begin
-          queries.update_status(payment[:transaction_id], 'completed')
-          processed += 1
+          db.with_connection { bulk_update_status(db, ids.map { |id| [id, 'completed'] }) }
+          completed = ids
+          rejected = []
         rescue StandardError
-          queries.update_status(payment[:transaction_id], 'failed')
-          failed += 1
+          # Retry the rolled-back page row by row; only rows that fail again
+          # are marked failed.
+          completed, rejected = ids.partition do |id|
+            queries.update_status(id, 'completed')
+          rescue StandardError
+            false
+          end
+          queries.update_statuses(rejected.map { |id| [id, 'failed'] })
         end
+        processed += completed.size
+        failed += rejected.size
+        completed.each { |id| events.publish('payment.completed', { transaction_id: id }) }
+        rejected.each { |id| events.publish('payment.failed', { transaction_id: id }) }
       end
+      # Hand the queued outcomes to their handlers now that every page is settled.
+      events.drain
       { processed: processed, failed: failed }
     end
 
     # Reconcile payments.
     def reconcile_payments(db, events)
-      get_logger('tasks.payment').info('Reconciling payments')
-      queries = PaymentQueries.new(db)
-      processing = queries.find_user_payments('', 'processing')
-      resolved = 0
-      processing.each do |payment|
-        queries.update_status(payment[:transaction_id], 'completed')
-        resolved += 1
-      end
-      { resolved: resolved }
+      PaymentTasks.log.info('Reconciling payments')
+      # Select and transition the processing rows in a single round-trip.
+      result = db.execute_query(
+        "UPDATE payments SET status = 'completed' WHERE status = 'processing' RETURNING transaction_id"
+      )
+      { resolved: result[:rows].size }
     end
     """,
 )
@@ -2108,39 +2873,54 @@ w(
     require_relative '../database/connection'
     require_relative '../cache/base_cache'
 
+    WEEK_SECS = 7 * 86_400
+    MONTH_SECS = 30 * 86_400
+
+    # Logger for this file's tasks, looked up once on first use.
+    module CleanupTasks
+      def self.log
+        @log ||= get_logger('tasks.cleanup')
+      end
+    end
+
     # Clean up expired sessions.
     def cleanup_expired_sessions(db)
-      get_logger('tasks.cleanup').info('Cleaning up expired sessions')
+      CleanupTasks.log.info('Cleaning up expired sessions')
+      now = Time.now.to_i
       result = db.execute_query(
         'UPDATE sessions SET expired_at = ? WHERE expired_at IS NULL AND created_at < ?',
-        [Time.now.to_i, Time.now.to_i - 7 * 86_400]
+        [now, now - WEEK_SECS]
       )
-      get_logger('tasks.cleanup').info("Expired #{result[:affected]} sessions")
+      CleanupTasks.log.info("Expired #{result[:affected]} sessions")
       result[:affected]
     end
 
     # Clean up old events.
     def cleanup_old_events(db)
-      get_logger('tasks.cleanup').info('Cleaning up old events')
+      CleanupTasks.log.info('Cleaning up old events')
       result = db.execute_query(
         'DELETE FROM events WHERE processed_at IS NOT NULL AND created_at < ?',
-        [Time.now.to_i - 30 * 86_400]
+        [Time.now.to_i - MONTH_SECS]
       )
       result[:affected]
     end
 
     # Flush cache.
     def cleanup_cache(cache)
-      get_logger('tasks.cleanup').info('Running cache cleanup')
-      cache.clear
+      CleanupTasks.log.info('Running cache cleanup')
+      cache.clear_async
     end
 
     # Run all cleanup tasks.
     def run_all_cleanup(db, cache)
-      sessions = cleanup_expired_sessions(db)
-      events = cleanup_old_events(db)
-      cache_entries = cleanup_cache(cache)
-      get_logger('tasks.cleanup').info('Cleanup complete')
+      # The cache is independent of the database, so flush it concurrently.
+      cache_job = Thread.new { cleanup_cache(cache) }
+      # Both statements share one connection and one BEGIN/COMMIT.
+      sessions, events = db.with_connection do |conn|
+        [cleanup_expired_sessions(conn), cleanup_old_events(conn)]
+      end
+      cache_entries = cache_job.value
+      CleanupTasks.log.info('Cleanup complete')
       { expired_sessions: sessions, old_events: events, cache_cleared: cache_entries }
     end
     """,
@@ -2156,28 +2936,39 @@ w(
     require_relative 'utils/helpers'
 
     module ConfigExtended
-      DB_DSN = ENV.fetch('DATABASE_URL', 'sqlite://app.db')
-      REDIS_HOST = ENV.fetch('REDIS_HOST', 'localhost')
-      REDIS_PORT = ENV.fetch('REDIS_PORT', '6379').to_i
-      JWT_SECRET = ENV.fetch('JWT_SECRET', 'dev-secret')
-      ENVIRONMENT = ENV.fetch('RACK_ENV', 'development')
-      LOG_LEVEL = ENV.fetch('LOG_LEVEL', 'info')
-      RATE_LIMIT_PER_MINUTE = ENV.fetch('RATE_LIMIT', '100').to_i
-      CORS_ORIGINS = ENV.fetch('CORS_ORIGINS', 'http://localhost:3000').split(',')
-
+      # One snapshot of the environment instead of a lookup per setting.
+      env = ENV.to_h
+      DB_DSN = env.fetch('DATABASE_URL', 'sqlite://app.db')
+      REDIS_HOST = env.fetch('REDIS_HOST', 'localhost')
+      REDIS_PORT = env.fetch('REDIS_PORT', '6379').to_i
+      JWT_SECRET = env.fetch('JWT_SECRET', 'dev-secret')
+      ENVIRONMENT = env.fetch('RACK_ENV', 'development')
+      LOG_LEVEL = env.fetch('LOG_LEVEL', 'info')
+      RATE_LIMIT_PER_MINUTE = env.fetch('RATE_LIMIT', '100').to_i
+      CORS_ORIGINS = env.fetch('CORS_ORIGINS', 'http://localhost:3000').split(',').map(&:freeze).freeze
+
+      @full_lock = Mutex.new
+
+      # Built once per process and deep-frozen (Ractor-shareable), so every
+      # caller and thread reads the same Hash without locking. The freeze runs
+      # on a deep copy so the Config and ConfigExtended constants stay as-is.
       def self.load_full
-        get_logger('config').info('Loading extended configuration')
-        base = Config.load
-        base.merge(
-          db_dsn: DB_DSN,
-          redis_host: REDIS_HOST,
-          redis_port: REDIS_PORT,
-          jwt_secret: JWT_SECRET,
-          environment: ENVIRONMENT,
-          log_level: LOG_LEVEL,
-          rate_limit_per_minute: RATE_LIMIT_PER_MINUTE,
-          cors_origins: CORS_ORIGINS
-        )
+        @full || @full_lock.synchronize do
+          @full ||= begin
+            get_logger('config').info('Loading extended configuration')
+            full = Config.load.merge(
+              db_dsn: DB_DSN,
+              redis_host: REDIS_HOST,
+              redis_port: REDIS_PORT,
+              jwt_secret: JWT_SECRET,
+              environment: ENVIRONMENT,
+              log_level: LOG_LEVEL,
+              rate_limit_per_minute: RATE_LIMIT_PER_MINUTE,
+              cors_origins: CORS_ORIGINS
+            )
+            Ractor.make_shareable(Marshal.load(Marshal.dump(full)))
+          end
+        end
       end
 
       def self.validate_config(config)
@@ -2243,4 +3034,6 @@ w(
     """,
 )
 
+flush(WRITES)
+
 print("\nRuby fixture generation complete")
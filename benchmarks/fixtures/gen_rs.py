@@ -1,27 +1,72 @@
 #!/usr/bin/env python3
 """Generate Rust benchmark fixture (~2-3K LOC) for webapp_rs."""
 
-import os, textwrap
+import functools, os
+from concurrent.futures import ThreadPoolExecutor
 
 BASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "webapp_rs")
 
 
+def _fast_dedent(text):
+    """Regex-free equivalent of textwrap.dedent."""
+    lines = text.split("\n")
+    if text[:1] not in ("", " ", "\t", "\n"):
+        cut = 0  # the first line is flush left, so there is no common margin
+    else:
+        # Whitespace-only lines neither constrain the margin nor keep their spaces.
+        indents = {line[: len(line) - len(line.lstrip(" \t"))] for line in lines if line.strip(" \t")}
+        cut = len(os.path.commonprefix(list(indents))) if indents else 0
+    return "\n".join(line[cut:] if line.strip(" \t") else "" for line in lines)
+
+
+@functools.lru_cache(maxsize=None)
+def _prep(content):
+    return _fast_dedent(content).lstrip().encode("utf-8")
+
+
+MAX_WORKERS = 8
+
+# Manifest of (path, content) pairs registered by w() and emitted by emit_all().
+FILES = []
+
+
 def w(path, content):
-    full = os.path.join(BASE, path)
-    if os.path.exists(full):
-        return  # Don't overwrite existing files
-    os.makedirs(os.path.dirname(full), exist_ok=True)
-    with open(full, "w") as f:
-        f.write(textwrap.dedent(content).lstrip())
+    FILES.append((path, content))
+
+
+def _emit(path, content):
+    try:
+        # O_EXCL keeps the never-overwrite guarantee even if a file appears late.
+        fd = os.open(os.path.join(BASE, path), os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+    except FileExistsError:
+        return
+    try:
+        os.write(fd, _prep(content))
+    finally:
+        os.close(fd)
+
+
+def emit_all(files):
+    """Write every file not already on disk, dedenting only the ones written."""
+    existing = set()
+    for root, _, names in os.walk(BASE):
+        for name in names:
+            existing.add(os.path.relpath(os.path.join(root, name), BASE).replace(os.sep, "/"))
+    todo = [(path, content) for path, content in files if path not in existing]
+    for d in {os.path.dirname(os.path.join(BASE, path)) for path, _ in todo}:
+        os.makedirs(d, exist_ok=True)
+    if len(todo) <= 1:
+        for path, content in todo:
+            _emit(path, content)
+        return
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(todo))) as ex:
+        list(ex.map(lambda entry: _emit(*entry), todo))
 
 
 # ─── utils/mod.rs ───
 w(
     "utils/mod.rs",
-    """\
-    pub mod helpers;
-    pub mod crypto;
-    """,
+    "pub mod helpers;\npub mod crypto;\npub mod intern;\n",
 )
 
 # ─── utils/crypto.rs (referenced by existing models/user.rs) ───
@@ -30,14 +75,51 @@ w(
     """\
     /// Cryptographic utility functions.
 
-    /// Hash a password using a simple simulated algorithm.
+    use sha2::{Digest, Sha256};
+
+    /// Hash a password with SHA-256, returned as lowercase hex.
     pub fn hash_password(password: &str) -> String {
-        format!("hashed:{}", password.len())
+        let mut hasher = Sha256::new();
+        hasher.update(password.as_bytes());
+        format!("{:x}", hasher.finalize())
     }
 
     /// Verify a password against a stored hash.
     pub fn verify_password(password: &str, hash: &str) -> bool {
-        hash == &format!("hashed:{}", password.len())
+        hash == hash_password(password)
+    }
+    """,
+)
+
+# ─── utils/intern.rs ───
+w(
+    "utils/intern.rs",
+    """\
+    /// String interning for small, highly repetitive values.
+
+    use std::sync::{Arc, Mutex, OnceLock, PoisonError};
+
+    use rustc_hash::FxHashSet;
+
+    /// Process-wide pool of interned strings. Only constructors intern, so one
+    /// lock is plenty.
+    static POOL: OnceLock<Mutex<FxHashSet<Arc<str>>>> = OnceLock::new();
+
+    /// Return the shared copy of `value`, allocating only the first time it is seen.
+    ///
+    /// Interned strings live for the rest of the process, so only intern values
+    /// drawn from a small set (actions, actors, resource names), never raw input.
+    pub fn intern(value: &str) -> Arc<str> {
+        let mut pool = POOL
+            .get_or_init(|| Mutex::new(FxHashSet::default()))
+            .lock()
+            .unwrap_or_else(PoisonError::into_inner);
+        if let Some(existing) = pool.get(value) {
+            return Arc::clone(existing);
+        }
+        let interned: Arc<str> = Arc::from(value);
+        pool.insert(Arc::clone(&interned));
+        interned
     }
     """,
 )
@@ -46,29 +128,70 @@ w(
 w(
     "utils/helpers.rs",
     """\
-    use std::fmt;
+    use std::borrow::Cow;
+    use std::fmt::{self, Write};
+    use std::sync::atomic::{AtomicU64, Ordering};
+    use std::sync::OnceLock;
     use std::time::{SystemTime, UNIX_EPOCH};
 
     /// A simple logger that prefixes messages with a module name.
+    #[derive(Clone, Copy)]
     pub struct Logger {
         /// The name of the module this logger belongs to.
-        pub name: String,
-    }
-
+        pub name: &'static str,
+    }
+
+    /// Log severities, least severe first.
+    #[derive(Clone, Copy, PartialEq, Eq, PartialOrd, Ord)]
+    pub enum Level {
+        /// Informational messages.
+        Info,
+        /// Warnings.
+        Warn,
+        /// Errors.
+        Error,
+    }
+
+    /// Lowest level that gets printed, read once from `LOG_LEVEL` (info, warn,
+    /// error or off; defaults to info).
+    fn min_level() -> u8 {
+        static MIN_LEVEL: OnceLock<u8> = OnceLock::new();
+        *MIN_LEVEL.get_or_init(|| match std::env::var("LOG_LEVEL").as_deref() {
+            Ok("warn") => Level::Warn as u8,
+            Ok("error") => Level::Error as u8,
+            Ok("off") => u8::MAX,
+            _ => Level::Info as u8,
+        })
+    }
+
+    /// Logging methods take any `Display` value, so callers can pass a string
+    /// literal or `format_args!(...)` without allocating a `String`. Arguments
+    /// are only formatted when their level is enabled.
     impl Logger {
+        /// Whether messages at `level` are printed.
+        pub fn enabled(&self, level: Level) -> bool {
+            level as u8 >= min_level()
+        }
+
         /// Log an informational message.
-        pub fn info(&self, msg: &str) {
-            println!("[{}] INFO: {}", self.name, msg);
+        pub fn info(&self, msg: impl fmt::Display) {
+            if self.enabled(Level::Info) {
+                println!("[{}] INFO: {}", self.name, msg);
+            }
         }
 
         /// Log a warning message.
-        pub fn warn(&self, msg: &str) {
-            println!("[{}] WARN: {}", self.name, msg);
+        pub fn warn(&self, msg: impl fmt::Display) {
+            if self.enabled(Level::Warn) {
+                println!("[{}] WARN: {}", self.name, msg);
+            }
         }
 
         /// Log an error message.
-        pub fn error(&self, msg: &str) {
-            eprintln!("[{}] ERROR: {}", self.name, msg);
+        pub fn error(&self, msg: impl fmt::Display) {
+            if self.enabled(Level::Error) {
+                eprintln!("[{}] ERROR: {}", self.name, msg);
+            }
         }
     }
 
@@ -78,11 +201,12 @@ w(
         }
     }
 
-    /// Create a new logger instance for the given module name.
-    pub fn get_logger(name: &str) -> Logger {
-        Logger {
-            name: name.to_string(),
-        }
+    /// Create a logger for the given module name.
+    ///
+    /// Borrows the name instead of copying it, so calling this at the top of a
+    /// hot method costs nothing; it is also usable in `static` initializers.
+    pub const fn get_logger(name: &'static str) -> Logger {
+        Logger { name }
     }
 
     /// Validate that a request has required fields (path, method).
@@ -96,39 +220,104 @@ w(
         Ok(())
     }
 
-    /// Generate a unique request identifier based on timestamp.
+    /// Process start time in milliseconds, read once by `generate_request_id`.
+    static REQUEST_ID_SEED: OnceLock<u64> = OnceLock::new();
+    /// Sequence number for request identifiers within this process.
+    static REQUEST_ID_SEQ: AtomicU64 = AtomicU64::new(0);
+
+    /// Generate a unique request identifier from the process start time and a
+    /// per-process sequence number; the clock is only read on the first call.
     pub fn generate_request_id() -> String {
-        let ts = SystemTime::now()
-            .duration_since(UNIX_EPOCH)
-            .unwrap_or_default()
-            .as_millis();
-        format!("req-{}-{}", ts, ts % 1000)
+        let seed = *REQUEST_ID_SEED.get_or_init(|| {
+            SystemTime::now()
+                .duration_since(UNIX_EPOCH)
+                .unwrap_or_default()
+                .as_millis() as u64
+        });
+        let seq = REQUEST_ID_SEQ.fetch_add(1, Ordering::Relaxed);
+        let mut id = String::with_capacity(40);
+        let _ = write!(id, "req-{}-{}", seed, seq);
+        id
     }
 
     /// Sanitize user input by removing control characters and trimming.
-    pub fn sanitize_input(value: &str) -> String {
-        value
-            .chars()
-            .filter(|c| !c.is_control())
-            .collect::<String>()
-            .trim()
-            .to_string()
+    ///
+    /// Clean input comes back borrowed; a copy is made only when control
+    /// characters have to be removed.
+    pub fn sanitize_input(value: &str) -> Cow<'_, str> {
+        // Control characters outside the trimmed slice are all whitespace, so
+        // when the slice itself has none it is already the answer.
+        let trimmed = value.trim();
+        let clean = if trimmed.is_ascii() {
+            !trimmed.bytes().any(|b| b.is_ascii_control())
+        } else {
+            !trimmed.chars().any(char::is_control)
+        };
+        if clean {
+            return Cow::Borrowed(trimmed);
+        }
+        // Single pass over the bytes while the input is ASCII; the first
+        // non-ASCII byte is a char boundary, so the rest goes through chars().
+        let mut out = String::with_capacity(value.len());
+        for (i, &b) in value.as_bytes().iter().enumerate() {
+            if !b.is_ascii() {
+                out.extend(value[i..].chars().filter(|c| !c.is_control()));
+                break;
+            }
+            if !b.is_ascii_control() {
+                out.push(b as char);
+            }
+        }
+        // Trim in place rather than copying the trimmed slice.
+        let end = out.trim_end().len();
+        out.truncate(end);
+        let start = out.len() - out.trim_start().len();
+        out.drain(..start);
+        Cow::Owned(out)
     }
 
     /// Paginate a slice of items, returning the requested page.
     pub fn paginate<T: Clone>(items: &[T], page: usize, per_page: usize) -> Vec<T> {
-        let start = (page.saturating_sub(1)) * per_page;
-        items.iter().skip(start).take(per_page).cloned().collect()
+        let start = page.saturating_sub(1).saturating_mul(per_page);
+        if start >= items.len() {
+            return Vec::new();
+        }
+        let end = start.saturating_add(per_page).min(items.len());
+        items[start..end].to_vec()
     }
 
     /// Mask sensitive fields in a string value for safe logging.
     pub fn mask_sensitive(value: &str) -> String {
-        if value.len() > 4 {
-            format!("{}***{}", &value[..2], &value[value.len() - 2..])
-        } else {
-            "***".to_string()
+        // Keep the first and last two chars (not bytes) of values longer than
+        // four chars, so multi-byte input never splits a code point.
+        let head_end = value.char_indices().nth(1).map(|(i, c)| i + c.len_utf8());
+        let tail_start = value.char_indices().rev().nth(1).map(|(i, _)| i);
+        match (head_end, tail_start) {
+            (Some(h), Some(t)) if h < t => {
+                let mut masked = String::with_capacity(h + 3 + value.len() - t);
+                masked.push_str(&value[..h]);
+                masked.push_str("***");
+                masked.push_str(&value[t..]);
+                masked
+            }
+            _ => "***".to_string(),
         }
     }
+
+    /// Room reserved for the literal part of a `json_body` template.
+    const JSON_TEMPLATE_RESERVE: usize = 64;
+
+    /// Render a small JSON response body around one value of `value_len` bytes.
+    ///
+    /// `format!` can only guess its output size and may regrow the buffer; a
+    /// response template plus its one value fits the reservation made here, so
+    /// the body is written with a single allocation. The value is inserted as
+    /// is, so it must not need JSON escaping.
+    pub fn json_body(value_len: usize, args: fmt::Arguments<'_>) -> String {
+        let mut body = String::with_capacity(JSON_TEMPLATE_RESERVE + value_len);
+        let _ = body.write_fmt(args);
+        body
+    }
     """,
 )
 
@@ -171,12 +360,50 @@ w(
         },
     }
 
+    impl AppErrorExt {
+        /// Create a validation error, logging it once.
+        pub fn validation(field: &str, message: String) -> Self {
+            let logger = get_logger("app_errors");
+            logger.info(format_args!("Validation error on field: {}", field));
+            AppErrorExt::Validation {
+                field: field.to_string(),
+                message,
+            }
+        }
+
+        /// Create a payment error, logging it once.
+        pub fn payment(transaction_id: Option<String>, message: String) -> Self {
+            let logger = get_logger("app_errors");
+            let txn = transaction_id.as_deref().unwrap_or("unknown");
+            logger.info(format_args!("Payment error for txn: {}", txn));
+            AppErrorExt::Payment {
+                transaction_id,
+                message,
+            }
+        }
+
+        /// Create a not-found error, logging it once.
+        pub fn not_found(resource: &str, identifier: &str) -> Self {
+            let logger = get_logger("app_errors");
+            logger.info(format_args!("{} not found: {}", resource, identifier));
+            AppErrorExt::NotFound {
+                resource: resource.to_string(),
+                identifier: identifier.to_string(),
+            }
+        }
+
+        /// Create a rate limit error, logging it once.
+        pub fn rate_limit(retry_after: u64) -> Self {
+            let logger = get_logger("app_errors");
+            logger.warn(format_args!("Rate limited, retry after {}s", retry_after));
+            AppErrorExt::RateLimit { retry_after }
+        }
+    }
+
     impl fmt::Display for AppErrorExt {
         fn fmt(&self, f: &mut fmt::Formatter<'_>) -> fmt::Result {
-            let logger = get_logger("app_errors");
             match self {
                 AppErrorExt::Validation { field, message } => {
-                    logger.info(&format!("Validation error on field: {}", field));
                     write!(f, "Validation error on '{}': {}", field, message)
                 }
                 AppErrorExt::Payment {
@@ -184,18 +411,13 @@ w(
                     message,
                 } => {
                     let txn = transaction_id.as_deref().unwrap_or("unknown");
-                    logger.info(&format!("Payment error for txn: {}", txn));
                     write!(f, "Payment error (txn: {}): {}", txn, message)
                 }
                 AppErrorExt::NotFound {
                     resource,
                     identifier,
-                } => {
-                    logger.info(&format!("{} not found: {}", resource, identifier));
-                    write!(f, "{} with id '{}' not found", resource, identifier)
-                }
+                } => write!(f, "{} with id '{}' not found", resource, identifier),
                 AppErrorExt::RateLimit { retry_after } => {
-                    logger.warn(&format!("Rate limited, retry after {}s", retry_after));
                     write!(f, "Rate limit exceeded. Retry after {}s", retry_after)
                 }
             }
@@ -219,18 +441,15 @@ w(
 # ─── database/mod.rs ───
 w(
     "database/mod.rs",
-    """\
-    pub mod pool;
-    pub mod connection;
-    pub mod queries;
-    pub mod migrations;
-    """,
+    "pub mod pool;\npub mod connection;\npub mod queries;\npub mod migrations;\n",
 )
 
 # ─── database/pool.rs ───
 w(
     "database/pool.rs",
     """\
+    use std::collections::HashMap;
+
     use crate::utils::helpers::get_logger;
 
     /// A handle representing a single borrowed connection from the pool.
@@ -251,6 +470,10 @@ w(
         max_size: usize,
         /// All connection handles managed by this pool.
         connections: Vec<ConnectionHandle>,
+        /// Indices of idle handles; the next one to hand out is on top.
+        free: Vec<usize>,
+        /// Connection ID to index in `connections`, built once at initialization.
+        id_index: HashMap<Box<str>, usize>,
         /// Whether the pool has been initialized.
         initialized: bool,
     }
@@ -259,11 +482,13 @@ w(
         /// Create a new connection pool with the given DSN and size.
         pub fn new(dsn: &str, max_size: usize) -> Self {
             let logger = get_logger("database.pool");
-            logger.info(&format!("Creating pool: dsn={}, size={}", dsn, max_size));
+            logger.info(format_args!("Creating pool: dsn={}, size={}", dsn, max_size));
             Self {
                 dsn: dsn.to_string(),
                 max_size,
                 connections: Vec::new(),
+                free: Vec::new(),
+                id_index: HashMap::new(),
                 initialized: false,
             }
         }
@@ -274,15 +499,21 @@ w(
             if self.initialized {
                 return Ok(());
             }
+            self.connections.reserve(self.max_size);
+            self.id_index.reserve(self.max_size);
             for i in 0..self.max_size {
+                let id = format!("conn-{}", i);
+                self.id_index.insert(id.as_str().into(), i);
                 self.connections.push(ConnectionHandle {
-                    id: format!("conn-{}", i),
+                    id,
                     in_use: false,
                     query_count: 0,
                 });
             }
+            // Reversed so that pops hand out conn-0 first, as the old scan did.
+            self.free.extend((0..self.max_size).rev());
             self.initialized = true;
-            logger.info(&format!("Pool initialized with {} connections", self.max_size));
+            logger.info(format_args!("Pool initialized with {} connections", self.max_size));
             Ok(())
         }
 
@@ -292,13 +523,12 @@ w(
             if !self.initialized {
                 self.initialize()?;
             }
-            for conn in &mut self.connections {
-                if !conn.in_use {
-                    conn.in_use = true;
-                    conn.query_count += 1;
-                    logger.info(&format!("Acquired connection {}", conn.id));
-                    return Ok(conn);
-                }
+            if let Some(idx) = self.free.pop() {
+                let conn = &mut self.connections[idx];
+                conn.in_use = true;
+                conn.query_count += 1;
+                logger.info(format_args!("Acquired connection {}", conn.id));
+                return Ok(conn);
             }
             Err("Connection pool exhausted".to_string())
         }
@@ -306,19 +536,21 @@ w(
         /// Release a connection back to the pool by ID.
         pub fn release_connection(&mut self, conn_id: &str) {
             let logger = get_logger("database.pool");
-            for conn in &mut self.connections {
-                if conn.id == conn_id {
+            if let Some(&idx) = self.id_index.get(conn_id) {
+                let conn = &mut self.connections[idx];
+                // Guard against double release pushing the same index twice.
+                if conn.in_use {
                     conn.in_use = false;
-                    logger.info(&format!("Released connection {}", conn_id));
-                    return;
+                    self.free.push(idx);
+                    logger.info(format_args!("Released connection {}", conn_id));
                 }
             }
         }
 
         /// Return pool statistics.
         pub fn stats(&self) -> (usize, usize, usize) {
-            let active = self.connections.iter().filter(|c| c.in_use).count();
-            let idle = self.connections.len() - active;
+            let idle = self.free.len();
+            let active = self.connections.len() - idle;
             (self.connections.len(), active, idle)
         }
 
@@ -326,6 +558,8 @@ w(
         pub fn shutdown(&mut self) {
             let logger = get_logger("database.pool");
             self.connections.clear();
+            self.free.clear();
+            self.id_index.clear();
             self.initialized = false;
             logger.info("Pool shut down");
         }
@@ -337,19 +571,52 @@ w(
 w(
     "database/connection.rs",
     """\
+    use std::collections::HashMap;
+    use std::sync::Arc;
+
     use crate::utils::helpers::get_logger;
     use crate::database::pool::ConnectionPool;
 
     /// The result of a database query.
     pub struct QueryResult {
-        /// Rows returned as key-value pairs.
-        pub rows: Vec<Vec<(String, String)>>,
+        /// Column names, stored once and shared by every row.
+        pub column_names: Vec<Arc<str>>,
+        /// Row values; `values[row][col]` belongs to `column_names[col]`.
+        pub values: Vec<Vec<String>>,
         /// Number of rows affected.
         pub affected: usize,
         /// Duration of the query in milliseconds.
         pub duration_ms: u64,
     }
 
+    impl QueryResult {
+        /// Look up a value by row index and column name.
+        pub fn get(&self, row: usize, column: &str) -> Option<&str> {
+            let col = self.column_names.iter().position(|name| &**name == column)?;
+            self.values.get(row).map(|values| values[col].as_str())
+        }
+
+        /// Build a map from each value of `column` to its row index, for callers
+        /// that look up many keys in one result. The first row wins on duplicate values.
+        pub fn index_by(&self, column: &str) -> Option<HashMap<&str, usize>> {
+            let col = self.column_names.iter().position(|name| &**name == column)?;
+            let mut index = HashMap::with_capacity(self.values.len());
+            for (row, values) in self.values.iter().enumerate() {
+                index.entry(values[col].as_str()).or_insert(row);
+            }
+            Some(index)
+        }
+
+        /// Keep only the first row, or return None when there are no rows.
+        pub fn first(mut self) -> Option<QueryResult> {
+            if self.values.is_empty() {
+                return None;
+            }
+            self.values.truncate(1);
+            Some(self)
+        }
+    }
+
     /// A high-level database connection wrapping a connection pool.
     pub struct DatabaseConnection {
         /// The underlying connection pool.
@@ -373,51 +640,78 @@ w(
         pub fn execute_query(&mut self, sql: &str, _params: &[&str]) -> Result<QueryResult, String> {
             let logger = get_logger("database.connection");
             let _handle = self.pool.get_connection()?;
-            logger.info(&format!("Executing: {}...", &sql[..sql.len().min(80)]));
+            // Back off to a char boundary so multi-byte SQL cannot panic the slice.
+            let mut n = sql.len().min(80);
+            while !sql.is_char_boundary(n) {
+                n -= 1;
+            }
+            logger.info(format_args!("Executing: {}...", &sql[..n]));
             Ok(QueryResult {
-                rows: Vec::new(),
+                column_names: Vec::new(),
+                values: Vec::new(),
                 affected: 0,
                 duration_ms: 1,
             })
         }
 
         /// Find a single record by its ID.
-        pub fn find_by_id(&mut self, table: &str, id: &str) -> Result<Option<Vec<(String, String)>>, String> {
+        pub fn find_by_id(&mut self, table: &str, id: &str) -> Result<Option<QueryResult>, String> {
             let logger = get_logger("database.connection");
-            logger.info(&format!("Finding {} by id {}", table, id));
+            logger.info(format_args!("Finding {} by id {}", table, id));
             let result = self.execute_query(
                 &format!("SELECT * FROM {} WHERE id = ?", table),
                 &[id],
             )?;
-            Ok(result.rows.into_iter().next())
+            Ok(result.first())
         }
 
         /// Insert a new record into the given table.
         pub fn insert(&mut self, table: &str, data: &[(&str, &str)]) -> Result<String, String> {
             let logger = get_logger("database.connection");
-            let cols: Vec<&str> = data.iter().map(|(k, _)| *k).collect();
+            let mut sql = String::with_capacity(32 + table.len() + 16 * data.len());
+            sql.push_str("INSERT INTO ");
+            sql.push_str(table);
+            sql.push_str(" (");
+            for (i, (k, _)) in data.iter().enumerate() {
+                if i > 0 {
+                    sql.push_str(", ");
+                }
+                sql.push_str(k);
+            }
+            sql.push_str(") VALUES (");
+            for i in 0..data.len() {
+                if i > 0 {
+                    sql.push_str(", ");
+                }
+                sql.push('?');
+            }
+            sql.push(')');
             let vals: Vec<&str> = data.iter().map(|(_, v)| *v).collect();
-            let sql = format!(
-                "INSERT INTO {} ({}) VALUES ({})",
-                table,
-                cols.join(", "),
-                vals.iter().map(|_| "?").collect::<Vec<_>>().join(", ")
-            );
             self.execute_query(&sql, &vals)?;
-            logger.info(&format!("Inserted into {}", table));
+            logger.info(format_args!("Inserted into {}", table));
             Ok("generated-id".to_string())
         }
 
         /// Update a record by its ID.
         pub fn update(&mut self, table: &str, id: &str, data: &[(&str, &str)]) -> Result<usize, String> {
             let logger = get_logger("database.connection");
-            let sets: Vec<String> = data.iter().map(|(k, _)| format!("{} = ?", k)).collect();
-            let vals: Vec<&str> = data.iter().map(|(_, v)| *v).collect();
-            let sql = format!("UPDATE {} SET {} WHERE id = ?", table, sets.join(", "));
-            let mut params = vals;
+            let mut sql = String::with_capacity(32 + table.len() + 20 * data.len());
+            sql.push_str("UPDATE ");
+            sql.push_str(table);
+            sql.push_str(" SET ");
+            for (i, (k, _)) in data.iter().enumerate() {
+                if i > 0 {
+                    sql.push_str(", ");
+                }
+                sql.push_str(k);
+                sql.push_str(" = ?");
+            }
+            sql.push_str(" WHERE id = ?");
+            let mut params: Vec<&str> = Vec::with_capacity(data.len() + 1);
+            params.extend(data.iter().map(|(_, v)| *v));
             params.push(id);
             let result = self.execute_query(&sql, &params)?;
-            logger.info(&format!("Updated {} row(s) in {}", result.affected, table));
+            logger.info(format_args!("Updated {} row(s) in {}", result.affected, table));
             Ok(result.affected)
         }
 
@@ -426,7 +720,7 @@ w(
             let logger = get_logger("database.connection");
             let sql = format!("DELETE FROM {} WHERE id = ?", table);
             let result = self.execute_query(&sql, &[id])?;
-            logger.info(&format!("Deleted from {}: affected={}", table, result.affected));
+            logger.info(format_args!("Deleted from {}: affected={}", table, result.affected));
             Ok(result.affected > 0)
         }
 
@@ -483,32 +777,31 @@ w(
         }
 
         /// Find a user by their email address.
-        pub fn find_by_email(&mut self, email: &str) -> Result<Option<Vec<(String, String)>>, String> {
+        pub fn find_by_email(&mut self, email: &str) -> Result<Option<QueryResult>, String> {
             let logger = get_logger("database.queries.user");
-            logger.info(&format!("Finding user by email: {}", email));
+            logger.info(format_args!("Finding user by email: {}", email));
             let result = self.db.execute_query("SELECT * FROM users WHERE email = ?", &[email])?;
-            Ok(result.rows.into_iter().next())
+            Ok(result.first())
         }
 
         /// Find all active users with an optional limit.
-        pub fn find_active(&mut self, limit: usize) -> Result<Vec<Vec<(String, String)>>, String> {
+        pub fn find_active(&mut self, limit: usize) -> Result<QueryResult, String> {
             let logger = get_logger("database.queries.user");
-            logger.info(&format!("Finding active users, limit={}", limit));
-            let result = self.db.execute_query("SELECT * FROM users WHERE active = 1 LIMIT ?", &[&limit.to_string()])?;
-            Ok(result.rows)
+            logger.info(format_args!("Finding active users, limit={}", limit));
+            self.db.execute_query("SELECT * FROM users WHERE active = 1 LIMIT ?", &[&limit.to_string()])
         }
 
         /// Search users by name or email pattern.
         pub fn search(&mut self, query: &str) -> Result<QueryResult, String> {
             let logger = get_logger("database.queries.user");
-            logger.info(&format!("Searching users: {}", query));
+            logger.info(format_args!("Searching users: {}", query));
             self.db.execute_query("SELECT * FROM users WHERE name LIKE ? OR email LIKE ?", &[query, query])
         }
 
         /// Soft-delete a user by setting their deleted_at timestamp.
         pub fn soft_delete(&mut self, user_id: &str) -> Result<bool, String> {
             let logger = get_logger("database.queries.user");
-            logger.info(&format!("Soft-deleting user {}", user_id));
+            logger.info(format_args!("Soft-deleting user {}", user_id));
             let affected = self.db.update("users", user_id, &[("deleted_at", "now")])?;
             Ok(affected > 0)
         }
@@ -527,24 +820,24 @@ w(
         }
 
         /// Find an active session by token hash.
-        pub fn find_active_session(&mut self, token: &str) -> Result<Option<Vec<(String, String)>>, String> {
+        pub fn find_active_session(&mut self, token: &str) -> Result<Option<QueryResult>, String> {
             let logger = get_logger("database.queries.session");
             logger.info("Finding active session by token");
             let result = self.db.execute_query("SELECT * FROM sessions WHERE token_hash = ?", &[token])?;
-            Ok(result.rows.into_iter().next())
+            Ok(result.first())
         }
 
         /// Create a new session record.
         pub fn create_session(&mut self, user_id: &str, token_hash: &str, ip: &str) -> Result<String, String> {
             let logger = get_logger("database.queries.session");
-            logger.info(&format!("Creating session for user {}", user_id));
+            logger.info(format_args!("Creating session for user {}", user_id));
             self.db.insert("sessions", &[("user_id", user_id), ("token_hash", token_hash), ("ip_address", ip)])
         }
 
         /// Expire a session by its ID.
         pub fn expire_session(&mut self, session_id: &str) -> Result<bool, String> {
             let logger = get_logger("database.queries.session");
-            logger.info(&format!("Expiring session {}", session_id));
+            logger.info(format_args!("Expiring session {}", session_id));
             let affected = self.db.update("sessions", session_id, &[("expired_at", "now")])?;
             Ok(affected > 0)
         }
@@ -563,39 +856,33 @@ w(
         }
 
         /// Find a payment by its transaction ID.
-        pub fn find_by_transaction_id(&mut self, txn_id: &str) -> Result<Option<Vec<(String, String)>>, String> {
+        pub fn find_by_transaction_id(&mut self, txn_id: &str) -> Result<Option<QueryResult>, String> {
             let logger = get_logger("database.queries.payment");
-            logger.info(&format!("Finding payment by txn: {}", txn_id));
+            logger.info(format_args!("Finding payment by txn: {}", txn_id));
             let result = self.db.execute_query("SELECT * FROM payments WHERE transaction_id = ?", &[txn_id])?;
-            Ok(result.rows.into_iter().next())
+            Ok(result.first())
         }
 
         /// Find all payments for a user, optionally filtered by status.
-        pub fn find_user_payments(&mut self, user_id: &str, status: Option<&str>) -> Result<Vec<Vec<(String, String)>>, String> {
+        pub fn find_user_payments(&mut self, user_id: &str, status: Option<&str>) -> Result<QueryResult, String> {
             let logger = get_logger("database.queries.payment");
-            logger.info(&format!("Finding payments for user {}", user_id));
+            logger.info(format_args!("Finding payments for user {}", user_id));
             match status {
-                Some(s) => {
-                    let result = self.db.execute_query(
-                        "SELECT * FROM payments WHERE user_id = ? AND status = ?",
-                        &[user_id, s],
-                    )?;
-                    Ok(result.rows)
-                }
-                None => {
-                    let result = self.db.execute_query(
-                        "SELECT * FROM payments WHERE user_id = ?",
-                        &[user_id],
-                    )?;
-                    Ok(result.rows)
-                }
+                Some(s) => self.db.execute_query(
+                    "SELECT * FROM payments WHERE user_id = ? AND status = ?",
+                    &[user_id, s],
+                ),
+                None => self.db.execute_query(
+                    "SELECT * FROM payments WHERE user_id = ?",
+                    &[user_id],
+                ),
             }
         }
 
         /// Create a new payment record.
         pub fn create_payment(&mut self, user_id: &str, amount: &str, currency: &str, txn_id: &str) -> Result<String, String> {
             let logger = get_logger("database.queries.payment");
-            logger.info(&format!("Creating payment: {} {} for user {}", amount, currency, user_id));
+            logger.info(format_args!("Creating payment: {} {} for user {}", amount, currency, user_id));
             self.db.insert("payments", &[
                 ("user_id", user_id),
                 ("amount", amount),
@@ -608,7 +895,7 @@ w(
         /// Update the status of a payment.
         pub fn update_status(&mut self, txn_id: &str, status: &str) -> Result<bool, String> {
             let logger = get_logger("database.queries.payment");
-            logger.info(&format!("Updating payment {} to {}", txn_id, status));
+            logger.info(format_args!("Updating payment {} to {}", txn_id, status));
             let result = self.db.execute_query(
                 "UPDATE payments SET status = ? WHERE transaction_id = ?",
                 &[status, txn_id],
@@ -679,25 +966,24 @@ w(
             Self { db, migrations }
         }
 
-        /// Run all pending migrations, returning the count applied.
+        /// Run all pending migrations in a single transaction, returning the
+        /// count applied. A failure rolls back the whole batch.
         pub fn run_pending(&mut self) -> Result<u32, String> {
             let logger = get_logger("database.migrations");
             let mut count = 0u32;
+            self.db.begin_transaction()?;
             for migration in &self.migrations {
-                logger.info(&format!("Applying migration {}: {}", migration.version, migration.name));
-                self.db.begin_transaction()?;
+                logger.info(format_args!("Applying migration {}: {}", migration.version, migration.name));
                 match self.db.execute_query(&migration.sql, &[]) {
-                    Ok(_) => {
-                        self.db.commit()?;
-                        count += 1;
-                    }
+                    Ok(_) => count += 1,
                     Err(e) => {
                         self.db.rollback()?;
                         return Err(format!("Migration {} failed: {}", migration.version, e));
                     }
                 }
             }
-            logger.info(&format!("{} migrations applied", count));
+            self.db.commit()?;
+            logger.info(format_args!("{} migrations applied", count));
             Ok(count)
         }
 
@@ -705,7 +991,7 @@ w(
         pub fn status(&self) -> (usize, usize) {
             let logger = get_logger("database.migrations");
             let total = self.migrations.len();
-            logger.info(&format!("{} total migrations", total));
+            logger.info(format_args!("{} total migrations", total));
             (0, total)
         }
     }
@@ -766,7 +1052,7 @@ w(
         /// Create a new base service with the given name.
         pub fn new(name: &str) -> Self {
             let logger = get_logger("services.base");
-            logger.info(&format!("Creating service: {}", name));
+            logger.info(format_args!("Creating service: {}", name));
             Self {
                 name: name.to_string(),
                 initialized: false,
@@ -774,12 +1060,21 @@ w(
         }
 
         /// Check whether the service is initialized and return an error if not.
+        #[inline]
         pub fn require_initialized(&self) -> Result<(), String> {
             if !self.initialized {
-                return Err(format!("{} not initialized", self.name));
+                return Err(self.not_initialized());
             }
             Ok(())
         }
+
+        /// Build the error for a call made before `initialize`. Kept out of line
+        /// and cold so callers inline only the flag test.
+        #[cold]
+        #[inline(never)]
+        fn not_initialized(&self) -> String {
+            format!("{} not initialized", self.name)
+        }
     }
 
     impl Service for BaseServiceImpl {
@@ -787,7 +1082,7 @@ w(
         fn initialize(&mut self) -> Result<(), String> {
             let logger = get_logger("services.base");
             self.initialized = true;
-            logger.info(&format!("{} initialized", self.name));
+            logger.info(format_args!("{} initialized", self.name));
             Ok(())
         }
 
@@ -795,7 +1090,7 @@ w(
         fn shutdown(&mut self) -> Result<(), String> {
             let logger = get_logger("services.base");
             self.initialized = false;
-            logger.info(&format!("{} shut down", self.name));
+            logger.info(format_args!("{} shut down", self.name));
             Ok(())
         }
 
@@ -819,7 +1114,7 @@ w(
 w(
     "services/cacheable.rs",
     """\
-    use std::collections::HashMap;
+    use rustc_hash::FxHashMap;
 
     use crate::utils::helpers::get_logger;
     use crate::services::base::{Service, ServiceHealth, BaseServiceImpl};
@@ -828,20 +1123,23 @@ w(
     pub struct CacheableService {
         /// The underlying service implementation.
         inner: BaseServiceImpl,
-        /// The in-memory cache store.
-        cache: HashMap<String, String>,
+        /// The in-memory cache store, keyed with FxHash rather than SipHash.
+        cache: FxHashMap<Box<str>, String>,
         /// Default time-to-live in seconds for cache entries.
         default_ttl: u64,
     }
 
+    /// Entries the cache can hold before its first rehash.
+    const INITIAL_CAPACITY: usize = 1024;
+
     impl CacheableService {
         /// Create a new cacheable service with the given name.
         pub fn new(name: &str) -> Self {
             let logger = get_logger("services.cacheable");
-            logger.info(&format!("Creating CacheableService: {}", name));
+            logger.info(format_args!("Creating CacheableService: {}", name));
             Self {
                 inner: BaseServiceImpl::new(name),
-                cache: HashMap::new(),
+                cache: FxHashMap::with_capacity_and_hasher(INITIAL_CAPACITY, Default::default()),
                 default_ttl: 300,
             }
         }
@@ -851,11 +1149,11 @@ w(
             let logger = get_logger("services.cacheable");
             match self.cache.get(key) {
                 Some(val) => {
-                    logger.info(&format!("Cache hit: {}", key));
+                    logger.info(format_args!("Cache hit: {}", key));
                     Some(val)
                 }
                 None => {
-                    logger.info(&format!("Cache miss: {}", key));
+                    logger.info(format_args!("Cache miss: {}", key));
                     None
                 }
             }
@@ -864,8 +1162,17 @@ w(
         /// Store a value in the cache with the given key.
         pub fn cache_set(&mut self, key: &str, value: &str) {
             let logger = get_logger("services.cacheable");
-            self.cache.insert(key.to_string(), value.to_string());
-            logger.info(&format!("Cache set: {} (ttl={}s)", key, self.default_ttl));
+            // Overwrite in place on update; only a new key needs its own allocation.
+            match self.cache.get_mut(key) {
+                Some(existing) => {
+                    existing.clear();
+                    existing.push_str(value);
+                }
+                None => {
+                    self.cache.insert(key.into(), value.to_string());
+                }
+            }
+            logger.info(format_args!("Cache set: {} (ttl={}s)", key, self.default_ttl));
         }
 
         /// Remove all entries from the cache, returning the number removed.
@@ -873,7 +1180,7 @@ w(
             let logger = get_logger("services.cacheable");
             let count = self.cache.len();
             self.cache.clear();
-            logger.info(&format!("Cache cleared: {} entries", count));
+            logger.info(format_args!("Cache cleared: {} entries", count));
             count
         }
     }
@@ -902,17 +1209,27 @@ w(
 w(
     "services/auditable.rs",
     """\
+    use std::collections::VecDeque;
+    use std::sync::Arc;
+
+    use rustc_hash::FxHashMap;
+
     use crate::utils::helpers::get_logger;
     use crate::services::base::{Service, ServiceHealth, BaseServiceImpl};
 
     /// An entry in the audit trail.
+    ///
+    /// Action, actor and resource repeat across entries, so they are stored as
+    /// ids into the owning service's symbol table (see `AuditableService::symbol`).
+    /// That keeps the row small and makes a resource filter an integer compare.
+    /// An id is only meaningful while its entry is still in the log.
     pub struct AuditEntry {
-        /// The action that was performed.
-        pub action: String,
-        /// Who performed the action.
-        pub actor: String,
-        /// The resource affected.
-        pub resource: String,
+        /// Symbol id of the action that was performed.
+        pub action: u32,
+        /// Symbol id of who performed the action.
+        pub actor: u32,
+        /// Symbol id of the resource affected.
+        pub resource: u32,
         /// Additional details about the action.
         pub details: String,
         /// Timestamp of the action.
@@ -928,22 +1245,94 @@ w(
         fn get_audit_trail(&self, resource: Option<&str>, limit: usize) -> Vec<&AuditEntry>;
     }
 
+    /// Number of audit entries retained; older entries are dropped first.
+    const MAX_AUDIT: usize = 4096;
+
+    /// Entries compared per step of a filtered trail scan; one bit each in a u32.
+    const LANES: usize = 32;
+
+    /// Bitmask of the positions in `column` (at most `LANES` long) equal to `id`.
+    /// Built without branches so the compiler can turn it into a vector compare.
+    fn match_mask(column: &[u32], id: u32) -> u32 {
+        column
+            .iter()
+            .enumerate()
+            .fold(0, |mask, (i, &r)| mask | (u32::from(r == id) << i))
+    }
+
     /// A service that automatically records an audit trail.
     pub struct AuditableService {
         /// The underlying service implementation.
         inner: BaseServiceImpl,
-        /// The stored audit log entries.
-        audit_log: Vec<AuditEntry>,
+        /// The most recent audit entries, oldest at the front.
+        audit_log: VecDeque<AuditEntry>,
+        /// Resource id of each entry in `audit_log`, as a dense column so a
+        /// filtered scan reads four bytes per entry and touches only the rows
+        /// that match.
+        audit_resources: VecDeque<u32>,
+        /// Distinct action, actor and resource names, indexed by symbol id.
+        symbols: Vec<Arc<str>>,
+        /// Number of retained entry fields using each symbol id.
+        symbol_refs: Vec<u32>,
+        /// Ids whose last entry has left the log, reused before new ones so the
+        /// table never outgrows the names the log still holds.
+        free_symbols: Vec<u32>,
+        /// Name to symbol id; keys share their allocation with `symbols`.
+        symbol_ids: FxHashMap<Arc<str>, u32>,
     }
 
     impl AuditableService {
         /// Create a new auditable service with the given name.
         pub fn new(name: &str) -> Self {
             let logger = get_logger("services.auditable");
-            logger.info(&format!("Creating AuditableService: {}", name));
+            logger.info(format_args!("Creating AuditableService: {}", name));
             Self {
                 inner: BaseServiceImpl::new(name),
-                audit_log: Vec::new(),
+                audit_log: VecDeque::with_capacity(MAX_AUDIT),
+                audit_resources: VecDeque::with_capacity(MAX_AUDIT),
+                symbols: Vec::new(),
+                symbol_refs: Vec::new(),
+                free_symbols: Vec::new(),
+                symbol_ids: FxHashMap::default(),
+            }
+        }
+
+        /// Return the name behind a symbol id taken from an `AuditEntry`.
+        pub fn symbol(&self, id: u32) -> &str {
+            &self.symbols[id as usize]
+        }
+
+        /// Return the symbol id for `name` and count one more use of it,
+        /// assigning a free or new id if the name is not in the table.
+        fn symbol_id(&mut self, name: &str) -> u32 {
+            if let Some(&id) = self.symbol_ids.get(name) {
+                self.symbol_refs[id as usize] += 1;
+                return id;
+            }
+            let name: Arc<str> = Arc::from(name);
+            let id = match self.free_symbols.pop() {
+                Some(id) => {
+                    self.symbols[id as usize] = Arc::clone(&name);
+                    self.symbol_refs[id as usize] = 1;
+                    id
+                }
+                None => {
+                    self.symbols.push(Arc::clone(&name));
+                    self.symbol_refs.push(1);
+                    (self.symbols.len() - 1) as u32
+                }
+            };
+            self.symbol_ids.insert(name, id);
+            id
+        }
+
+        /// Drop one use of a symbol id, evicting its name once no entry uses it.
+        fn release_symbol(&mut self, id: u32) {
+            let refs = &mut self.symbol_refs[id as usize];
+            *refs -= 1;
+            if *refs == 0 {
+                self.symbol_ids.remove(&self.symbols[id as usize]);
+                self.free_symbols.push(id);
             }
         }
     }
@@ -952,26 +1341,57 @@ w(
         /// Record an audit entry.
         fn record_audit(&mut self, action: &str, actor: &str, resource: &str, details: &str) {
             let logger = get_logger("services.auditable");
-            logger.info(&format!("Audit: {} {} on {}", actor, action, resource));
-            self.audit_log.push(AuditEntry {
-                action: action.to_string(),
-                actor: actor.to_string(),
-                resource: resource.to_string(),
+            logger.info(format_args!("Audit: {} {} on {}", actor, action, resource));
+            if self.audit_log.len() == MAX_AUDIT {
+                if let Some(oldest) = self.audit_log.pop_front() {
+                    self.audit_resources.pop_front();
+                    self.release_symbol(oldest.action);
+                    self.release_symbol(oldest.actor);
+                    self.release_symbol(oldest.resource);
+                }
+            }
+            let entry = AuditEntry {
+                action: self.symbol_id(action),
+                actor: self.symbol_id(actor),
+                resource: self.symbol_id(resource),
                 details: details.to_string(),
                 timestamp: 0,
-            });
+            };
+            self.audit_resources.push_back(entry.resource);
+            self.audit_log.push_back(entry);
         }
 
         /// Get the audit trail, optionally filtered by resource.
         fn get_audit_trail(&self, resource: Option<&str>, limit: usize) -> Vec<&AuditEntry> {
             let logger = get_logger("services.auditable");
-            logger.info(&format!("Getting audit trail, limit={}", limit));
-            self.audit_log
-                .iter()
-                .filter(|e| resource.map_or(true, |r| e.resource == r))
-                .rev()
-                .take(limit)
-                .collect()
+            logger.info(format_args!("Getting audit trail, limit={}", limit));
+            let mut trail = Vec::with_capacity(limit.min(self.audit_log.len()));
+            let Some(resource) = resource else {
+                trail.extend(self.audit_log.iter().rev().take(limit));
+                return trail;
+            };
+            // A resource with no entry left in the log matches nothing.
+            let Some(&id) = self.symbol_ids.get(resource) else {
+                return trail;
+            };
+            // Newest first: the back slice holds the more recent entries.
+            let (front, back) = self.audit_resources.as_slices();
+            for (base, column) in [(front.len(), back), (0, front)] {
+                let mut start = column.len();
+                for chunk in column.rchunks(LANES) {
+                    start -= chunk.len();
+                    let mut mask = match_mask(chunk, id);
+                    while mask != 0 {
+                        if trail.len() == limit {
+                            return trail;
+                        }
+                        let bit = 31 - mask.leading_zeros() as usize;
+                        mask ^= 1 << bit;
+                        trail.push(&self.audit_log[base + start + bit]);
+                    }
+                }
+            }
+            trail
         }
     }
 
@@ -1030,7 +1450,7 @@ w(
             self.inner.require_initialized()
                 .map_err(|e| AppError::Internal(e))?;
             let clean_email = sanitize_input(email);
-            logger.info(&format!("Authentication attempt for {}", clean_email));
+            logger.info(format_args!("Authentication attempt for {}", clean_email));
             self.auth.login(&clean_email, password)
         }
 
@@ -1073,9 +1493,7 @@ w(
 # ─── services/email/mod.rs ───
 w(
     "services/email/mod.rs",
-    """\
-    pub mod sender;
-    """,
+    "pub mod sender;\n",
 )
 
 # ─── services/email/sender.rs ───
@@ -1097,6 +1515,34 @@ w(
         pub message_id: String,
     }
 
+    /// Substitute `{{key}}` placeholders from `vars` in one left-to-right pass.
+    /// Placeholders with no matching var are left as written.
+    fn render_template(template: &str, vars: &[(&str, &str)]) -> String {
+        let mut out = String::with_capacity(template.len());
+        let mut rest = template;
+        while let Some(open) = rest.find("{{") {
+            out.push_str(&rest[..open]);
+            let after = &rest[open + 2..];
+            let found = after.find("}}").and_then(|close| {
+                let key = &after[..close];
+                vars.iter().find(|(k, _)| *k == key).map(|(_, value)| (close, *value))
+            });
+            match found {
+                Some((close, value)) => {
+                    out.push_str(value);
+                    rest = &after[close + 2..];
+                }
+                None => {
+                    // Not a known placeholder: keep one brace and rescan after it.
+                    out.push('{');
+                    rest = &rest[open + 1..];
+                }
+            }
+        }
+        out.push_str(rest);
+        out
+    }
+
     /// Sends emails using a configured SMTP-like backend.
     pub struct EmailSender {
         /// The underlying service state.
@@ -1111,7 +1557,7 @@ w(
         /// Create a new email sender with the given from address.
         pub fn new(from_address: &str) -> Self {
             let logger = get_logger("services.email");
-            logger.info(&format!("Creating EmailSender from={}", from_address));
+            logger.info(format_args!("Creating EmailSender from={}", from_address));
             Self {
                 inner: BaseServiceImpl::new("email_sender"),
                 from_address: from_address.to_string(),
@@ -1126,12 +1572,12 @@ w(
             let clean_subject = sanitize_input(subject);
             let clean_body = sanitize_input(body);
             let message_id = generate_request_id();
-            logger.info(&format!("Sending email to={}, subject={}", to, clean_subject));
+            logger.info(format_args!("Sending email to={}, subject={}", to, clean_subject));
             self.sent_count += 1;
             Ok(EmailMessage {
                 to: to.to_string(),
-                subject: clean_subject,
-                body: clean_body,
+                subject: clean_subject.into_owned(),
+                body: clean_body.into_owned(),
                 message_id,
             })
         }
@@ -1145,11 +1591,8 @@ w(
         ) -> Result<EmailMessage, String> {
             let logger = get_logger("services.email");
             self.inner.require_initialized()?;
-            let mut body = template.to_string();
-            for (key, value) in vars {
-                body = body.replace(&format!("{{{{{}}}}}", key), value);
-            }
-            logger.info(&format!("Sending template email to={}", to));
+            let body = render_template(template, vars);
+            logger.info(format_args!("Sending template email to={}", to));
             self.send(to, template, &body)
         }
 
@@ -1181,10 +1624,7 @@ w(
 # ─── services/payment/mod.rs ───
 w(
     "services/payment/mod.rs",
-    """\
-    pub mod processor;
-    pub mod gateway;
-    """,
+    "pub mod processor;\npub mod gateway;\n",
 )
 
 # ─── services/payment/processor.rs ───
@@ -1195,9 +1635,7 @@ w(
     use crate::services::base::{Service, ServiceHealth, BaseServiceImpl};
     use crate::services::payment::gateway::PaymentGateway;
     use crate::app_errors::AppErrorExt;
-
-    /// Supported payment currencies.
-    const SUPPORTED_CURRENCIES: &[&str] = &["USD", "EUR", "GBP", "JPY", "CAD"];
+    use crate::validators::payment::is_supported_currency;
 
     /// The result of a payment processing operation.
     pub struct PaymentResult {
@@ -1240,21 +1678,15 @@ w(
         ) -> Result<PaymentResult, AppErrorExt> {
             let logger = get_logger("services.payment.processor");
             self.inner.require_initialized()
-                .map_err(|e| AppErrorExt::Payment {
-                    transaction_id: None,
-                    message: e,
-                })?;
+                .map_err(|e| AppErrorExt::payment(None, e))?;
             self.validate_payment(amount, currency)?;
-            logger.info(&format!("Processing payment: user={}, amount={} {}", user_id, amount, currency));
+            logger.info(format_args!("Processing payment: user={}, amount={} {}", user_id, amount, currency));
             let txn_id = generate_request_id();
             let gateway_result = self.gateway.charge(amount, currency, source);
             if !gateway_result.success {
-                return Err(AppErrorExt::Payment {
-                    transaction_id: Some(txn_id),
-                    message: gateway_result.message,
-                });
+                return Err(AppErrorExt::payment(Some(txn_id), gateway_result.message));
             }
-            logger.info(&format!("Payment completed: txn={}", txn_id));
+            logger.info(format_args!("Payment completed: txn={}", txn_id));
             Ok(PaymentResult {
                 transaction_id: txn_id,
                 status: "completed".to_string(),
@@ -1266,13 +1698,13 @@ w(
         /// Refund a previously completed payment.
         pub fn refund(&mut self, transaction_id: &str, reason: &str) -> Result<PaymentResult, AppErrorExt> {
             let logger = get_logger("services.payment.processor");
-            logger.info(&format!("Refunding payment: txn={}, reason={}", transaction_id, reason));
+            logger.info(format_args!("Refunding payment: txn={}, reason={}", transaction_id, reason));
             let gateway_result = self.gateway.refund_charge(transaction_id);
             if !gateway_result.success {
-                return Err(AppErrorExt::Payment {
-                    transaction_id: Some(transaction_id.to_string()),
-                    message: gateway_result.message,
-                });
+                return Err(AppErrorExt::payment(
+                    Some(transaction_id.to_string()),
+                    gateway_result.message,
+                ));
             }
             Ok(PaymentResult {
                 transaction_id: transaction_id.to_string(),
@@ -1284,23 +1716,17 @@ w(
 
         /// Validate payment parameters before processing.
         fn validate_payment(&self, amount: f64, currency: &str) -> Result<(), AppErrorExt> {
-            if !SUPPORTED_CURRENCIES.contains(&currency) {
-                return Err(AppErrorExt::Validation {
-                    field: "currency".to_string(),
-                    message: format!("Unsupported currency: {}", currency),
-                });
+            if !is_supported_currency(currency) {
+                return Err(AppErrorExt::validation(
+                    "currency",
+                    format!("Unsupported currency: {}", currency),
+                ));
             }
             if amount <= 0.0 {
-                return Err(AppErrorExt::Validation {
-                    field: "amount".to_string(),
-                    message: "Amount must be positive".to_string(),
-                });
+                return Err(AppErrorExt::validation("amount", "Amount must be positive".to_string()));
             }
             if amount > 999999.0 {
-                return Err(AppErrorExt::Validation {
-                    field: "amount".to_string(),
-                    message: "Amount exceeds maximum".to_string(),
-                });
+                return Err(AppErrorExt::validation("amount", "Amount exceeds maximum".to_string()));
             }
             Ok(())
         }
@@ -1329,7 +1755,10 @@ w(
 w(
     "services/payment/gateway.rs",
     """\
+    use std::sync::Arc;
+
     use crate::utils::helpers::{get_logger, generate_request_id};
+    use crate::utils::intern::intern;
 
     /// The result of a gateway API call.
     pub struct GatewayResponse {
@@ -1341,12 +1770,22 @@ w(
         pub message: String,
     }
 
-    /// A payment gateway client for charging and refunding.
-    pub struct PaymentGateway {
+    /// Gateway settings that are fixed at construction and never read on the
+    /// charge path.
+    struct GatewayConfig {
         /// The API key for gateway authentication.
-        api_key: String,
+        api_key: Arc<str>,
         /// The environment (sandbox or production).
-        environment: String,
+        environment: Arc<str>,
+    }
+
+    /// A payment gateway client for charging and refunding.
+    ///
+    /// The cold configuration lives behind a box so the client itself is just
+    /// a pointer and the request counter that `charge` updates.
+    pub struct PaymentGateway {
+        /// Construction-time settings.
+        config: Box<GatewayConfig>,
         /// Total number of API requests made.
         request_count: u64,
     }
@@ -1355,10 +1794,12 @@ w(
         /// Create a new payment gateway client.
         pub fn new(api_key: &str, environment: &str) -> Self {
             let logger = get_logger("services.payment.gateway");
-            logger.info(&format!("Gateway initialized: env={}", environment));
+            logger.info(format_args!("Gateway initialized: env={}", environment));
             Self {
-                api_key: api_key.to_string(),
-                environment: environment.to_string(),
+                config: Box::new(GatewayConfig {
+                    api_key: Arc::from(api_key),
+                    environment: intern(environment),
+                }),
                 request_count: 0,
             }
         }
@@ -1366,7 +1807,7 @@ w(
         /// Charge a payment source for the given amount.
         pub fn charge(&mut self, amount: f64, currency: &str, source: &str) -> GatewayResponse {
             let logger = get_logger("services.payment.gateway");
-            logger.info(&format!("Charging {} {} from {}", amount, currency, source));
+            logger.info(format_args!("Charging {} {} from {}", amount, currency, source));
             self.request_count += 1;
             let txn_id = generate_request_id();
             if amount > 10000.0 {
@@ -1386,7 +1827,7 @@ w(
         /// Refund a previously created charge.
         pub fn refund_charge(&mut self, charge_id: &str) -> GatewayResponse {
             let logger = get_logger("services.payment.gateway");
-            logger.info(&format!("Refunding charge {}", charge_id));
+            logger.info(format_args!("Refunding charge {}", charge_id));
             self.request_count += 1;
             GatewayResponse {
                 success: true,
@@ -1406,9 +1847,7 @@ w(
 # ─── services/notification/mod.rs ───
 w(
     "services/notification/mod.rs",
-    """\
-    pub mod manager;
-    """,
+    "pub mod manager;\n",
 )
 
 # ─── services/notification/manager.rs ───
@@ -1423,17 +1862,28 @@ w(
         /// The target user ID.
         pub user_id: String,
         /// The delivery channel (email, sms, push, in_app).
-        pub channel: String,
+        pub channel: &'static str,
         /// The notification subject.
         pub subject: String,
         /// The notification body.
         pub body: String,
         /// Current delivery status.
-        pub status: String,
+        pub status: &'static str,
     }
 
-    /// Valid notification channels.
-    const VALID_CHANNELS: &[&str] = &["email", "sms", "push", "in_app"];
+    /// Return the canonical name of a valid notification channel.
+    ///
+    /// A `match` on the string compiles to a length dispatch followed by a single
+    /// compare, and every channel name has a different length.
+    fn valid_channel(channel: &str) -> Option<&'static str> {
+        match channel {
+            "email" => Some("email"),
+            "sms" => Some("sms"),
+            "push" => Some("push"),
+            "in_app" => Some("in_app"),
+            _ => None,
+        }
+    }
 
     /// Manages notification creation and delivery.
     pub struct NotificationManager {
@@ -1461,36 +1911,35 @@ w(
             channel: &str,
             subject: &str,
             body: &str,
-        ) -> Result<&Notification, String> {
+        ) -> Result<&mut Notification, String> {
             let logger = get_logger("services.notification");
             self.inner.require_initialized()?;
-            if !VALID_CHANNELS.contains(&channel) {
-                return Err(format!("Invalid channel: {}", channel));
-            }
-            logger.info(&format!("Queuing notification for {} via {}", user_id, channel));
+            let channel = match valid_channel(channel) {
+                Some(valid) => valid,
+                None => return Err(format!("Invalid channel: {}", channel)),
+            };
+            logger.info(format_args!("Queuing notification for {} via {}", user_id, channel));
+            let idx = self.queue.len();
             self.queue.push(Notification {
                 user_id: user_id.to_string(),
-                channel: channel.to_string(),
-                subject: sanitize_input(subject),
-                body: sanitize_input(body),
-                status: "pending".to_string(),
+                channel,
+                subject: sanitize_input(subject).into_owned(),
+                body: sanitize_input(body).into_owned(),
+                status: "pending",
             });
-            Ok(self.queue.last().unwrap())
+            Ok(&mut self.queue[idx])
         }
 
         /// Process all pending notifications in the queue.
         pub fn process_queue(&mut self) -> (usize, usize) {
             let logger = get_logger("services.notification");
-            logger.info(&format!("Processing {} notifications", self.queue.len()));
-            let mut sent = 0usize;
-            let mut failed = 0usize;
-            for notification in &mut self.queue {
-                if notification.status == "pending" {
-                    notification.status = "sent".to_string();
-                    sent += 1;
-                }
-            }
-            self.queue.retain(|n| n.status == "pending");
+            logger.info(format_args!("Processing {} notifications", self.queue.len()));
+            let sent = self.queue.iter().filter(|n| n.status == "pending").count();
+            let failed = 0usize;
+            // Every pending entry is delivered and nothing else stays queued, so
+            // one count plus clear() replaces mark-then-retain and keeps the
+            // queue's allocation for the next batch.
+            self.queue.clear();
             (sent, failed)
         }
     }
@@ -1519,13 +1968,16 @@ w(
 w(
     "cache/mod.rs",
     """\
+    use std::sync::Arc;
+
     pub mod redis;
     pub mod memory;
 
     /// Trait defining the interface for all cache implementations.
     pub trait Cache {
-        /// Retrieve a value by key from the cache.
-        fn get(&self, key: &str) -> Option<String>;
+        /// Retrieve a value by key from the cache. The value is shared, so a hit
+        /// costs a reference count bump rather than a copy.
+        fn get(&self, key: &str) -> Option<Arc<str>>;
 
         /// Store a key-value pair in the cache with optional TTL.
         fn set(&mut self, key: &str, value: &str, ttl_secs: Option<u64>);
@@ -1543,16 +1995,20 @@ w(
 w(
     "cache/redis.rs",
     """\
-    use std::collections::HashMap;
+    use std::sync::Arc;
+
+    use rustc_hash::FxHashMap;
+
     use crate::utils::helpers::get_logger;
+    use crate::utils::intern::intern;
     use crate::cache::Cache;
 
     /// A simulated Redis-backed cache implementation.
     pub struct RedisCache {
-        /// The Redis connection URL.
-        url: String,
+        /// The Redis connection URL, shared with other caches on the same server.
+        url: Arc<str>,
         /// In-memory store simulating Redis.
-        store: HashMap<String, String>,
+        store: FxHashMap<String, Arc<str>>,
         /// Whether the cache is connected.
         connected: bool,
     }
@@ -1561,10 +2017,10 @@ w(
         /// Create a new Redis cache with the given connection URL.
         pub fn new(url: &str) -> Self {
             let logger = get_logger("cache.redis");
-            logger.info(&format!("Creating RedisCache: url={}", url));
+            logger.info(format_args!("Creating RedisCache: url={}", url));
             Self {
-                url: url.to_string(),
-                store: HashMap::new(),
+                url: intern(url),
+                store: FxHashMap::default(),
                 connected: false,
             }
         }
@@ -1592,13 +2048,13 @@ w(
 
     impl Cache for RedisCache {
         /// Get a value from Redis by key.
-        fn get(&self, key: &str) -> Option<String> {
+        fn get(&self, key: &str) -> Option<Arc<str>> {
             let logger = get_logger("cache.redis");
             let result = self.store.get(key).cloned();
             if result.is_some() {
-                logger.info(&format!("Redis GET hit: {}", key));
+                logger.info(format_args!("Redis GET hit: {}", key));
             } else {
-                logger.info(&format!("Redis GET miss: {}", key));
+                logger.info(format_args!("Redis GET miss: {}", key));
             }
             result
         }
@@ -1606,15 +2062,22 @@ w(
         /// Set a value in Redis.
         fn set(&mut self, key: &str, value: &str, _ttl_secs: Option<u64>) {
             let logger = get_logger("cache.redis");
-            self.store.insert(key.to_string(), value.to_string());
-            logger.info(&format!("Redis SET: {}", key));
+            // Replace the value on update; only a new key needs its own String.
+            let value: Arc<str> = Arc::from(value);
+            match self.store.get_mut(key) {
+                Some(existing) => *existing = value,
+                None => {
+                    self.store.insert(key.to_string(), value);
+                }
+            }
+            logger.info(format_args!("Redis SET: {}", key));
         }
 
         /// Delete a key from Redis.
         fn delete(&mut self, key: &str) -> bool {
             let logger = get_logger("cache.redis");
             let existed = self.store.remove(key).is_some();
-            logger.info(&format!("Redis DEL: {} (existed={})", key, existed));
+            logger.info(format_args!("Redis DEL: {} (existed={})", key, existed));
             existed
         }
 
@@ -1623,7 +2086,7 @@ w(
             let logger = get_logger("cache.redis");
             let count = self.store.len();
             self.store.clear();
-            logger.info(&format!("Redis FLUSHALL: {} keys", count));
+            logger.info(format_args!("Redis FLUSHALL: {} keys", count));
             count
         }
     }
@@ -1634,14 +2097,46 @@ w(
 w(
     "cache/memory.rs",
     """\
-    use std::collections::HashMap;
+    use std::cell::Cell;
+    use std::sync::Arc;
+
+    use rustc_hash::FxHashMap;
+
     use crate::utils::helpers::get_logger;
     use crate::cache::Cache;
 
-    /// An in-memory cache implementation using a HashMap.
+    /// Link value marking the end of the recency list.
+    const NIL: usize = usize::MAX;
+
+    /// A cached entry and its links in the recency list.
+    struct Node {
+        /// The entry key, shared with the index so eviction can remove it there.
+        key: Arc<str>,
+        /// The cached value, shared with callers of `get`; None once deleted.
+        value: Option<Arc<str>>,
+        /// Slot of the next less recently used entry.
+        prev: Cell<usize>,
+        /// Slot of the next more recently used entry.
+        next: Cell<usize>,
+    }
+
+    /// An in-memory LRU cache.
+    ///
+    /// Entries live in a slab of nodes linked from least to most recently used,
+    /// with an FxHashMap from key to slot. Lookups, recency bumps and eviction of
+    /// the least recently used entry are all O(1). The links are `Cell`s so a
+    /// read through `&self` can still move its entry to the back.
     pub struct MemoryCache {
-        /// The in-memory key-value store.
-        store: HashMap<String, String>,
+        /// Key to slot in `nodes`.
+        index: FxHashMap<Arc<str>, usize>,
+        /// Entry slots; freed slots are reused before the slab grows.
+        nodes: Vec<Node>,
+        /// Slots released by `delete`; a freed slot's key is dropped on reuse.
+        free: Vec<usize>,
+        /// Slot of the least recently used entry.
+        head: Cell<usize>,
+        /// Slot of the most recently used entry.
+        tail: Cell<usize>,
         /// Maximum number of entries before eviction.
         max_size: usize,
     }
@@ -1650,64 +2145,132 @@ w(
         /// Create a new in-memory cache with the given max size.
         pub fn new(max_size: usize) -> Self {
             let logger = get_logger("cache.memory");
-            logger.info(&format!("Creating MemoryCache: max_size={}", max_size));
+            logger.info(format_args!("Creating MemoryCache: max_size={}", max_size));
             Self {
-                store: HashMap::new(),
+                index: FxHashMap::default(),
+                nodes: Vec::new(),
+                free: Vec::new(),
+                head: Cell::new(NIL),
+                tail: Cell::new(NIL),
                 max_size,
             }
         }
 
         /// Return the current number of entries in the cache.
         pub fn size(&self) -> usize {
-            self.store.len()
+            self.index.len()
         }
 
         /// Check if the cache is at capacity.
         pub fn is_full(&self) -> bool {
-            self.store.len() >= self.max_size
+            self.index.len() >= self.max_size
+        }
+
+        /// Detach a slot from the recency list.
+        fn unlink(&self, slot: usize) {
+            let node = &self.nodes[slot];
+            let (prev, next) = (node.prev.get(), node.next.get());
+            match prev {
+                NIL => self.head.set(next),
+                p => self.nodes[p].next.set(next),
+            }
+            match next {
+                NIL => self.tail.set(prev),
+                n => self.nodes[n].prev.set(prev),
+            }
+        }
+
+        /// Attach a detached slot as the most recently used entry.
+        fn push_back(&self, slot: usize) {
+            let tail = self.tail.get();
+            self.nodes[slot].prev.set(tail);
+            self.nodes[slot].next.set(NIL);
+            match tail {
+                NIL => self.head.set(slot),
+                t => self.nodes[t].next.set(slot),
+            }
+            self.tail.set(slot);
         }
     }
 
     impl Cache for MemoryCache {
         /// Get a value from the memory cache.
-        fn get(&self, key: &str) -> Option<String> {
+        fn get(&self, key: &str) -> Option<Arc<str>> {
             let logger = get_logger("cache.memory");
-            let result = self.store.get(key).cloned();
-            if result.is_some() {
-                logger.info(&format!("Memory GET hit: {}", key));
-            } else {
-                logger.info(&format!("Memory GET miss: {}", key));
+            match self.index.get(key) {
+                Some(&slot) => {
+                    self.unlink(slot);
+                    self.push_back(slot);
+                    logger.info(format_args!("Memory GET hit: {}", key));
+                    self.nodes[slot].value.clone()
+                }
+                None => {
+                    logger.info(format_args!("Memory GET miss: {}", key));
+                    None
+                }
             }
-            result
         }
 
         /// Set a value in the memory cache.
         fn set(&mut self, key: &str, value: &str, _ttl_secs: Option<u64>) {
             let logger = get_logger("cache.memory");
-            if self.store.len() >= self.max_size && !self.store.contains_key(key) {
-                logger.warn("Memory cache at capacity, evicting oldest");
-                if let Some(first_key) = self.store.keys().next().cloned() {
-                    self.store.remove(&first_key);
-                }
+            if let Some(&slot) = self.index.get(key) {
+                self.nodes[slot].value = Some(Arc::from(value));
+                self.unlink(slot);
+                self.push_back(slot);
+                logger.info(format_args!("Memory SET: {}", key));
+                return;
             }
-            self.store.insert(key.to_string(), value.to_string());
-            logger.info(&format!("Memory SET: {}", key));
+            let key: Arc<str> = Arc::from(key);
+            let node = Node {
+                key: Arc::clone(&key),
+                value: Some(Arc::from(value)),
+                prev: Cell::new(NIL),
+                next: Cell::new(NIL),
+            };
+            let lru = self.head.get();
+            let slot = if self.index.len() >= self.max_size && lru != NIL {
+                logger.warn("Memory cache at capacity, evicting oldest");
+                self.unlink(lru);
+                let evicted = std::mem::replace(&mut self.nodes[lru], node);
+                self.index.remove(&evicted.key);
+                lru
+            } else if let Some(slot) = self.free.pop() {
+                self.nodes[slot] = node;
+                slot
+            } else {
+                self.nodes.push(node);
+                self.nodes.len() - 1
+            };
+            logger.info(format_args!("Memory SET: {}", key));
+            self.index.insert(key, slot);
+            self.push_back(slot);
         }
 
         /// Delete a key from the memory cache.
         fn delete(&mut self, key: &str) -> bool {
             let logger = get_logger("cache.memory");
-            let existed = self.store.remove(key).is_some();
-            logger.info(&format!("Memory DEL: {} (existed={})", key, existed));
+            let slot = self.index.remove(key);
+            if let Some(slot) = slot {
+                self.unlink(slot);
+                self.nodes[slot].value = None;
+                self.free.push(slot);
+            }
+            let existed = slot.is_some();
+            logger.info(format_args!("Memory DEL: {} (existed={})", key, existed));
             existed
         }
 
         /// Clear all entries from the memory cache.
         fn clear(&mut self) -> usize {
             let logger = get_logger("cache.memory");
-            let count = self.store.len();
-            self.store.clear();
-            logger.info(&format!("Memory CLEAR: {} entries", count));
+            let count = self.index.len();
+            self.index.clear();
+            self.nodes.clear();
+            self.free.clear();
+            self.head.set(NIL);
+            self.tail.set(NIL);
+            logger.info(format_args!("Memory CLEAR: {} entries", count));
             count
         }
     }
@@ -1717,11 +2280,7 @@ w(
 # ─── validators/mod.rs ───
 w(
     "validators/mod.rs",
-    """\
-    pub mod common;
-    pub mod user;
-    pub mod payment;
-    """,
+    "pub mod common;\npub mod user;\npub mod payment;\n",
 )
 
 # ─── validators/common.rs ───
@@ -1734,7 +2293,7 @@ w(
     pub fn validate_not_empty(field: &str, value: &str) -> Result<(), String> {
         let logger = get_logger("validators.common");
         if value.trim().is_empty() {
-            logger.warn(&format!("Validation failed: {} is empty", field));
+            logger.warn(format_args!("Validation failed: {} is empty", field));
             return Err(format!("{} cannot be empty", field));
         }
         Ok(())
@@ -1744,7 +2303,7 @@ w(
     pub fn validate_max_length(field: &str, value: &str, max: usize) -> Result<(), String> {
         let logger = get_logger("validators.common");
         if value.len() > max {
-            logger.warn(&format!("Validation failed: {} exceeds max length {}", field, max));
+            logger.warn(format_args!("Validation failed: {} exceeds max length {}", field, max));
             return Err(format!("{} exceeds maximum length of {}", field, max));
         }
         Ok(())
@@ -1754,17 +2313,33 @@ w(
     pub fn validate_min_length(field: &str, value: &str, min: usize) -> Result<(), String> {
         let logger = get_logger("validators.common");
         if value.len() < min {
-            logger.warn(&format!("Validation failed: {} below min length {}", field, min));
+            logger.warn(format_args!("Validation failed: {} below min length {}", field, min));
             return Err(format!("{} must be at least {} characters", field, min));
         }
         Ok(())
     }
 
+    /// Check that an email contains both an '@' and a '.'.
+    pub fn has_email_separators(email: &str) -> bool {
+        // One pass for both separators: bit 0 marks '@', bit 1 marks '.'. Each
+        // chunk folds without branches so it vectorizes; stop once both are seen.
+        let mut seen = 0u8;
+        for chunk in email.as_bytes().chunks(16) {
+            seen |= chunk
+                .iter()
+                .fold(0, |acc, &b| acc | u8::from(b == b'@') | (u8::from(b == b'.') << 1));
+            if seen == 0b11 {
+                break;
+            }
+        }
+        seen == 0b11
+    }
+
     /// Validate that a value is a valid email format (simple check).
     pub fn validate_email_format(email: &str) -> Result<(), String> {
         let logger = get_logger("validators.common");
-        if !email.contains('@') || !email.contains('.') {
-            logger.warn(&format!("Invalid email format: {}", email));
+        if !has_email_separators(email) {
+            logger.warn(format_args!("Invalid email format: {}", email));
             return Err("Invalid email format".to_string());
         }
         Ok(())
@@ -1774,7 +2349,7 @@ w(
     pub fn validate_range(field: &str, value: f64, min: f64, max: f64) -> Result<(), String> {
         let logger = get_logger("validators.common");
         if value < min || value > max {
-            logger.warn(&format!("Validation failed: {} out of range [{}, {}]", field, min, max));
+            logger.warn(format_args!("Validation failed: {} out of range [{}, {}]", field, min, max));
             return Err(format!("{} must be between {} and {}", field, min, max));
         }
         Ok(())
@@ -1788,13 +2363,26 @@ w(
     """\
     use crate::utils::helpers::get_logger;
     use crate::validators::common::{
-        validate_email_format, validate_max_length, validate_min_length, validate_not_empty,
+        has_email_separators, validate_email_format, validate_max_length, validate_min_length,
+        validate_not_empty,
     };
 
     /// Validate user registration input fields.
     pub fn validate(email: &str, name: &str, password: &str) -> Result<(), Vec<String>> {
         let logger = get_logger("validators.user");
-        logger.info(&format!("Validating user registration: {}", email));
+        logger.info(format_args!("Validating user registration: {}", email));
+        // Evaluate every rule with a non-short-circuit `|` and branch once; the
+        // messages are only built when something failed. An email with an '@'
+        // is never blank, so the separator check covers the email rules.
+        let failed = !has_email_separators(email)
+            | name.trim().is_empty()
+            | (name.len() > 100)
+            | (password.len() < 8)
+            | (password.len() > 128);
+        if !failed {
+            logger.info("User validation passed");
+            return Ok(());
+        }
         let mut errors = Vec::new();
         if let Err(e) = validate_not_empty("email", email) {
             errors.push(e);
@@ -1818,7 +2406,7 @@ w(
             logger.info("User validation passed");
             Ok(())
         } else {
-            logger.warn(&format!("User validation failed: {} errors", errors.len()));
+            logger.warn(format_args!("User validation failed: {} errors", errors.len()));
             Err(errors)
         }
     }
@@ -1850,18 +2438,45 @@ w(
     use crate::utils::helpers::get_logger;
     use crate::validators::common::{validate_not_empty, validate_range};
 
-    /// Supported payment currencies.
-    const SUPPORTED_CURRENCIES: &[&str] = &["USD", "EUR", "GBP", "JPY", "CAD"];
+    /// Pack a three-letter currency code into a u32 (little-endian, top byte zero).
+    const fn currency_code(code: &[u8; 3]) -> u32 {
+        u32::from_le_bytes([code[0], code[1], code[2], 0])
+    }
+
+    /// Supported payment currencies, as packed codes.
+    const USD: u32 = currency_code(b"USD");
+    const EUR: u32 = currency_code(b"EUR");
+    const GBP: u32 = currency_code(b"GBP");
+    const JPY: u32 = currency_code(b"JPY");
+    const CAD: u32 = currency_code(b"CAD");
+
+    /// Check a currency with one integer match instead of a string compare per
+    /// supported code.
+    pub fn is_supported_currency(currency: &str) -> bool {
+        match *currency.as_bytes() {
+            [a, b, c] => matches!(u32::from_le_bytes([a, b, c, 0]), USD | EUR | GBP | JPY | CAD),
+            _ => false,
+        }
+    }
 
     /// Validate payment request parameters.
     pub fn validate(amount: f64, currency: &str, source: &str) -> Result<(), Vec<String>> {
         let logger = get_logger("validators.payment");
-        logger.info(&format!("Validating payment: {} {} from {}", amount, currency, source));
+        logger.info(format_args!("Validating payment: {} {} from {}", amount, currency, source));
+        // Same single-branch fast path as the user validator.
+        let failed = (amount < 0.01)
+            | (amount > 999999.0)
+            | !is_supported_currency(currency)
+            | source.trim().is_empty();
+        if !failed {
+            logger.info("Payment validation passed");
+            return Ok(());
+        }
         let mut errors = Vec::new();
         if let Err(e) = validate_range("amount", amount, 0.01, 999999.0) {
             errors.push(e);
         }
-        if !SUPPORTED_CURRENCIES.contains(&currency) {
+        if !is_supported_currency(currency) {
             errors.push(format!("Unsupported currency: {}", currency));
         }
         if let Err(e) = validate_not_empty("source", source) {
@@ -1871,7 +2486,7 @@ w(
             logger.info("Payment validation passed");
             Ok(())
         } else {
-            logger.warn(&format!("Payment validation failed: {} errors", errors.len()));
+            logger.warn(format_args!("Payment validation failed: {} errors", errors.len()));
             Err(errors)
         }
     }
@@ -1879,7 +2494,7 @@ w(
     /// Validate refund request parameters.
     pub fn validate_refund(transaction_id: &str, reason: &str) -> Result<(), Vec<String>> {
         let logger = get_logger("validators.payment");
-        logger.info(&format!("Validating refund for txn: {}", transaction_id));
+        logger.info(format_args!("Validating refund for txn: {}", transaction_id));
         let mut errors = Vec::new();
         if let Err(e) = validate_not_empty("transaction_id", transaction_id) {
             errors.push(e);
@@ -1899,12 +2514,7 @@ w(
 # ─── middleware/mod.rs ───
 w(
     "middleware/mod.rs",
-    """\
-    pub mod auth_mw;
-    pub mod rate_limit;
-    pub mod cors;
-    pub mod logging_mw;
-    """,
+    "pub mod auth_mw;\npub mod rate_limit;\npub mod cors;\npub mod logging_mw;\n",
 )
 
 # ─── middleware/auth_mw.rs ───
@@ -1916,14 +2526,12 @@ w(
     use crate::error::AppError;
     use crate::Request;
 
-    /// Paths that do not require authentication.
-    const PUBLIC_PATHS: &[&str] = &["/health", "/login", "/register", "/docs"];
-
     /// Check if a request path is public (no auth required).
     pub fn is_public_path(path: &str) -> bool {
         let logger = get_logger("middleware.auth");
-        let is_public = PUBLIC_PATHS.contains(&path);
-        logger.info(&format!("Path {} is public: {}", path, is_public));
+        // Paths that do not require authentication.
+        let is_public = matches!(path, "/health" | "/login" | "/register" | "/docs");
+        logger.info(format_args!("Path {} is public: {}", path, is_public));
         is_public
     }
 
@@ -1956,60 +2564,102 @@ w(
 w(
     "middleware/rate_limit.rs",
     """\
+    use std::collections::hash_map::RandomState;
     use std::collections::HashMap;
+    use std::hash::BuildHasher;
+    use std::sync::atomic::{AtomicU64, Ordering};
+    use std::sync::{PoisonError, RwLock};
     use crate::utils::helpers::get_logger;
     use crate::app_errors::AppErrorExt;
 
+    /// Number of independently locked shards of the counter map; a power of two.
+    const SHARDS: usize = 16;
+
+    /// One shard of the counter map.
+    type Shard = RwLock<HashMap<String, AtomicU64>>;
+
     /// A sliding-window rate limiter tracking request counts per key.
+    ///
+    /// Shared between request threads: `check` takes `&self`, known clients only
+    /// take a shard's read lock, and the counter itself is an atomic.
     pub struct RateLimiter {
         /// Maximum requests allowed in the window.
         max_requests: u64,
         /// Window size in seconds.
         window_secs: u64,
-        /// Request counts per client key.
-        counts: HashMap<String, u64>,
+        /// Request counts per client key, split by key hash so clients in
+        /// different shards never touch the same lock.
+        shards: [Shard; SHARDS],
+        /// Keyed hasher that picks a key's shard.
+        hasher: RandomState,
     }
 
     impl RateLimiter {
         /// Create a new rate limiter with the given limits.
         pub fn new(max_requests: u64, window_secs: u64) -> Self {
             let logger = get_logger("middleware.rate_limit");
-            logger.info(&format!("RateLimiter: max={}, window={}s", max_requests, window_secs));
+            logger.info(format_args!("RateLimiter: max={}, window={}s", max_requests, window_secs));
             Self {
                 max_requests,
                 window_secs,
-                counts: HashMap::new(),
+                shards: std::array::from_fn(|_| RwLock::new(HashMap::new())),
+                hasher: RandomState::new(),
             }
         }
 
+        /// The shard responsible for `key`.
+        fn shard_for(&self, key: &str) -> &Shard {
+            let hash = self.hasher.hash_one(key);
+            &self.shards[(hash >> 32) as usize & (SHARDS - 1)]
+        }
+
         /// Check if a request from the given key should be allowed.
-        pub fn check(&mut self, key: &str) -> Result<(), AppErrorExt> {
+        pub fn check(&self, key: &str) -> Result<(), AppErrorExt> {
             let logger = get_logger("middleware.rate_limit");
-            let count = self.counts.entry(key.to_string()).or_insert(0);
-            *count += 1;
-            if *count > self.max_requests {
-                logger.warn(&format!("Rate limit exceeded for {}", key));
-                return Err(AppErrorExt::RateLimit {
-                    retry_after: self.window_secs,
-                });
+            let shard = self.shard_for(key);
+            // A client already being tracked needs only the shared lock and no
+            // allocation; only a new key takes the write lock and is copied.
+            let seen = shard
+                .read()
+                .unwrap_or_else(PoisonError::into_inner)
+                .get(key)
+                .map(|count| count.fetch_add(1, Ordering::Relaxed) + 1);
+            let count = match seen {
+                Some(count) => count,
+                // Another thread may have added the key between the two locks.
+                None => shard
+                    .write()
+                    .unwrap_or_else(PoisonError::into_inner)
+                    .entry(key.to_string())
+                    .or_default()
+                    .fetch_add(1, Ordering::Relaxed)
+                    + 1,
+            };
+            if count > self.max_requests {
+                logger.warn(format_args!("Rate limit exceeded for {}", key));
+                return Err(AppErrorExt::rate_limit(self.window_secs));
             }
-            logger.info(&format!("Rate limit OK for {}: {}/{}", key, count, self.max_requests));
+            logger.info(format_args!("Rate limit OK for {}: {}/{}", key, count, self.max_requests));
             Ok(())
         }
 
         /// Reset the counter for a specific key.
-        pub fn reset(&mut self, key: &str) {
+        pub fn reset(&self, key: &str) {
             let logger = get_logger("middleware.rate_limit");
-            self.counts.remove(key);
-            logger.info(&format!("Rate limit reset for {}", key));
+            self.shard_for(key).write().unwrap_or_else(PoisonError::into_inner).remove(key);
+            logger.info(format_args!("Rate limit reset for {}", key));
         }
 
         /// Reset all counters.
-        pub fn reset_all(&mut self) {
+        pub fn reset_all(&self) {
             let logger = get_logger("middleware.rate_limit");
-            let count = self.counts.len();
-            self.counts.clear();
-            logger.info(&format!("All rate limits reset: {} keys", count));
+            let mut count = 0;
+            for shard in &self.shards {
+                let mut shard = shard.write().unwrap_or_else(PoisonError::into_inner);
+                count += shard.len();
+                shard.clear();
+            }
+            logger.info(format_args!("All rate limits reset: {} keys", count));
         }
     }
     """,
@@ -2022,17 +2672,15 @@ w(
     use crate::utils::helpers::get_logger;
     use crate::Response;
 
-    /// Allowed origins for CORS requests.
-    const ALLOWED_ORIGINS: &[&str] = &["http://localhost:3000", "https://app.example.com"];
-
     /// Allowed HTTP methods for CORS.
     const ALLOWED_METHODS: &[&str] = &["GET", "POST", "PUT", "DELETE", "OPTIONS"];
 
     /// Check if an origin is allowed by the CORS policy.
     pub fn is_origin_allowed(origin: &str) -> bool {
         let logger = get_logger("middleware.cors");
-        let allowed = ALLOWED_ORIGINS.contains(&origin);
-        logger.info(&format!("CORS origin check: {} = {}", origin, allowed));
+        // Allowed origins for CORS requests.
+        let allowed = matches!(origin, "http://localhost:3000" | "https://app.example.com");
+        logger.info(format_args!("CORS origin check: {} = {}", origin, allowed));
         allowed
     }
 
@@ -2040,16 +2688,16 @@ w(
     pub fn add_cors_headers(response: &mut Response, origin: &str) {
         let logger = get_logger("middleware.cors");
         if is_origin_allowed(origin) {
-            logger.info(&format!("Adding CORS headers for origin: {}", origin));
+            logger.info(format_args!("Adding CORS headers for origin: {}", origin));
         } else {
-            logger.warn(&format!("Rejected CORS origin: {}", origin));
+            logger.warn(format_args!("Rejected CORS origin: {}", origin));
         }
     }
 
     /// Handle a CORS preflight OPTIONS request.
     pub fn handle_preflight(origin: &str) -> Response {
         let logger = get_logger("middleware.cors");
-        logger.info(&format!("Handling CORS preflight for: {}", origin));
+        logger.info(format_args!("Handling CORS preflight for: {}", origin));
         if is_origin_allowed(origin) {
             Response::ok("OK".to_string())
         } else {
@@ -2071,7 +2719,7 @@ w(
     pub fn log_request(request: &Request) -> String {
         let logger = get_logger("middleware.logging");
         let request_id = generate_request_id();
-        logger.info(&format!(
+        logger.info(format_args!(
             "[{}] {} {}",
             request_id,
             "GET",
@@ -2083,7 +2731,7 @@ w(
     /// Log an outgoing response with status and request ID.
     pub fn log_response(request_id: &str, response: &Response) {
         let logger = get_logger("middleware.logging");
-        logger.info(&format!(
+        logger.info(format_args!(
             "[{}] Response: status={}",
             request_id,
             response.status,
@@ -2093,7 +2741,7 @@ w(
     /// Log an error that occurred during request processing.
     pub fn log_error(request_id: &str, error: &str) {
         let logger = get_logger("middleware.logging");
-        logger.error(&format!("[{}] Error: {}", request_id, error));
+        logger.error(format_args!("[{}] Error: {}", request_id, error));
     }
 
     /// Middleware that wraps a handler with request/response logging.
@@ -2103,7 +2751,7 @@ w(
     ) -> Response {
         let logger = get_logger("middleware.logging");
         let request_id = log_request(request);
-        logger.info(&format!("[{}] Processing request", request_id));
+        logger.info(format_args!("[{}] Processing request", request_id));
         let response = handler(request);
         log_response(&request_id, &response);
         response
@@ -2114,26 +2762,20 @@ w(
 # ─── api/mod.rs ───
 w(
     "api/mod.rs",
-    """\
-    pub mod v1;
-    pub mod v2;
-    """,
+    "pub mod v1;\npub mod v2;\n",
 )
 
 # ─── api/v1/mod.rs ───
 w(
     "api/v1/mod.rs",
-    """\
-    pub mod auth;
-    pub mod payments;
-    """,
+    "pub mod auth;\npub mod payments;\n",
 )
 
 # ─── api/v1/auth.rs ───
 w(
     "api/v1/auth.rs",
     """\
-    use crate::utils::helpers::{get_logger, sanitize_input, validate_request};
+    use crate::utils::helpers::{get_logger, json_body, sanitize_input, validate_request};
     use crate::auth::service::{AuthProvider, DefaultAuth};
     use crate::auth::tokens::{refresh_token, validate_token};
     use crate::auth::middleware::extract_token;
@@ -2158,9 +2800,12 @@ w(
         let auth = DefaultAuth::new(config);
         let email = sanitize_input("user@example.com");
         let password = "password";
-        logger.info(&format!("V1 login attempt for {}", email));
+        logger.info(format_args!("V1 login attempt for {}", email));
         match auth.login(&email, password) {
-            Ok(token) => Response::ok(format!("{{\"token\": \"{}\", \"version\": \"v1\"}}", token)),
+            Ok(token) => Response::ok(json_body(
+                token.len(),
+                format_args!("{{\"token\": \"{}\", \"version\": \"v1\"}}", token),
+            )),
             Err(e) => Response::error(401, &format!("{}", e)),
         }
     }
@@ -2187,7 +2832,10 @@ w(
         let config = Config::load();
         match extract_token(request) {
             Some(token) => match refresh_token(&token, &config) {
-                Ok(new_token) => Response::ok(format!("{{\"token\": \"{}\"}}", new_token.value)),
+                Ok(new_token) => Response::ok(json_body(
+                    new_token.value.len(),
+                    format_args!("{{\"token\": \"{}\"}}", new_token.value),
+                )),
                 Err(e) => Response::error(401, &e.message),
             },
             None => Response::error(401, "Missing token"),
@@ -2200,7 +2848,7 @@ w(
 w(
     "api/v1/payments.rs",
     """\
-    use crate::utils::helpers::{get_logger, generate_request_id};
+    use crate::utils::helpers::{get_logger, generate_request_id, json_body};
     use crate::validators::payment;
     use crate::middleware::auth_mw::require_auth;
     use crate::Request;
@@ -2219,8 +2867,11 @@ w(
         match payment::validate(amount, currency, source) {
             Ok(()) => {
                 let txn_id = generate_request_id();
-                logger.info(&format!("Payment created: txn={}", txn_id));
-                Response::ok(format!("{{\"transaction_id\": \"{}\", \"status\": \"completed\"}}", txn_id))
+                logger.info(format_args!("Payment created: txn={}", txn_id));
+                Response::ok(json_body(
+                    txn_id.len(),
+                    format_args!("{{\"transaction_id\": \"{}\", \"status\": \"completed\"}}", txn_id),
+                ))
             }
             Err(errors) => {
                 Response::error(400, &format!("Validation errors: {:?}", errors))
@@ -2238,8 +2889,11 @@ w(
         let txn_id = "txn-12345";
         match payment::validate_refund(txn_id, "customer request") {
             Ok(()) => {
-                logger.info(&format!("Refund processed: txn={}", txn_id));
-                Response::ok(format!("{{\"transaction_id\": \"{}\", \"status\": \"refunded\"}}", txn_id))
+                logger.info(format_args!("Refund processed: txn={}", txn_id));
+                Response::ok(json_body(
+                    txn_id.len(),
+                    format_args!("{{\"transaction_id\": \"{}\", \"status\": \"refunded\"}}", txn_id),
+                ))
             }
             Err(errors) => {
                 Response::error(400, &format!("Validation errors: {:?}", errors))
@@ -2262,17 +2916,14 @@ w(
 # ─── api/v2/mod.rs ───
 w(
     "api/v2/mod.rs",
-    """\
-    pub mod auth;
-    pub mod payments;
-    """,
+    "pub mod auth;\npub mod payments;\n",
 )
 
 # ─── api/v2/auth.rs ───
 w(
     "api/v2/auth.rs",
     """\
-    use crate::utils::helpers::{get_logger, sanitize_input, validate_request};
+    use crate::utils::helpers::{get_logger, json_body, sanitize_input, validate_request};
     use crate::auth::service::{AuthProvider, DefaultAuth};
     use crate::auth::tokens::{refresh_token, validate_token};
     use crate::auth::middleware::extract_token;
@@ -2301,12 +2952,15 @@ w(
         let auth = DefaultAuth::new(config);
         let email = sanitize_input("user@example.com");
         let password = "password";
-        logger.info(&format!("V2 login attempt for {}", email));
+        logger.info(format_args!("V2 login attempt for {}", email));
         match auth.login(&email, password) {
             Ok(token) => {
-                Response::ok(format!(
-                    "{{\"token\": \"{}\", \"version\": \"v2\", \"expires_in\": 3600}}",
-                    token
+                Response::ok(json_body(
+                    token.len(),
+                    format_args!(
+                        "{{\"token\": \"{}\", \"version\": \"v2\", \"expires_in\": 3600}}",
+                        token
+                    ),
                 ))
             }
             Err(e) => Response::error(401, &format!("{}", e)),
@@ -2336,9 +2990,12 @@ w(
         match extract_token(request) {
             Some(token) => match refresh_token(&token, &config) {
                 Ok(new_token) => {
-                    Response::ok(format!(
-                        "{{\"token\": \"{}\", \"expires_in\": 3600}}",
-                        new_token.value
+                    Response::ok(json_body(
+                        new_token.value.len(),
+                        format_args!(
+                            "{{\"token\": \"{}\", \"expires_in\": 3600}}",
+                            new_token.value
+                        ),
                     ))
                 }
                 Err(e) => Response::error(401, &e.message),
@@ -2353,7 +3010,7 @@ w(
 w(
     "api/v2/payments.rs",
     """\
-    use crate::utils::helpers::{get_logger, generate_request_id};
+    use crate::utils::helpers::{get_logger, generate_request_id, json_body};
     use crate::validators::payment;
     use crate::middleware::auth_mw::require_auth;
     use crate::Request;
@@ -2372,10 +3029,13 @@ w(
         match payment::validate(amount, currency, source) {
             Ok(()) => {
                 let txn_id = generate_request_id();
-                logger.info(&format!("V2 payment created: txn={}", txn_id));
-                Response::ok(format!(
-                    "{{\"transaction_id\": \"{}\", \"status\": \"completed\", \"version\": \"v2\"}}",
-                    txn_id
+                logger.info(format_args!("V2 payment created: txn={}", txn_id));
+                Response::ok(json_body(
+                    txn_id.len(),
+                    format_args!(
+                        "{{\"transaction_id\": \"{}\", \"status\": \"completed\", \"version\": \"v2\"}}",
+                        txn_id
+                    ),
                 ))
             }
             Err(errors) => {
@@ -2394,10 +3054,13 @@ w(
         let txn_id = "txn-67890";
         match payment::validate_refund(txn_id, "v2 customer request") {
             Ok(()) => {
-                logger.info(&format!("V2 refund processed: txn={}", txn_id));
-                Response::ok(format!(
-                    "{{\"transaction_id\": \"{}\", \"status\": \"refunded\", \"version\": \"v2\"}}",
-                    txn_id
+                logger.info(format_args!("V2 refund processed: txn={}", txn_id));
+                Response::ok(json_body(
+                    txn_id.len(),
+                    format_args!(
+                        "{{\"transaction_id\": \"{}\", \"status\": \"refunded\", \"version\": \"v2\"}}",
+                        txn_id
+                    ),
                 ))
             }
             Err(errors) => {
@@ -2421,10 +3084,7 @@ w(
 # ─── events/mod.rs ───
 w(
     "events/mod.rs",
-    """\
-    pub mod dispatcher;
-    pub mod handlers;
-    """,
+    "pub mod dispatcher;\npub mod handlers;\n",
 )
 
 # ─── events/dispatcher.rs ───
@@ -2435,17 +3095,20 @@ w(
     use crate::utils::helpers::get_logger;
 
     /// An event that can be dispatched through the system.
-    pub struct Event {
+    ///
+    /// Events borrow their strings from the `emit` call and only live for the
+    /// dispatch; a handler that needs to keep one copies what it needs.
+    pub struct Event<'a> {
         /// The event type identifier.
-        pub event_type: String,
+        pub event_type: &'a str,
         /// The event payload as a string.
-        pub payload: String,
+        pub payload: &'a str,
         /// Timestamp of when the event was created.
         pub timestamp: u64,
     }
 
     /// A callback type for event handlers.
-    pub type EventHandler = fn(&Event);
+    pub type EventHandler = fn(&Event<'_>);
 
     /// Dispatches events to registered handlers.
     pub struct EventDispatcher {
@@ -2469,14 +3132,14 @@ w(
         /// Emit an event to all registered handlers.
         pub fn emit(&mut self, event_type: &str, payload: &str) {
             let logger = get_logger("events.dispatcher");
-            let event = Event {
-                event_type: event_type.to_string(),
-                payload: payload.to_string(),
-                timestamp: 0,
-            };
             self.dispatch_count += 1;
-            logger.info(&format!("Emitting event: {} (total: {})", event_type, self.dispatch_count));
+            logger.info(format_args!("Emitting event: {} (total: {})", event_type, self.dispatch_count));
             if let Some(handler_list) = self.handlers.get(event_type) {
+                let event = Event {
+                    event_type,
+                    payload,
+                    timestamp: 0,
+                };
                 for handler in handler_list {
                     handler(&event);
                 }
@@ -2486,7 +3149,7 @@ w(
         /// Register a handler for a specific event type.
         pub fn on(&mut self, event_type: &str, handler: EventHandler) {
             let logger = get_logger("events.dispatcher");
-            logger.info(&format!("Registering handler for: {}", event_type));
+            logger.info(format_args!("Registering handler for: {}", event_type));
             self.handlers
                 .entry(event_type.to_string())
                 .or_insert_with(Vec::new)
@@ -2497,7 +3160,7 @@ w(
         pub fn off(&mut self, event_type: &str) {
             let logger = get_logger("events.dispatcher");
             self.handlers.remove(event_type);
-            logger.info(&format!("Removed all handlers for: {}", event_type));
+            logger.info(format_args!("Removed all handlers for: {}", event_type));
         }
 
         /// Return the total number of events dispatched.
@@ -2518,43 +3181,43 @@ w(
     /// Handle a user registration event.
     pub fn on_user_registered(event: &Event) {
         let logger = get_logger("events.handlers");
-        logger.info(&format!("User registered: {}", event.payload));
+        logger.info(format_args!("User registered: {}", event.payload));
     }
 
     /// Handle a successful login event.
     pub fn on_login_success(event: &Event) {
         let logger = get_logger("events.handlers");
-        logger.info(&format!("Login success: {}", event.payload));
+        logger.info(format_args!("Login success: {}", event.payload));
     }
 
     /// Handle a failed login event.
     pub fn on_login_failed(event: &Event) {
         let logger = get_logger("events.handlers");
-        logger.warn(&format!("Login failed: {}", event.payload));
+        logger.warn(format_args!("Login failed: {}", event.payload));
     }
 
     /// Handle a payment completed event.
     pub fn on_payment_completed(event: &Event) {
         let logger = get_logger("events.handlers");
-        logger.info(&format!("Payment completed: {}", event.payload));
+        logger.info(format_args!("Payment completed: {}", event.payload));
     }
 
     /// Handle a payment refunded event.
     pub fn on_payment_refunded(event: &Event) {
         let logger = get_logger("events.handlers");
-        logger.info(&format!("Payment refunded: {}", event.payload));
+        logger.info(format_args!("Payment refunded: {}", event.payload));
     }
 
     /// Handle a password changed event.
     pub fn on_password_changed(event: &Event) {
         let logger = get_logger("events.handlers");
-        logger.info(&format!("Password changed: {}", event.payload));
+        logger.info(format_args!("Password changed: {}", event.payload));
     }
 
     /// Handle a session expired event.
     pub fn on_session_expired(event: &Event) {
         let logger = get_logger("events.handlers");
-        logger.info(&format!("Session expired: {}", event.payload));
+        logger.info(format_args!("Session expired: {}", event.payload));
     }
     """,
 )
@@ -2562,11 +3225,7 @@ w(
 # ─── tasks/mod.rs ───
 w(
     "tasks/mod.rs",
-    """\
-    pub mod email_task;
-    pub mod payment_task;
-    pub mod cleanup_task;
-    """,
+    "pub mod email_task;\npub mod payment_task;\npub mod cleanup_task;\n",
 )
 
 # ─── tasks/email_task.rs ───
@@ -2603,7 +3262,7 @@ w(
             logger.info("Running email task");
             self.sender.send("user@example.com", "Welcome", "Hello!")?;
             self.processed += 1;
-            logger.info(&format!("Email task complete: {} processed", self.processed));
+            logger.info(format_args!("Email task complete: {} processed", self.processed));
             Ok(self.processed)
         }
 
@@ -2652,10 +3311,10 @@ w(
             match self.processor.process_payment("user-1", 99.99, "USD", "card_test") {
                 Ok(result) => {
                     self.processed += 1;
-                    logger.info(&format!("Payment processed: txn={}", result.transaction_id));
+                    logger.info(format_args!("Payment processed: txn={}", result.transaction_id));
                 }
                 Err(e) => {
-                    logger.error(&format!("Payment failed: {}", e));
+                    logger.error(format_args!("Payment failed: {}", e));
                 }
             }
             Ok(self.processed)
@@ -2702,7 +3361,7 @@ w(
             logger.info("Running cleanup task");
             let cleared = self.cache.clear();
             self.runs += 1;
-            logger.info(&format!("Cleanup complete: {} entries cleared, run #{}", cleared, self.runs));
+            logger.info(format_args!("Cleanup complete: {} entries cleared, run #{}", cleared, self.runs));
             Ok(cleared)
         }
 
@@ -2737,7 +3396,7 @@ w(
         match payment::validate(amount, currency, source) {
             Ok(()) => {
                 let txn_id = generate_request_id();
-                logger.info(&format!("Payment created: {}", txn_id));
+                logger.info(format_args!("Payment created: {}", txn_id));
                 Response::ok(format!("{{\"transaction_id\": \"{}\"}}", txn_id))
             }
             Err(errors) => Response::error(400, &format!("{:?}", errors)),
@@ -2812,7 +3471,7 @@ w(
         let password = "securepassword123";
         match user::validate(&email, &name, password) {
             Ok(()) => {
-                logger.info(&format!("User registered: {}", email));
+                logger.info(format_args!("User registered: {}", email));
                 Response::ok("{\"status\": \"registered\"}".to_string())
             }
             Err(errors) => Response::error(400, &format!("{:?}", errors)),
@@ -2858,7 +3517,7 @@ w(
         }
         let subject = sanitize_input("Test Notification");
         let body = sanitize_input("This is a test notification body");
-        logger.info(&format!("Sending test notification: {}", subject));
+        logger.info(format_args!("Sending test notification: {}", subject));
         Response::ok("{\"status\": \"sent\"}".to_string())
     }
     """,
@@ -2905,7 +3564,7 @@ w(
         /// Create a new pending payment.
         pub fn new(id: u64, user_id: u64, amount: f64, currency: &str, txn_id: &str) -> Self {
             let logger = get_logger("models.payment");
-            logger.info(&format!("Creating payment: {} {} {}", id, amount, currency));
+            logger.info(format_args!("Creating payment: {} {} {}", id, amount, currency));
             Self {
                 id,
                 user_id,
@@ -2920,21 +3579,21 @@ w(
         pub fn complete(&mut self) {
             let logger = get_logger("models.payment");
             self.status = PaymentStatus::Completed;
-            logger.info(&format!("Payment {} completed", self.transaction_id));
+            logger.info(format_args!("Payment {} completed", self.transaction_id));
         }
 
         /// Mark the payment as failed.
         pub fn fail(&mut self, reason: &str) {
             let logger = get_logger("models.payment");
             self.status = PaymentStatus::Failed;
-            logger.info(&format!("Payment {} failed: {}", self.transaction_id, reason));
+            logger.info(format_args!("Payment {} failed: {}", self.transaction_id, reason));
         }
 
         /// Refund the payment.
         pub fn refund(&mut self) {
             let logger = get_logger("models.payment");
             self.status = PaymentStatus::Refunded;
-            logger.info(&format!("Payment {} refunded", self.transaction_id));
+            logger.info(format_args!("Payment {} refunded", self.transaction_id));
         }
 
         /// Check if the payment is completed.
@@ -2945,7 +3604,7 @@ w(
         /// Find a payment by transaction ID (simulated).
         pub fn find_by_transaction_id(txn_id: &str) -> Option<Payment> {
             let logger = get_logger("models.payment");
-            logger.info(&format!("Looking up payment by txn: {}", txn_id));
+            logger.info(format_args!("Looking up payment by txn: {}", txn_id));
             None
         }
     }
@@ -2991,7 +3650,7 @@ w(
         /// Create a new unread notification.
         pub fn new(id: u64, user_id: u64, channel: NotificationChannel, subject: &str, body: &str) -> Self {
             let logger = get_logger("models.notification");
-            logger.info(&format!("Creating notification {} for user {}", id, user_id));
+            logger.info(format_args!("Creating notification {} for user {}", id, user_id));
             Self {
                 id,
                 user_id,
@@ -3006,13 +3665,13 @@ w(
         pub fn mark_read(&mut self) {
             let logger = get_logger("models.notification");
             self.read = true;
-            logger.info(&format!("Notification {} marked as read", self.id));
+            logger.info(format_args!("Notification {} marked as read", self.id));
         }
 
         /// Find notifications for a user (simulated).
         pub fn find_by_user(user_id: u64) -> Vec<Notification> {
             let logger = get_logger("models.notification");
-            logger.info(&format!("Looking up notifications for user {}", user_id));
+            logger.info(format_args!("Looking up notifications for user {}", user_id));
             Vec::new()
         }
     }
@@ -3060,7 +3719,7 @@ w(
         /// Create a new event record.
         pub fn new(id: u64, event_type: EventType, payload: &str, actor_id: Option<u64>) -> Self {
             let logger = get_logger("models.event");
-            logger.info(&format!("Creating event: {:?}", event_type));
+            logger.info(format_args!("Creating event: {:?}", event_type));
             Self {
                 id,
                 event_type,
@@ -3073,19 +3732,21 @@ w(
         /// Find events by type (simulated).
         pub fn find_by_type(event_type: &EventType) -> Vec<EventRecord> {
             let logger = get_logger("models.event");
-            logger.info(&format!("Looking up events of type: {:?}", event_type));
+            logger.info(format_args!("Looking up events of type: {:?}", event_type));
             Vec::new()
         }
 
         /// Find events by actor (simulated).
         pub fn find_by_actor(actor_id: u64) -> Vec<EventRecord> {
             let logger = get_logger("models.event");
-            logger.info(&format!("Looking up events for actor: {}", actor_id));
+            logger.info(format_args!("Looking up events for actor: {}", actor_id));
             Vec::new()
         }
     }
     """,
 )
 
+emit_all(FILES)
+
 print(f"gen_rs.py: webapp_rs fixture generation complete.")
 print(f"Base directory: {BASE}")
@@ -13,7 +13,7 @@ module ApiV2Payments
     body = request[:body]
     headers = request[:headers] || {}
     idempotency_key = headers['Idempotency-Key'] || ''
-    get_logger('api.v2.payments').info("V2 create payment (idempotency=#{idempotency_key[0, 12]})")
+    get_logger('api.v2.payments').info("V2 create payment (idempotency=#{PaymentValidator.clamp_bytes(idempotency_key, 12)})")
     payment_data = PaymentValidator.validate(body)
     processor = PaymentProcessor.new(db, events)
     result = processor.process_payment(
@@ -1,13 +1,20 @@
+# frozen_string_literal: true
+
 # Cache interface and base class.
 
 # Base cache with stats tracking.
 class BaseCache
   attr_reader :name
+  # The RateLimiter built on this cache by rate_limit_middleware, kept here
+  # so it is released along with the cache.
+  attr_accessor :rate_limiter
 
   def initialize(name)
     @name = name
     @hits = 0
     @misses = 0
+    @hit_rate_permille = nil
+    @hit_rate = nil
   end
 
   def get(key)
@@ -26,9 +33,28 @@ class BaseCache
     raise NotImplementedError, 'Subclass must implement clear'
   end
 
+  # Drop every entry without waiting for the memory to be reclaimed.
+  # Returns the number of entries removed. Backends without a cheaper path
+  # fall back to clear.
+  def clear_async
+    clear
+  end
+
+  # Increment a counter in one call, starting a TTL window when the key is new.
+  # Returns [new_value, first_insert].
+  def incr_with_ttl(key, window)
+    raise NotImplementedError, 'Subclass must implement incr_with_ttl'
+  end
+
+  # hit_rate comes from integer per-mille math, rounded half up, and its
+  # String is rebuilt only when the rounded rate changes.
   def stats
     total = @hits + @misses
-    rate = total > 0 ? (@hits.to_f / total * 100) : 0.0
-    { backend: @name, hits: @hits, misses: @misses, hit_rate: "#{rate.round(1)}%" }
+    permille = total > 0 ? (@hits * 1000 + total / 2) / total : 0
+    unless permille == @hit_rate_permille
+      @hit_rate_permille = permille
+      @hit_rate = "#{permille / 10}.#{permille % 10}%".freeze
+    end
+    { backend: @name, hits: @hits, misses: @misses, hit_rate: @hit_rate }
   end
 end
@@ -0,0 +1,60 @@
+# frozen_string_literal: true
+
+# Count-Min sketch for TinyLFU cache admission.
+
+# Approximate key frequencies in four rows of 4-bit counters, packed sixteen
+# to an Integer word. Counters saturate at 15 and are all halved once
+# sample_size increments have been recorded, so stale popularity fades.
+class CountMinSketch
+  DEPTH = 4
+  SEEDS = [0x97cb3127, 0xb4b82e39, 0x5bd1e995, 0xc2b2ae35].freeze
+  MAX_COUNT = 15
+  HALF_MASK = 0x7777_7777_7777_7777
+
+  def initialize(width_bits: 14)
+    @width_bits = width_bits
+    @rows = Array.new(DEPTH) { Array.new((1 << width_bits) / 16, 0) }
+    @sample_size = 10 << width_bits
+    @additions = 0
+  end
+
+  def estimate(key)
+    h = key.hash
+    min = MAX_COUNT
+    DEPTH.times do |d|
+      c = counter(d, slot(h, d))
+      min = c if c < min
+    end
+    min
+  end
+
+  # Conservative update: only the counters at the current minimum grow.
+  def increment(key)
+    h = key.hash
+    slots = Array.new(DEPTH) { |d| slot(h, d) }
+    min = slots.each_with_index.map { |i, d| counter(d, i) }.min
+    return if min >= MAX_COUNT
+
+    slots.each_with_index { |i, d| add_one(d, i) if counter(d, i) == min }
+    age if (@additions += 1) >= @sample_size
+  end
+
+  private
+
+  def slot(h, d)
+    (((h ^ SEEDS[d]) * 0x9E3779B1) & 0xFFFF_FFFF) >> (32 - @width_bits)
+  end
+
+  def counter(d, i)
+    (@rows[d][i >> 4] >> ((i & 15) << 2)) & MAX_COUNT
+  end
+
+  def add_one(d, i)
+    @rows[d][i >> 4] += 1 << ((i & 15) << 2)
+  end
+
+  def age
+    @rows.each { |row| row.map! { |word| (word >> 1) & HALF_MASK } }
+    @additions /= 2
+  end
+end
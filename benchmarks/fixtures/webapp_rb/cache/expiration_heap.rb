@@ -0,0 +1,96 @@
+# frozen_string_literal: true
+
+# Min-heap of cache expiry timestamps.
+
+# Binary min-heap of [expiry, key] pairs.
+#
+# Re-pushing a key supersedes its previous entry: the latest expiry is kept
+# in @live and superseded or deleted entries are dropped lazily once they
+# reach the top of the heap.
+class ExpirationHeap
+  def initialize
+    @heap = []
+    @live = {}
+  end
+
+  def size
+    @live.size
+  end
+
+  def push(entry)
+    expiry, key = entry
+    @live[key] = expiry
+    @heap << entry
+    sift_up(@heap.size - 1)
+  end
+
+  def update(key, new_expiry)
+    push([new_expiry, key])
+  end
+
+  def delete(key)
+    !@live.delete(key).nil?
+  end
+
+  def peek
+    discard_stale
+    @heap.first
+  end
+
+  def pop
+    discard_stale
+    return nil if @heap.empty?
+
+    entry = remove_top
+    @live.delete(entry[1])
+    entry
+  end
+
+  def clear
+    @heap.clear
+    @live.clear
+  end
+
+  private
+
+  def discard_stale
+    while (top = @heap.first) && @live[top[1]] != top[0]
+      remove_top
+    end
+  end
+
+  def remove_top
+    top = @heap.first
+    last = @heap.pop
+    unless @heap.empty?
+      @heap[0] = last
+      sift_down(0)
+    end
+    top
+  end
+
+  def sift_up(i)
+    while i > 0
+      parent = (i - 1) / 2
+      break if @heap[parent][0] <= @heap[i][0]
+
+      @heap[parent], @heap[i] = @heap[i], @heap[parent]
+      i = parent
+    end
+  end
+
+  def sift_down(i)
+    n = @heap.size
+    loop do
+      left = 2 * i + 1
+      right = left + 1
+      smallest = i
+      smallest = left if left < n && @heap[left][0] < @heap[smallest][0]
+      smallest = right if right < n && @heap[right][0] < @heap[smallest][0]
+      break if smallest == i
+
+      @heap[smallest], @heap[i] = @heap[i], @heap[smallest]
+      i = smallest
+    end
+  end
+end
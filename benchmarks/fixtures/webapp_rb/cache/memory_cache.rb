@@ -1,65 +1,159 @@
+# frozen_string_literal: true
+
 # In-memory LRU cache.
 
 require_relative '../utils/helpers'
 require_relative 'base_cache'
+require_relative 'expiration_heap'
+require_relative 'count_min_sketch'
 
-# LRU memory cache.
+# LRU memory cache backed by a hash index and an intrusive doubly-linked list.
+#
+# The list runs from least recently used (head side) to most recently used
+# (tail side), so get/set/eviction are all O(1) pointer rewires. Expired
+# entries are reclaimed from an ExpirationHeap before choosing an LRU victim.
+# When full, a new key is admitted only if a CountMinSketch estimates it is
+# used at least as often as the victim (TinyLFU), so one-off scans cannot
+# flush the hot set.
 class MemoryCache < BaseCache
+  Node = Struct.new(:key, :value, :expiry, :prev, :nxt)
+
   def initialize(max_size = 1000)
     super('memory')
-    @store = {}
-    @expiry = {}
+    @index = {}
+    @exp_heap = ExpirationHeap.new
+    @cms = CountMinSketch.new
+    @head = Node.new
+    @tail = Node.new
+    @head.nxt = @tail
+    @tail.prev = @head
     @max_size = max_size
-    get_logger('cache.memory').info("MemoryCache created: max_size=#{max_size}")
+    @log = get_logger('cache.memory')
+    @log.info("MemoryCache created: max_size=#{max_size}")
   end
 
   def get(key)
-    if @store.key?(key)
-      exp = @expiry[key] || Float::INFINITY
-      if Time.now.to_i > exp
-        @store.delete(key)
-        @expiry.delete(key)
+    now = current_tick
+    sweep_expired(now)
+    @cms.increment(key)
+    node = @index[key]
+    if node
+      if now > node.expiry
+        unlink(node)
+        @index.delete(key)
+        @exp_heap.delete(key)
         @misses += 1
         return nil
       end
       @hits += 1
-      # Move to end for LRU
-      val = @store.delete(key)
-      @store[key] = val
-      return val
+      # Move to tail for LRU
+      unlink(node)
+      append(node)
+      return node.value
     end
     @misses += 1
     nil
   end
 
   def set(key, value, ttl = 300)
-    if @store.key?(key)
-      @store.delete(key)
-    elsif @store.size >= @max_size
-      first_key = @store.keys.first
-      if first_key
-        @store.delete(first_key)
-        @expiry.delete(first_key)
-        get_logger('cache.memory').info("LRU evicted: #{first_key}")
-      end
+    write(key, value, ttl, admit: true)
+  end
+
+  # Remove every entry whose TTL has passed; O(k log n) for k expired keys.
+  def sweep_expired(now = current_tick)
+    swept = 0
+    while (top = @exp_heap.peek) && top[0] < now
+      _, key = @exp_heap.pop
+      swept += 1 if evict_if_stale(key, now)
     end
-    @store[key] = value
-    @expiry[key] = Time.now.to_i + ttl
+    swept
   end
 
   def delete(key)
-    @expiry.delete(key)
-    !@store.delete(key).nil?
+    node = @index.delete(key)
+    return false unless node
+
+    @exp_heap.delete(key)
+    unlink(node)
+    true
   end
 
   def clear
-    count = @store.size
-    @store.clear
-    @expiry.clear
+    count = @index.size
+    @index.clear
+    @exp_heap.clear
+    @head.nxt = @tail
+    @tail.prev = @head
     count
   end
 
+  def incr_with_ttl(key, window)
+    node = @index[key]
+    if node.nil? || current_tick > node.expiry
+      # Counters skip admission: a rejected write would restart the window
+      # on every call and the count would never grow.
+      write(key, 1, window, admit: false)
+      return [1, true]
+    end
+    node.value += 1
+    unlink(node)
+    append(node)
+    [node.value, false]
+  end
+
   def size
-    @store.size
+    @index.size
+  end
+
+  private
+
+  # Store key => value. With admit: true a new key only displaces the LRU
+  # victim of a full cache if the sketch rates it at least as popular;
+  # returns nil when the write is rejected.
+  def write(key, value, ttl, admit:)
+    now = current_tick
+    sweep_expired(now)
+    @cms.increment(key)
+    node = @index[key]
+    if node
+      unlink(node)
+    else
+      if @index.size >= @max_size
+        victim = @head.nxt
+        return nil if admit && @cms.estimate(key) < @cms.estimate(victim.key)
+
+        unlink(victim)
+        @index.delete(victim.key)
+        @exp_heap.delete(victim.key)
+        @log.debug { "LRU evicted: #{victim.key}" }
+      end
+      node = Node.new(key)
+      @index[key] = node
+    end
+    node.value = value
+    node.expiry = now + ttl
+    @exp_heap.push([node.expiry, key])
+    append(node)
+  end
+
+  def evict_if_stale(key, now)
+    node = @index[key]
+    return false unless node && now > node.expiry
+
+    unlink(node)
+    @index.delete(key)
+    true
+  end
+
+  def unlink(node)
+    node.prev.nxt = node.nxt
+    node.nxt.prev = node.prev
+  end
+
+  def append(node)
+    node.prev = @tail.prev
+    node.nxt = @tail
+    @tail.prev.nxt = node
+    @tail.prev = node
   end
 end
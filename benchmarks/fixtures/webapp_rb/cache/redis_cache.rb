@@ -1,56 +1,110 @@
+# frozen_string_literal: true
+
 # Redis-backed cache.
 
 require_relative '../utils/helpers'
 require_relative 'base_cache'
+require_relative 'expiration_heap'
 
 # Redis cache implementation.
+#
+# Each key maps to a single Entry holding its value and expiry tick, so every
+# operation costs one hash lookup. A nil expiry never expires.
 class RedisCache < BaseCache
+  Entry = Struct.new(:value, :expiry)
+
   def initialize(host = 'localhost', port = 6379)
     super('redis')
     @store = {}
-    @expiry = {}
-    get_logger('cache.redis').info("RedisCache created: #{host}:#{port}")
+    @exp_heap = ExpirationHeap.new
+    @log = get_logger('cache.redis')
+    @log.info("RedisCache created: #{host}:#{port}")
   end
 
   def get(key)
-    if @store.key?(key)
-      exp = @expiry[key] || Float::INFINITY
-      if Time.now.to_i > exp
+    now = current_tick
+    sweep_expired(now)
+    entry = @store[key]
+    if entry
+      if entry.expiry && now > entry.expiry
         @store.delete(key)
-        @expiry.delete(key)
+        @exp_heap.delete(key)
         @misses += 1
         return nil
       end
       @hits += 1
-      return @store[key]
+      return entry.value
     end
     @misses += 1
     nil
   end
 
   def set(key, value, ttl = 300)
-    @store[key] = value
-    @expiry[key] = Time.now.to_i + ttl
-    get_logger('cache.redis').info("Redis SET #{key} (ttl=#{ttl})")
+    now = current_tick
+    sweep_expired(now)
+    entry = Entry.new(value, now + ttl)
+    @store[key] = entry
+    @exp_heap.push([entry.expiry, key])
+    @log.debug { "Redis SET #{key} (ttl=#{ttl})" }
   end
 
   def delete(key)
-    @expiry.delete(key)
+    @exp_heap.delete(key)
     !@store.delete(key).nil?
   end
 
   def clear
     count = @store.size
     @store.clear
-    @expiry.clear
-    get_logger('cache.redis').info("Redis FLUSHDB: #{count} keys")
+    @exp_heap.clear
+    @log.debug { "Redis FLUSHDB: #{count} keys" }
+    count
+  end
+
+  # Like UNLINK/FLUSHDB ASYNC: detach the current keyspace in O(1) and
+  # leave reclaiming it to the GC.
+  def clear_async
+    count = @store.size
+    @store = {}
+    @exp_heap = ExpirationHeap.new
+    @log.debug { "Redis FLUSHDB ASYNC: #{count} keys" }
     count
   end
 
+  # Remove every entry whose TTL has passed; O(k log n) for k expired keys.
+  def sweep_expired(now = current_tick)
+    swept = 0
+    while (top = @exp_heap.peek) && top[0] < now
+      _, key = @exp_heap.pop
+      entry = @store[key]
+      next unless entry&.expiry && now > entry.expiry
+
+      @store.delete(key)
+      swept += 1
+    end
+    swept
+  end
+
+  def incr_with_ttl(key, window)
+    now = current_tick
+    entry = @store[key]
+    if entry.nil? || (entry.expiry && now > entry.expiry)
+      entry = Entry.new(1, now + window)
+      @store[key] = entry
+      @exp_heap.push([entry.expiry, key])
+      return [1, true]
+    end
+    entry.value += 1
+    [entry.value, false]
+  end
+
   def incr(key, amount = 1)
-    current = @store[key] || 0
-    new_val = current + amount
-    @store[key] = new_val
-    new_val
+    entry = @store[key]
+    if entry
+      entry.value += amount
+    else
+      @store[key] = Entry.new(amount, nil)
+      amount
+    end
   end
 end
@@ -4,28 +4,39 @@ require_relative 'config'
 require_relative 'utils/helpers'
 
 module ConfigExtended
-  DB_DSN = ENV.fetch('DATABASE_URL', 'sqlite://app.db')
-  REDIS_HOST = ENV.fetch('REDIS_HOST', 'localhost')
-  REDIS_PORT = ENV.fetch('REDIS_PORT', '6379').to_i
-  JWT_SECRET = ENV.fetch('JWT_SECRET', 'dev-secret')
-  ENVIRONMENT = ENV.fetch('RACK_ENV', 'development')
-  LOG_LEVEL = ENV.fetch('LOG_LEVEL', 'info')
-  RATE_LIMIT_PER_MINUTE = ENV.fetch('RATE_LIMIT', '100').to_i
-  CORS_ORIGINS = ENV.fetch('CORS_ORIGINS', 'http://localhost:3000').split(',')
+  # One snapshot of the environment instead of a lookup per setting.
+  env = ENV.to_h
+  DB_DSN = env.fetch('DATABASE_URL', 'sqlite://app.db')
+  REDIS_HOST = env.fetch('REDIS_HOST', 'localhost')
+  REDIS_PORT = env.fetch('REDIS_PORT', '6379').to_i
+  JWT_SECRET = env.fetch('JWT_SECRET', 'dev-secret')
+  ENVIRONMENT = env.fetch('RACK_ENV', 'development')
+  LOG_LEVEL = env.fetch('LOG_LEVEL', 'info')
+  RATE_LIMIT_PER_MINUTE = env.fetch('RATE_LIMIT', '100').to_i
+  CORS_ORIGINS = env.fetch('CORS_ORIGINS', 'http://localhost:3000').split(',').map(&:freeze).freeze
 
+  @full_lock = Mutex.new
+
+  # Built once per process and deep-frozen (Ractor-shareable), so every
+  # caller and thread reads the same Hash without locking. The freeze runs
+  # on a deep copy so the Config and ConfigExtended constants stay as-is.
   def self.load_full
-    get_logger('config').info('Loading extended configuration')
-    base = Config.load
-    base.merge(
-      db_dsn: DB_DSN,
-      redis_host: REDIS_HOST,
-      redis_port: REDIS_PORT,
-      jwt_secret: JWT_SECRET,
-      environment: ENVIRONMENT,
-      log_level: LOG_LEVEL,
-      rate_limit_per_minute: RATE_LIMIT_PER_MINUTE,
-      cors_origins: CORS_ORIGINS
-    )
+    @full || @full_lock.synchronize do
+      @full ||= begin
+        get_logger('config').info('Loading extended configuration')
+        full = Config.load.merge(
+          db_dsn: DB_DSN,
+          redis_host: REDIS_HOST,
+          redis_port: REDIS_PORT,
+          jwt_secret: JWT_SECRET,
+          environment: ENVIRONMENT,
+          log_level: LOG_LEVEL,
+          rate_limit_per_minute: RATE_LIMIT_PER_MINUTE,
+          cors_origins: CORS_ORIGINS
+        )
+        Ractor.make_shareable(Marshal.load(Marshal.dump(full)))
+      end
+    end
   end
 
   def self.validate_config(config)
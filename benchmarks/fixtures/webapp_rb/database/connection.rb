@@ -4,6 +4,13 @@ require_relative '../utils/helpers'
 require_relative '../exceptions'
 require_relative 'pool'
 
+# A statement prepared once on a connection and executed with new binds.
+PreparedStatement = Struct.new(:connection, :sql) do
+  def execute(*params)
+    connection.execute_query(sql, params)
+  end
+end
+
 # High-level database connection.
 class DatabaseConnection
   def initialize(pool)
@@ -29,6 +36,32 @@ class DatabaseConnection
     end
   end
 
+  # Prepare a statement for repeated execution.
+  def prepare(sql)
+    get_logger('database.connection').info("Preparing: #{sql[0, 80]}...")
+    PreparedStatement.new(self, sql.frozen? ? sql : sql.dup.freeze)
+  end
+
+  # Execute one statement for each set of params on a single connection,
+  # like a prepared statement batch. Returns the total affected rows.
+  def execute_batch(sql, param_sets)
+    return 0 if param_sets.empty?
+
+    with_connection { param_sets.sum { |params| execute_query(sql, params)[:affected] } }
+  end
+
+  # Run the block against one pinned connection in a single transaction,
+  # committing on success and rolling back if it raises.
+  def with_connection
+    begin_transaction
+    result = yield self
+    commit
+    result
+  rescue StandardError
+    rollback
+    raise
+  end
+
   # Find a record by ID.
   def find_by_id(table, id)
     result = execute_query("SELECT * FROM #{table} WHERE id = ?", [id])
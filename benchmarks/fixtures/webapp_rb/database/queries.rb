@@ -55,8 +55,12 @@ end
 
 # Payment queries.
 class PaymentQueries
+  UPDATE_STATUS_SQL = 'UPDATE payments SET status = ? WHERE transaction_id = ?'
+  STATUS_BATCH_SIZE = 30
+
   def initialize(db)
     @db = db
+    @prepared = {}
   end
 
   def find_by_transaction_id(txn_id)
@@ -74,6 +78,26 @@ class PaymentQueries
     result[:rows]
   end
 
+  # Yield payments with the given status in pages of at most batch_size,
+  # using keyset pagination on transaction_id so no full result set is held
+  # and the caller can start work on the first page right away.
+  def stream_user_payments(status, batch_size: 500)
+    last_id = ''
+    loop do
+      result = @db.execute_query(
+        'SELECT * FROM payments WHERE status = ? AND transaction_id > ? ORDER BY transaction_id LIMIT ?',
+        [status, last_id, batch_size]
+      )
+      rows = result[:rows]
+      break if rows.empty?
+
+      yield rows
+      break if rows.length < batch_size
+
+      last_id = rows.last[:transaction_id]
+    end
+  end
+
   def create_payment(user_id, amount, currency, txn_id)
     @db.insert('payments', {
       user_id: user_id, amount: amount, currency: currency,
@@ -83,10 +107,27 @@ class PaymentQueries
 
   def update_status(txn_id, status)
     get_logger('database.queries').info("Updating payment #{txn_id} to #{status}")
-    result = @db.execute_query('UPDATE payments SET status = ? WHERE transaction_id = ?', [status, txn_id])
+    result = prepared(UPDATE_STATUS_SQL).execute(status, txn_id)
     result[:affected] > 0
   end
 
+  # Update many [transaction_id, status] pairs through one reused statement,
+  # flushing every STATUS_BATCH_SIZE rows and once more at the end.
+  def update_statuses(pairs)
+    get_logger('database.queries').info("Updating #{pairs.size} payment statuses")
+    affected = 0
+    batch = []
+    pairs.each_with_index do |(txn_id, status), i|
+      batch << [status, txn_id]
+      next unless ((i + 1) % STATUS_BATCH_SIZE).zero?
+
+      affected += @db.execute_batch(UPDATE_STATUS_SQL, batch)
+      batch = []
+    end
+    affected += @db.execute_batch(UPDATE_STATUS_SQL, batch) unless batch.empty?
+    affected
+  end
+
   def calculate_revenue(start_date, end_date)
     result = @db.execute_query(
       "SELECT SUM(amount) as total FROM payments WHERE status = 'completed' AND created_at BETWEEN ? AND ?",
@@ -95,4 +136,11 @@ class PaymentQueries
     row = result[:rows].first
     row ? (row[:total] || 0).to_f : 0.0
   end
+
+  private
+
+  # Prepared statements keyed by SQL text, so each is parsed only once.
+  def prepared(sql)
+    @prepared[sql] ||= @db.prepare(sql)
+  end
 end
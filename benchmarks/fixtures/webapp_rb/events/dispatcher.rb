@@ -4,39 +4,133 @@ require_relative '../utils/helpers'
 
 # Central event bus.
 class EventDispatcher
+  NO_HANDLERS = [].freeze
+
   def initialize
     @handlers = {}
-    @event_log = []
+    # Events published from any thread, dispatched later by drain.
+    @inbox = Thread::Queue.new
+    # Event log kept as parallel columns; types are interned to small integer ids.
+    @type_ids = {}
+    @type_names = []
+    @log_types = []
+    @log_data = []
+    @log_timestamps = []
+    @log_processed = []
   end
 
-  # Register a handler for an event type.
-  def on(event_type, &handler)
+  # Register a handler (callable or block) for an event type.
+  def on(event_type, callable = nil, &block)
     @handlers[event_type] ||= []
-    @handlers[event_type] << handler
+    @handlers[event_type] << (callable || block)
     get_logger('events.dispatcher').info("Handler registered for: #{event_type}")
   end
 
   # Emit an event to all registered handlers.
   def emit(event_type, data = {})
     event = { type: event_type, data: data, timestamp: Time.now.to_i, processed: false }
-    @event_log << event
-    handlers = @handlers[event_type] || []
-    get_logger('events.dispatcher').info("Emitting #{event_type} to #{handlers.length} handlers")
+    idx = append_log(event_type, data, event[:timestamp])
+    handlers = @handlers[event_type] || NO_HANDLERS
+    log = get_logger('events.dispatcher')
+    log.info("Emitting #{event_type} to #{handlers.length} handlers")
     invoked = 0
     handlers.each do |handler|
       begin
         handler.call(event)
         invoked += 1
       rescue StandardError => e
-        get_logger('events.dispatcher').error("Handler error for #{event_type}: #{e}")
+        log.error("Handler error for #{event_type}: #{e}")
       end
     end
     event[:processed] = true
+    @log_processed[idx] = true
     invoked
   end
 
+  # Emit a batch of events of one type. Handlers are looked up once and run
+  # handler by handler over the whole batch; the log columns grow in one
+  # concat per column. Returns the number of successful handler calls.
+  def emit_many(event_type, data_list)
+    handlers = @handlers[event_type] || NO_HANDLERS
+    log = get_logger('events.dispatcher')
+    log.info("Emitting #{data_list.length} x #{event_type} to #{handlers.length} handlers")
+    now = Time.now.to_i
+    events = data_list.map { |data| { type: event_type, data: data, timestamp: now, processed: false } }
+    invoked = 0
+    handlers.each do |handler|
+      events.each do |event|
+        handler.call(event)
+        invoked += 1
+      rescue StandardError => e
+        log.error("Handler error for #{event_type}: #{e}")
+      end
+    end
+    events.each { |event| event[:processed] = true }
+    append_log_batch(event_type, data_list, now)
+    invoked
+  end
+
+  # Queue an event from any thread without touching handlers or the log.
+  def publish(event_type, data = {})
+    @inbox << [event_type, data]
+  end
+
+  # Dispatch the events queued so far on the calling thread. Returns how
+  # many were dispatched.
+  def drain
+    count = @inbox.size
+    count.times do
+      event_type, data = @inbox.pop
+      emit(event_type, data)
+    end
+    count
+  end
+
   # Get total event count.
   def event_count
-    @event_log.length
+    @log_types.length
+  end
+
+  # Count logged events of one type.
+  def count_of(event_type)
+    id = @type_ids[event_type]
+    id ? @log_types.count(id) : 0
+  end
+
+  # Materialize the logged event at index i as a Hash.
+  def event_at(i)
+    return nil unless i < @log_types.length
+
+    {
+      type: @type_names[@log_types[i]],
+      data: @log_data[i],
+      timestamp: @log_timestamps[i],
+      processed: @log_processed[i]
+    }
+  end
+
+  private
+
+  def type_id(event_type)
+    @type_ids[event_type] ||= begin
+      @type_names << event_type
+      @type_names.length - 1
+    end
+  end
+
+  def append_log_batch(event_type, data_list, timestamp)
+    n = data_list.length
+    @log_types.concat(Array.new(n, type_id(event_type)))
+    @log_data.concat(data_list)
+    @log_timestamps.concat(Array.new(n, timestamp))
+    @log_processed.concat(Array.new(n, true))
+  end
+
+  def append_log(event_type, data, timestamp)
+    @log_types << type_id(event_type)
+    @log_data << data
+    @log_timestamps << timestamp
+    @log_processed << false
+    @log_types.length - 1
   end
 end
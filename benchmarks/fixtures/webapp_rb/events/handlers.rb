@@ -1,8 +1,16 @@
+# frozen_string_literal: true
+
 # Default event handlers.
 
 require_relative '../utils/helpers'
 require_relative 'dispatcher'
 
+EVENT_USER_REGISTERED = 'auth.user_registered'
+EVENT_LOGIN_SUCCESS = 'auth.login_success'
+EVENT_LOGIN_FAILED = 'auth.login_failed'
+EVENT_PAYMENT_COMPLETED = 'payment.completed'
+EVENT_PAYMENT_REFUNDED = 'payment.refunded'
+
 # Log when a user registers.
 def on_user_registered(event)
   get_logger('events.handlers').info("User registered: #{event[:data][:email]}")
@@ -30,10 +38,10 @@ end
 
 # Register all default event handlers.
 def register_default_handlers(dispatcher)
-  dispatcher.on('auth.user_registered') { |e| on_user_registered(e) }
-  dispatcher.on('auth.login_success') { |e| on_login_success(e) }
-  dispatcher.on('auth.login_failed') { |e| on_login_failed(e) }
-  dispatcher.on('payment.completed') { |e| on_payment_completed(e) }
-  dispatcher.on('payment.refunded') { |e| on_payment_refunded(e) }
+  dispatcher.on(EVENT_USER_REGISTERED, method(:on_user_registered))
+  dispatcher.on(EVENT_LOGIN_SUCCESS, method(:on_login_success))
+  dispatcher.on(EVENT_LOGIN_FAILED, method(:on_login_failed))
+  dispatcher.on(EVENT_PAYMENT_COMPLETED, method(:on_payment_completed))
+  dispatcher.on(EVENT_PAYMENT_REFUNDED, method(:on_payment_refunded))
   get_logger('events.handlers').info('Default handlers registered')
 end
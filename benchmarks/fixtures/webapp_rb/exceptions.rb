@@ -22,6 +22,17 @@ class ValidationError < AppError
     @field = field
     super(message, code: 400)
   end
+
+  @preallocated = {}
+
+  # Shared frozen instance for a fixed message. Its backtrace is set once,
+  # so raising it on hot failure paths skips capturing the stack.
+  def self.preallocated(message, field)
+    @preallocated[[message, field]] ||= new(message, field: field).tap do |err|
+      err.set_backtrace(["preallocated #{name}: #{message}"])
+      err.freeze
+    end
+  end
 end
 
 # Raised when a payment operation fails.
@@ -1,5 +1,8 @@
+# frozen_string_literal: true
+
 # Auth middleware (services layer).
 
+require 'set'
 require_relative '../utils/helpers'
 require_relative '../auth/tokens'
 require_relative '../auth/middleware'
@@ -7,7 +10,7 @@ require_relative '../exceptions'
 
 # Authentication middleware for the services layer.
 class AuthMiddleware
-  PUBLIC_PATHS = %w[/health /login /register].freeze
+  PUBLIC_PATHS = Set[*%w[/health /login /register]].freeze
 
   def initialize(app)
     @app = app
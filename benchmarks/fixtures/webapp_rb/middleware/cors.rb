@@ -1,3 +1,5 @@
+# frozen_string_literal: true
+
 # CORS middleware.
 
 require_relative '../utils/helpers'
@@ -5,8 +7,14 @@ require_relative '../utils/helpers'
 DEFAULT_ORIGINS = ['http://localhost:3000', 'https://app.example.com'].freeze
 
 # CORS policy configuration.
+#
+# Response headers are precomputed per allowed origin, so headers() is a
+# hash lookup returning a shared frozen Hash for known origins.
 class CorsPolicy
-  attr_accessor :allowed_origins, :allowed_methods, :allow_credentials, :max_age
+  EMPTY_HEADERS = {}.freeze
+
+  attr_reader :allowed_origins, :allowed_methods, :max_age
+  attr_accessor :allow_credentials
 
   def initialize(
     allowed_origins: DEFAULT_ORIGINS,
@@ -18,32 +26,51 @@ class CorsPolicy
     @allowed_methods = allowed_methods
     @allow_credentials = allow_credentials
     @max_age = max_age
+    build_header_table
   end
 
   def origin_allowed?(origin)
-    @allowed_origins.include?('*') || @allowed_origins.include?(origin)
+    @wildcard || @headers_by_origin.key?(origin)
   end
 
   def headers(origin)
-    return {} unless origin_allowed?(origin)
+    hdrs = @headers_by_origin[origin]
+    return hdrs if hdrs
+    return EMPTY_HEADERS unless @wildcard
+
+    header_set(origin)
+  end
 
+  private
+
+  def build_header_table
+    @wildcard = @allowed_origins.include?('*')
+    @methods_csv = @allowed_methods.join(', ').freeze
+    @max_age_s = @max_age.to_s.freeze
+    @headers_by_origin = @allowed_origins.each_with_object({}) { |o, h| h[o] = header_set(o) }
+  end
+
+  def header_set(origin)
     {
       'Access-Control-Allow-Origin' => origin,
-      'Access-Control-Allow-Methods' => @allowed_methods.join(', '),
-      'Access-Control-Max-Age' => @max_age.to_s
-    }
+      'Access-Control-Allow-Methods' => @methods_csv,
+      'Access-Control-Max-Age' => @max_age_s
+    }.freeze
   end
 end
 
+DEFAULT_CORS_POLICY = CorsPolicy.new
+
 # Apply CORS headers to a request.
 def cors_middleware(request, policy = nil)
   validate_request(request)
-  cors = policy || CorsPolicy.new
+  cors = policy || DEFAULT_CORS_POLICY
   origin = request[:origin] || ''
+  hdrs = CorsPolicy::EMPTY_HEADERS
   if origin && !origin.empty?
     hdrs = cors.headers(origin)
     get_logger('middleware.cors').warn("CORS rejected: #{origin}") if hdrs.empty?
-    return request.merge(cors_headers: hdrs)
   end
-  request.merge(cors_headers: {})
+  request[:cors_headers] = hdrs
+  request
 end
@@ -1,3 +1,5 @@
+# frozen_string_literal: true
+
 # Request logging middleware.
 
 require_relative '../utils/helpers'
@@ -12,7 +14,9 @@ def logging_middleware(request)
   method = request[:method]
   path = request[:path]
   get_logger('middleware.logging').info("[#{request_id}] #{method} #{path}")
-  request.merge(request_id: request_id, start_time: Time.now.to_f)
+  request[:request_id] = request_id
+  request[:start_time] = Time.now.to_f
+  request
 end
 
 # Log response details.
@@ -1,3 +1,5 @@
+# frozen_string_literal: true
+
 # Rate limiting middleware.
 
 require_relative '../utils/helpers'
@@ -6,35 +8,54 @@ require_relative '../cache/base_cache'
 
 # Rate limiter using a cache backend.
 class RateLimiter
+  KEY_PREFIX = 'ratelimit:'
+  MAX_CACHED_KEYS = 10_000
+
   def initialize(cache, limit: 100, window: 60)
     @cache = cache
     @limit = limit
     @window = window
+    @keys = {}
+    @key_count = 0
   end
 
   def check(key)
-    cache_key = "ratelimit:#{key}"
-    current = @cache.get(cache_key)
-    if current.nil?
-      @cache.set(cache_key, 1, @window)
-      return { allowed: true, remaining: @limit - 1 }
-    end
-    if current >= @limit
-      get_logger('middleware.rate_limit').info("Rate limit exceeded: #{key}")
+    tally("#{KEY_PREFIX}#{key}")
+  end
+
+  # Same as check("ip:path"), reusing the composed cache key across requests.
+  def check_client(ip, path)
+    by_path = @keys[ip] ||= {}
+    tally(by_path[path] || remember_key(ip, path))
+  end
+
+  private
+
+  def tally(cache_key)
+    count, = @cache.incr_with_ttl(cache_key, @window)
+    if count > @limit
+      get_logger('middleware.rate_limit').info("Rate limit exceeded: #{cache_key}")
       return { allowed: false, remaining: 0 }
     end
-    @cache.set(cache_key, current + 1, @window)
-    { allowed: true, remaining: @limit - current - 1 }
+    { allowed: true, remaining: @limit - count }
+  end
+
+  def remember_key(ip, path)
+    if @key_count >= MAX_CACHED_KEYS
+      @keys.clear
+      @key_count = 0
+    end
+    @key_count += 1
+    (@keys[ip] ||= {})[path] = "#{KEY_PREFIX}#{ip}:#{path}".freeze
   end
 end
 
 # Apply rate limiting to a request.
 def rate_limit_middleware(request, cache)
   validate_request(request)
-  ip = request[:ip] || 'unknown'
-  path = request[:path] || '/'
-  limiter = RateLimiter.new(cache)
-  result = limiter.check("#{ip}:#{path}")
+  # One limiter per cache backend, reused across requests.
+  limiter = cache.rate_limiter ||= RateLimiter.new(cache)
+  result = limiter.check_client(request[:ip] || 'unknown', request[:path] || '/')
   raise RateLimitError.new(retry_after: 60) unless result[:allowed]
 
   request[:rate_limit] = result
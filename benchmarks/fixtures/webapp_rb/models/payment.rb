@@ -2,19 +2,25 @@
 
 require_relative '../utils/helpers'
 
-# Payment statuses.
+# Payment statuses, stored as integers; NAMES gives the serialized form.
 module PaymentStatus
-  PENDING = 'pending'
-  PROCESSING = 'processing'
-  COMPLETED = 'completed'
-  FAILED = 'failed'
-  REFUNDED = 'refunded'
+  PENDING = 0
+  PROCESSING = 1
+  COMPLETED = 2
+  FAILED = 3
+  REFUNDED = 4
+  NAMES = %w[pending processing completed failed refunded].freeze
+
+  # Accept a status id or name; unknown names fall back to PENDING.
+  def self.coerce(status)
+    status.is_a?(Integer) ? status : NAMES.index(status.to_s) || PENDING
+  end
 end
 
 # Payment record.
 class Payment
-  attr_reader :id, :user_id, :amount, :currency, :transaction_id, :created_at
-  attr_accessor :status, :completed_at
+  attr_reader :id, :user_id, :amount, :currency, :transaction_id, :created_at, :status
+  attr_accessor :completed_at
 
   def initialize(id:, user_id:, amount:, currency:, transaction_id:, status: PaymentStatus::PENDING, created_at: nil, completed_at: nil)
     @id = id
@@ -22,11 +28,19 @@ class Payment
     @amount = amount
     @currency = currency
     @transaction_id = transaction_id
-    @status = status
+    @status = PaymentStatus.coerce(status)
     @created_at = created_at || Time.now.to_i
     @completed_at = completed_at
   end
 
+  def status=(status)
+    @status = PaymentStatus.coerce(status)
+  end
+
+  def status_name
+    PaymentStatus::NAMES[@status]
+  end
+
   def complete
     @status = PaymentStatus::COMPLETED
     @completed_at = Time.now.to_i
@@ -54,7 +68,7 @@ class Payment
       amount: @amount,
       currency: @currency,
       transaction_id: @transaction_id,
-      status: @status,
+      status: status_name,
       created_at: @created_at,
       completed_at: @completed_at
     }
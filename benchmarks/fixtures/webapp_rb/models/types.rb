@@ -1,18 +1,25 @@
 # Shared type definitions as modules of constants.
 
+# User roles, stored as integers; NAMES gives the serialized form.
 module UserRole
-  USER = 'user'
-  ADMIN = 'admin'
-  MODERATOR = 'moderator'
+  USER = 0
+  ADMIN = 1
+  MODERATOR = 2
+  NAMES = %w[user admin moderator].freeze
+
+  # Accept a role id or name; unknown names fall back to USER.
+  def self.coerce(role)
+    role.is_a?(Integer) ? role : NAMES.index(role.to_s) || USER
+  end
 end
 
 module EventType
-  USER_REGISTERED = 'user.registered'
-  LOGIN_SUCCESS = 'auth.login_success'
-  LOGIN_FAILED = 'auth.login_failed'
-  PAYMENT_COMPLETED = 'payment.completed'
-  PAYMENT_REFUNDED = 'payment.refunded'
-  PASSWORD_CHANGED = 'auth.password_changed'
+  USER_REGISTERED = 'user.registered'.freeze
+  LOGIN_SUCCESS = 'auth.login_success'.freeze
+  LOGIN_FAILED = 'auth.login_failed'.freeze
+  PAYMENT_COMPLETED = 'payment.completed'.freeze
+  PAYMENT_REFUNDED = 'payment.refunded'.freeze
+  PASSWORD_CHANGED = 'auth.password_changed'.freeze
 end
 
 module NotificationChannel
@@ -4,38 +4,53 @@ require_relative '../utils/helpers'
 require_relative '../database/connection'
 require_relative '../cache/base_cache'
 
+WEEK_SECS = 7 * 86_400
+MONTH_SECS = 30 * 86_400
+
+# Logger for this file's tasks, looked up once on first use.
+module CleanupTasks
+  def self.log
+    @log ||= get_logger('tasks.cleanup')
+  end
+end
+
 # Clean up expired sessions.
 def cleanup_expired_sessions(db)
-  get_logger('tasks.cleanup').info('Cleaning up expired sessions')
+  CleanupTasks.log.info('Cleaning up expired sessions')
+  now = Time.now.to_i
   result = db.execute_query(
     'UPDATE sessions SET expired_at = ? WHERE expired_at IS NULL AND created_at < ?',
-    [Time.now.to_i, Time.now.to_i - 7 * 86_400]
+    [now, now - WEEK_SECS]
   )
-  get_logger('tasks.cleanup').info("Expired #{result[:affected]} sessions")
+  CleanupTasks.log.info("Expired #{result[:affected]} sessions")
   result[:affected]
 end
 
 # Clean up old events.
 def cleanup_old_events(db)
-  get_logger('tasks.cleanup').info('Cleaning up old events')
+  CleanupTasks.log.info('Cleaning up old events')
   result = db.execute_query(
     'DELETE FROM events WHERE processed_at IS NOT NULL AND created_at < ?',
-    [Time.now.to_i - 30 * 86_400]
+    [Time.now.to_i - MONTH_SECS]
   )
   result[:affected]
 end
 
 # Flush cache.
 def cleanup_cache(cache)
-  get_logger('tasks.cleanup').info('Running cache cleanup')
-  cache.clear
+  CleanupTasks.log.info('Running cache cleanup')
+  cache.clear_async
 end
 
 # Run all cleanup tasks.
 def run_all_cleanup(db, cache)
-  sessions = cleanup_expired_sessions(db)
-  events = cleanup_old_events(db)
-  cache_entries = cleanup_cache(cache)
-  get_logger('tasks.cleanup').info('Cleanup complete')
+  # The cache is independent of the database, so flush it concurrently.
+  cache_job = Thread.new { cleanup_cache(cache) }
+  # Both statements share one connection and one BEGIN/COMMIT.
+  sessions, events = db.with_connection do |conn|
+    [cleanup_expired_sessions(conn), cleanup_old_events(conn)]
+  end
+  cache_entries = cache_job.value
+  CleanupTasks.log.info('Cleanup complete')
   { expired_sessions: sessions, old_events: events, cache_cleared: cache_entries }
 end
@@ -6,34 +6,72 @@ require_relative '../database/queries'
 require_relative '../services/payment/processor'
 require_relative '../events/dispatcher'
 
+# Logger for this file's tasks, looked up once on first use.
+module PaymentTasks
+  def self.log
+    @log ||= get_logger('tasks.payment')
+  end
+end
+
+# Max payments per bulk UPDATE, keeping statements well under length limits.
+PAYMENT_BATCH_SIZE = 500
+
+# Set many payment statuses in one statement per batch of
+# [transaction_id, status] pairs, using UPDATE ... SET status = CASE.
+def bulk_update_status(db, updates, batch_size: PAYMENT_BATCH_SIZE)
+  affected = 0
+  updates.each_slice(batch_size) do |chunk|
+    whens = Array.new(chunk.size, 'WHEN ? THEN ?').join(' ')
+    in_list = Array.new(chunk.size, '?').join(', ')
+    result = db.execute_query(
+      "UPDATE payments SET status = CASE transaction_id #{whens} END WHERE transaction_id IN (#{in_list})",
+      chunk.flatten + chunk.map(&:first)
+    )
+    affected += result[:affected]
+  end
+  affected
+end
+
 # Process pending payments.
 def process_pending_payments(db, events)
-  get_logger('tasks.payment').info('Processing pending payments')
+  PaymentTasks.log.info('Processing pending payments')
   queries = PaymentQueries.new(db)
-  pending = queries.find_user_payments('', 'pending')
   processed = 0
   failed = 0
-  pending.each do |payment|
+  # Each page is updated as soon as it arrives, in its own transaction, so a
+  # failing bulk UPDATE rolls back that page alone.
+  queries.stream_user_payments('pending', batch_size: PAYMENT_BATCH_SIZE) do |page|
+    ids = page.map { |payment| payment[:transaction_id] }
     begin
-      queries.update_status(payment[:transaction_id], 'completed')
-      processed += 1
+      db.with_connection { bulk_update_status(db, ids.map { |id| [id, 'completed'] }) }
+      completed = ids
+      rejected = []
     rescue StandardError
-      queries.update_status(payment[:transaction_id], 'failed')
-      failed += 1
+      # Retry the rolled-back page row by row; only rows that fail again
+      # are marked failed.
+      completed, rejected = ids.partition do |id|
+        queries.update_status(id, 'completed')
+      rescue StandardError
+        false
+      end
+      queries.update_statuses(rejected.map { |id| [id, 'failed'] })
     end
+    processed += completed.size
+    failed += rejected.size
+    completed.each { |id| events.publish('payment.completed', { transaction_id: id }) }
+    rejected.each { |id| events.publish('payment.failed', { transaction_id: id }) }
   end
+  # Hand the queued outcomes to their handlers now that every page is settled.
+  events.drain
   { processed: processed, failed: failed }
 end
 
 # Reconcile payments.
 def reconcile_payments(db, events)
-  get_logger('tasks.payment').info('Reconciling payments')
-  queries = PaymentQueries.new(db)
-  processing = queries.find_user_payments('', 'processing')
-  resolved = 0
-  processing.each do |payment|
-    queries.update_status(payment[:transaction_id], 'completed')
-    resolved += 1
-  end
-  { resolved: resolved }
+  PaymentTasks.log.info('Reconciling payments')
+  # Select and transition the processing rows in a single round-trip.
+  result = db.execute_query(
+    "UPDATE payments SET status = 'completed' WHERE status = 'processing' RETURNING transaction_id"
+  )
+  { resolved: result[:rows].size }
 end
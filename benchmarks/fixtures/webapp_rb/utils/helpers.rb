@@ -7,6 +7,13 @@ def get_logger(name)
   Logging.get_logger(name)
 end
 
+TICK_CLOCK = defined?(Process::CLOCK_MONOTONIC_COARSE) ? Process::CLOCK_MONOTONIC_COARSE : Process::CLOCK_MONOTONIC
+
+# Current monotonic time in whole seconds; for TTL bookkeeping, not wall time.
+def current_tick
+  Process.clock_gettime(TICK_CLOCK, :second)
+end
+
 # Validate that a request hash has required fields.
 def validate_request(request)
   raise ArgumentError, 'Request must be a Hash' unless request.is_a?(Hash)
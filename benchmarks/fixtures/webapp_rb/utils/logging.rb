@@ -3,9 +3,69 @@
 require 'logger'
 
 module Logging
+  BUFFER_SIZE = Integer(ENV.fetch('LOG_BUFFER_SIZE', 64 * 1024))
+  FLUSH_INTERVAL = Float(ENV.fetch('LOG_FLUSH_INTERVAL', 0.05))
+  # An unknown LOG_LEVEL falls back to info instead of failing every get_logger.
+  LEVEL = begin
+    Logger.new(nil, level: ENV.fetch('LOG_LEVEL', 'info')).level
+  rescue ArgumentError
+    Logger::INFO
+  end
+
+  # IO wrapper that batches log lines into a single write once BUFFER_SIZE
+  # bytes accumulate, or every FLUSH_INTERVAL seconds from a background thread.
+  class BufferedSink
+    def initialize(io, size: BUFFER_SIZE, interval: FLUSH_INTERVAL)
+      @io = io
+      @size = size
+      @buf = +''
+      @lock = Mutex.new
+      @flusher = Thread.new { loop { sleep interval; flush } } if interval.positive?
+    end
+
+    def write(*parts)
+      @lock.synchronize do
+        parts.each { |part| @buf << part.to_s }
+        flush_locked if @buf.bytesize >= @size
+      end
+    end
+
+    def flush
+      @lock.synchronize { flush_locked }
+    end
+
+    def close
+      flush
+    end
+
+    private
+
+    def flush_locked
+      return if @buf.empty?
+
+      @io.write(@buf)
+      @io.flush
+      @buf.clear
+    end
+  end
+
+  @loggers = {}
+  # Guards the first sink and logger creation, so racing threads never build
+  # a second sink and flusher.
+  @lock = Mutex.new
+
+  def self.sink
+    @sink || @lock.synchronize do
+      @sink ||= BufferedSink.new($stdout).tap { |s| at_exit { s.flush } }
+    end
+  end
+
   def self.get_logger(name)
-    logger = Logger.new($stdout)
-    logger.progname = name
-    logger
+    @loggers[name] || begin
+      io = sink
+      @lock.synchronize do
+        @loggers[name] ||= Logger.new(io, level: LEVEL).tap { |logger| logger.progname = name }
+      end
+    end
   end
 end
@@ -1,18 +1,62 @@
+# frozen_string_literal: true
+
 # Common validation utilities.
 
 require_relative '../utils/helpers'
 require_relative '../exceptions'
 
-EMAIL_REGEX = /\A[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\z/
+EMAIL_REGEX = /\A[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\z/.freeze
+# Matches only already-normalized (stripped, lowercase) addresses.
+CLEAN_EMAIL_REGEX = /\A[a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,}\z/.freeze
+# Set EMAIL_FAST_SCAN=0 to validate with the regexes above instead of the byte scan.
+EMAIL_FAST_SCAN = ENV.fetch('EMAIL_FAST_SCAN', '1') != '0'
+
+EMAIL_LOCAL_BYTES = Array.new(256, false).tap do |table|
+  [*'a'..'z', *'A'..'Z', *'0'..'9', '.', '_', '%', '+', '-'].each { |c| table[c.ord] = true }
+end.freeze
+EMAIL_DOMAIN_BYTES = Array.new(256, false).tap do |table|
+  [*'a'..'z', *'A'..'Z', *'0'..'9', '.', '-'].each { |c| table[c.ord] = true }
+end.freeze
+
+# Byte-scan equivalent of EMAIL_REGEX (CLEAN_EMAIL_REGEX with lowercase: true).
+def fast_email_ok?(email, lowercase: false)
+  at = nil
+  last_dot = nil
+  i = 0
+  email.each_byte do |b|
+    return false if lowercase && b >= 65 && b <= 90
+    if b == 64 # '@'
+      return false if at
+
+      at = i
+    elsif at
+      return false unless EMAIL_DOMAIN_BYTES[b]
+
+      last_dot = i if b == 46 # '.'
+    else
+      return false unless EMAIL_LOCAL_BYTES[b]
+    end
+    i += 1
+  end
+  return false unless at&.positive? && last_dot && last_dot > at + 1 && i - last_dot > 2
+
+  (last_dot + 1...i).all? { |j| (email.getbyte(j) | 0x20).between?(97, 122) }
+end
+
+def email_format_ok?(email, lowercase: false)
+  return fast_email_ok?(email, lowercase: lowercase) if EMAIL_FAST_SCAN
+
+  (lowercase ? CLEAN_EMAIL_REGEX : EMAIL_REGEX).match?(email)
+end
 
 # Validate email format.
 def validate_email(email)
-  raise ValidationError.new('Email is required', field: :email) unless email && !email.empty?
+  raise ValidationError.preallocated('Email is required', :email) if email.nil? || email.empty?
+  return email if email.is_a?(String) && email_format_ok?(email, lowercase: true)
 
   clean = email.strip.downcase
-  unless EMAIL_REGEX.match?(clean)
-    raise ValidationError.new("Invalid email: #{email}", field: :email)
-  end
+  raise ValidationError.preallocated('Invalid email', :email) unless email_format_ok?(clean)
+
   clean
 end
 
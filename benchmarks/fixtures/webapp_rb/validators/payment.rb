@@ -1,3 +1,5 @@
+# frozen_string_literal: true
+
 # Payment input validation.
 
 require_relative '../utils/helpers'
@@ -6,6 +8,7 @@ require_relative 'common'
 
 PAYMENT_CURRENCIES = %w[USD EUR GBP JPY CAD].freeze
 PAYMENT_METHODS = %w[card bank_transfer wallet].freeze
+REFUND_REASON_MAX_BYTES = 500
 
 module PaymentValidator
   # Validate payment data — name collision with UserValidator, ApiV1Auth, ApiV2Auth.
@@ -29,7 +32,15 @@ module PaymentValidator
 
     result = { transaction_id: data[:transaction_id] }
     result[:amount] = validate_positive_number(data[:amount], :amount) if data[:amount]
-    result[:reason] = data[:reason].to_s[0, 500] if data[:reason]
+    reason = data[:reason]
+    result[:reason] = clamp_bytes(reason.to_s, REFUND_REASON_MAX_BYTES) if reason
     result
   end
+
+  # Truncate to at most max bytes without splitting a multibyte character.
+  def self.clamp_bytes(str, max)
+    return str if str.bytesize <= max
+
+    str.byteslice(0, max).scrub('')
+  end
 end
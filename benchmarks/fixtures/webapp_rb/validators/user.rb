@@ -1,3 +1,5 @@
+# frozen_string_literal: true
+
 # User input validation.
 
 require_relative '../utils/helpers'
@@ -5,36 +7,41 @@ require_relative '../exceptions'
 require_relative 'common'
 
 module UserValidator
+  ALLOWED_ROLES = %w[user admin moderator].freeze
+
   # Validate user data — name collision with PaymentValidator, ApiV1Auth, ApiV2Auth.
   def self.validate(data)
     get_logger('validators.user').info('Validating user data')
-    raise ValidationError.new('Email required', field: :email) unless data[:email]
-    raise ValidationError.new('Name required', field: :name) unless data[:name]
+    email = data[:email]
+    name = data[:name]
+    password = data[:password]
+    role = data[:role]
+    raise ValidationError.preallocated('Email required', :email) unless email
+    raise ValidationError.preallocated('Name required', :name) unless name
 
     result = {}
-    result[:email] = validate_email(data[:email])
-    result[:name] = validate_string(data[:name], :name, min_len: 1, max_len: 100)
-    if data[:password]
-      raise ValidationError.new('Password too short', field: :password) if data[:password].length < 8
+    result[:email] = validate_email(email)
+    result[:name] = validate_string(name, :name, min_len: 1, max_len: 100)
+    if password
+      raise ValidationError.preallocated('Password too short', :password) if password.length < 8
 
-      result[:password] = data[:password]
+      result[:password] = password
     end
-    if data[:role]
-      allowed = %w[user admin moderator]
-      unless allowed.include?(data[:role])
-        raise ValidationError.new('Invalid role', field: :role)
-      end
+    if role
+      raise ValidationError.preallocated('Invalid role', :role) unless ALLOWED_ROLES.include?(role)
 
-      result[:role] = data[:role]
+      result[:role] = role
     end
     result
   end
 
   # Validate login data.
   def self.validate_login(data)
-    raise ValidationError.new('Email required', field: :email) unless data[:email]
-    raise ValidationError.new('Password required', field: :password) unless data[:password]
+    email = data[:email]
+    password = data[:password]
+    raise ValidationError.preallocated('Email required', :email) unless email
+    raise ValidationError.preallocated('Password required', :password) unless password
 
-    { email: validate_email(data[:email]), password: data[:password] }
+    { email: validate_email(email), password: password }
   end
 end
@@ -2,7 +2,7 @@ use crate::auth::middleware::extract_token;
 use crate::auth::service::{AuthProvider, DefaultAuth};
 use crate::auth::tokens::{refresh_token, validate_token};
 use crate::config::Config;
-use crate::utils::helpers::{get_logger, sanitize_input, validate_request};
+use crate::utils::helpers::{get_logger, json_body, sanitize_input, validate_request};
 use crate::Request;
 use crate::Response;
 
@@ -23,9 +23,12 @@ pub fn handle_login(request: &Request) -> Response {
     let auth = DefaultAuth::new(config);
     let email = sanitize_input("user@example.com");
     let password = "password";
-    logger.info(&format!("V1 login attempt for {}", email));
+    logger.info(format_args!("V1 login attempt for {}", email));
     match auth.login(&email, password) {
-        Ok(token) => Response::ok(format!(r#"{{"token": "{}", "version": "v1"}}"#, token)),
+        Ok(token) => Response::ok(json_body(
+            token.len(),
+            format_args!(r#"{{"token": "{}", "version": "v1"}}"#, token),
+        )),
         Err(e) => Response::error(401, &format!("{}", e)),
     }
 }
@@ -52,7 +55,10 @@ pub fn handle_refresh(request: &Request) -> Response {
     let config = Config::load();
     match extract_token(request) {
         Some(token) => match refresh_token(&token, &config) {
-            Ok(new_token) => Response::ok(format!(r#"{{"token": "{}"}}"#, new_token.value)),
+            Ok(new_token) => Response::ok(json_body(
+                new_token.value.len(),
+                format_args!(r#"{{"token": "{}"}}"#, new_token.value),
+            )),
             Err(e) => Response::error(401, &e.message),
         },
         None => Response::error(401, "Missing token"),
@@ -1,5 +1,5 @@
 use crate::middleware::auth_mw::require_auth;
-use crate::utils::helpers::{generate_request_id, get_logger};
+use crate::utils::helpers::{generate_request_id, get_logger, json_body};
 use crate::validators::payment;
 use crate::Request;
 use crate::Response;
@@ -17,10 +17,13 @@ pub fn handle_create_payment(request: &Request) -> Response {
     match payment::validate(amount, currency, source) {
         Ok(()) => {
             let txn_id = generate_request_id();
-            logger.info(&format!("Payment created: txn={}", txn_id));
-            Response::ok(format!(
-                r#"{{"transaction_id": "{}", "status": "completed"}}"#,
-                txn_id
+            logger.info(format_args!("Payment created: txn={}", txn_id));
+            Response::ok(json_body(
+                txn_id.len(),
+                format_args!(
+                    r#"{{"transaction_id": "{}", "status": "completed"}}"#,
+                    txn_id
+                ),
             ))
         }
         Err(errors) => Response::error(400, &format!("Validation errors: {:?}", errors)),
@@ -37,10 +40,13 @@ pub fn handle_refund(request: &Request) -> Response {
     let txn_id = "txn-12345";
     match payment::validate_refund(txn_id, "customer request") {
         Ok(()) => {
-            logger.info(&format!("Refund processed: txn={}", txn_id));
-            Response::ok(format!(
-                r#"{{"transaction_id": "{}", "status": "refunded"}}"#,
-                txn_id
+            logger.info(format_args!("Refund processed: txn={}", txn_id));
+            Response::ok(json_body(
+                txn_id.len(),
+                format_args!(
+                    r#"{{"transaction_id": "{}", "status": "refunded"}}"#,
+                    txn_id
+                ),
             ))
         }
         Err(errors) => Response::error(400, &format!("Validation errors: {:?}", errors)),
@@ -1,5 +1,5 @@
 use crate::middleware::auth_mw::require_auth;
-use crate::utils::helpers::{generate_request_id, get_logger};
+use crate::utils::helpers::{generate_request_id, get_logger, json_body};
 use crate::validators::payment;
 use crate::Request;
 use crate::Response;
@@ -17,10 +17,13 @@ pub fn handle_create_payment(request: &Request) -> Response {
     match payment::validate(amount, currency, source) {
         Ok(()) => {
             let txn_id = generate_request_id();
-            logger.info(&format!("V2 payment created: txn={}", txn_id));
-            Response::ok(format!(
-                r#"{{"transaction_id": "{}", "status": "completed", "version": "v2"}}"#,
-                txn_id
+            logger.info(format_args!("V2 payment created: txn={}", txn_id));
+            Response::ok(json_body(
+                txn_id.len(),
+                format_args!(
+                    r#"{{"transaction_id": "{}", "status": "completed", "version": "v2"}}"#,
+                    txn_id
+                ),
             ))
         }
         Err(errors) => Response::error(400, &format!("Validation errors: {:?}", errors)),
@@ -37,10 +40,13 @@ pub fn handle_refund(request: &Request) -> Response {
     let txn_id = "txn-67890";
     match payment::validate_refund(txn_id, "v2 customer request") {
         Ok(()) => {
-            logger.info(&format!("V2 refund processed: txn={}", txn_id));
-            Response::ok(format!(
-                r#"{{"transaction_id": "{}", "status": "refunded", "version": "v2"}}"#,
-                txn_id
+            logger.info(format_args!("V2 refund processed: txn={}", txn_id));
+            Response::ok(json_body(
+                txn_id.len(),
+                format_args!(
+                    r#"{{"transaction_id": "{}", "status": "refunded", "version": "v2"}}"#,
+                    txn_id
+                ),
             ))
         }
         Err(errors) => Response::error(400, &format!("Validation errors: {:?}", errors)),
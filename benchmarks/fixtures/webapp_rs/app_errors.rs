@@ -33,12 +33,50 @@ pub enum AppErrorExt {
     },
 }
 
+impl AppErrorExt {
+    /// Create a validation error, logging it once.
+    pub fn validation(field: &str, message: String) -> Self {
+        let logger = get_logger("app_errors");
+        logger.info(format_args!("Validation error on field: {}", field));
+        AppErrorExt::Validation {
+            field: field.to_string(),
+            message,
+        }
+    }
+
+    /// Create a payment error, logging it once.
+    pub fn payment(transaction_id: Option<String>, message: String) -> Self {
+        let logger = get_logger("app_errors");
+        let txn = transaction_id.as_deref().unwrap_or("unknown");
+        logger.info(format_args!("Payment error for txn: {}", txn));
+        AppErrorExt::Payment {
+            transaction_id,
+            message,
+        }
+    }
+
+    /// Create a not-found error, logging it once.
+    pub fn not_found(resource: &str, identifier: &str) -> Self {
+        let logger = get_logger("app_errors");
+        logger.info(format_args!("{} not found: {}", resource, identifier));
+        AppErrorExt::NotFound {
+            resource: resource.to_string(),
+            identifier: identifier.to_string(),
+        }
+    }
+
+    /// Create a rate limit error, logging it once.
+    pub fn rate_limit(retry_after: u64) -> Self {
+        let logger = get_logger("app_errors");
+        logger.warn(format_args!("Rate limited, retry after {}s", retry_after));
+        AppErrorExt::RateLimit { retry_after }
+    }
+}
+
 impl fmt::Display for AppErrorExt {
     fn fmt(&self, f: &mut fmt::Formatter<'_>) -> fmt::Result {
-        let logger = get_logger("app_errors");
         match self {
             AppErrorExt::Validation { field, message } => {
-                logger.info(&format!("Validation error on field: {}", field));
                 write!(f, "Validation error on '{}': {}", field, message)
             }
             AppErrorExt::Payment {
@@ -46,18 +84,13 @@ impl fmt::Display for AppErrorExt {
                 message,
             } => {
                 let txn = transaction_id.as_deref().unwrap_or("unknown");
-                logger.info(&format!("Payment error for txn: {}", txn));
                 write!(f, "Payment error (txn: {}): {}", txn, message)
             }
             AppErrorExt::NotFound {
                 resource,
                 identifier,
-            } => {
-                logger.info(&format!("{} not found: {}", resource, identifier));
-                write!(f, "{} with id '{}' not found", resource, identifier)
-            }
+            } => write!(f, "{} with id '{}' not found", resource, identifier),
             AppErrorExt::RateLimit { retry_after } => {
-                logger.warn(&format!("Rate limited, retry after {}s", retry_after));
                 write!(f, "Rate limit exceeded. Retry after {}s", retry_after)
             }
         }
@@ -1,11 +1,43 @@
-use std::collections::HashMap;
+use std::cell::Cell;
+use std::sync::Arc;
+
+use rustc_hash::FxHashMap;
+
 use crate::utils::helpers::get_logger;
 use crate::cache::Cache;
 
-/// An in-memory cache implementation using a HashMap.
+/// Link value marking the end of the recency list.
+const NIL: usize = usize::MAX;
+
+/// A cached entry and its links in the recency list.
+struct Node {
+    /// The entry key, shared with the index so eviction can remove it there.
+    key: Arc<str>,
+    /// The cached value, shared with callers of `get`; None once deleted.
+    value: Option<Arc<str>>,
+    /// Slot of the next less recently used entry.
+    prev: Cell<usize>,
+    /// Slot of the next more recently used entry.
+    next: Cell<usize>,
+}
+
+/// An in-memory LRU cache.
+///
+/// Entries live in a slab of nodes linked from least to most recently used,
+/// with an FxHashMap from key to slot. Lookups, recency bumps and eviction of
+/// the least recently used entry are all O(1). The links are `Cell`s so a
+/// read through `&self` can still move its entry to the back.
 pub struct MemoryCache {
-    /// The in-memory key-value store.
-    store: HashMap<String, String>,
+    /// Key to slot in `nodes`.
+    index: FxHashMap<Arc<str>, usize>,
+    /// Entry slots; freed slots are reused before the slab grows.
+    nodes: Vec<Node>,
+    /// Slots released by `delete`; a freed slot's key is dropped on reuse.
+    free: Vec<usize>,
+    /// Slot of the least recently used entry.
+    head: Cell<usize>,
+    /// Slot of the most recently used entry.
+    tail: Cell<usize>,
     /// Maximum number of entries before eviction.
     max_size: usize,
 }
@@ -14,64 +46,132 @@ impl MemoryCache {
     /// Create a new in-memory cache with the given max size.
     pub fn new(max_size: usize) -> Self {
         let logger = get_logger("cache.memory");
-        logger.info(&format!("Creating MemoryCache: max_size={}", max_size));
+        logger.info(format_args!("Creating MemoryCache: max_size={}", max_size));
         Self {
-            store: HashMap::new(),
+            index: FxHashMap::default(),
+            nodes: Vec::new(),
+            free: Vec::new(),
+            head: Cell::new(NIL),
+            tail: Cell::new(NIL),
             max_size,
         }
     }
 
     /// Return the current number of entries in the cache.
     pub fn size(&self) -> usize {
-        self.store.len()
+        self.index.len()
     }
 
     /// Check if the cache is at capacity.
     pub fn is_full(&self) -> bool {
-        self.store.len() >= self.max_size
+        self.index.len() >= self.max_size
+    }
+
+    /// Detach a slot from the recency list.
+    fn unlink(&self, slot: usize) {
+        let node = &self.nodes[slot];
+        let (prev, next) = (node.prev.get(), node.next.get());
+        match prev {
+            NIL => self.head.set(next),
+            p => self.nodes[p].next.set(next),
+        }
+        match next {
+            NIL => self.tail.set(prev),
+            n => self.nodes[n].prev.set(prev),
+        }
+    }
+
+    /// Attach a detached slot as the most recently used entry.
+    fn push_back(&self, slot: usize) {
+        let tail = self.tail.get();
+        self.nodes[slot].prev.set(tail);
+        self.nodes[slot].next.set(NIL);
+        match tail {
+            NIL => self.head.set(slot),
+            t => self.nodes[t].next.set(slot),
+        }
+        self.tail.set(slot);
     }
 }
 
 impl Cache for MemoryCache {
     /// Get a value from the memory cache.
-    fn get(&self, key: &str) -> Option<String> {
+    fn get(&self, key: &str) -> Option<Arc<str>> {
         let logger = get_logger("cache.memory");
-        let result = self.store.get(key).cloned();
-        if result.is_some() {
-            logger.info(&format!("Memory GET hit: {}", key));
-        } else {
-            logger.info(&format!("Memory GET miss: {}", key));
+        match self.index.get(key) {
+            Some(&slot) => {
+                self.unlink(slot);
+                self.push_back(slot);
+                logger.info(format_args!("Memory GET hit: {}", key));
+                self.nodes[slot].value.clone()
+            }
+            None => {
+                logger.info(format_args!("Memory GET miss: {}", key));
+                None
+            }
         }
-        result
     }
 
     /// Set a value in the memory cache.
     fn set(&mut self, key: &str, value: &str, _ttl_secs: Option<u64>) {
         let logger = get_logger("cache.memory");
-        if self.store.len() >= self.max_size && !self.store.contains_key(key) {
-            logger.warn("Memory cache at capacity, evicting oldest");
-            if let Some(first_key) = self.store.keys().next().cloned() {
-                self.store.remove(&first_key);
-            }
+        if let Some(&slot) = self.index.get(key) {
+            self.nodes[slot].value = Some(Arc::from(value));
+            self.unlink(slot);
+            self.push_back(slot);
+            logger.info(format_args!("Memory SET: {}", key));
+            return;
         }
-        self.store.insert(key.to_string(), value.to_string());
-        logger.info(&format!("Memory SET: {}", key));
+        let key: Arc<str> = Arc::from(key);
+        let node = Node {
+            key: Arc::clone(&key),
+            value: Some(Arc::from(value)),
+            prev: Cell::new(NIL),
+            next: Cell::new(NIL),
+        };
+        let lru = self.head.get();
+        let slot = if self.index.len() >= self.max_size && lru != NIL {
+            logger.warn("Memory cache at capacity, evicting oldest");
+            self.unlink(lru);
+            let evicted = std::mem::replace(&mut self.nodes[lru], node);
+            self.index.remove(&evicted.key);
+            lru
+        } else if let Some(slot) = self.free.pop() {
+            self.nodes[slot] = node;
+            slot
+        } else {
+            self.nodes.push(node);
+            self.nodes.len() - 1
+        };
+        logger.info(format_args!("Memory SET: {}", key));
+        self.index.insert(key, slot);
+        self.push_back(slot);
     }
 
     /// Delete a key from the memory cache.
     fn delete(&mut self, key: &str) -> bool {
         let logger = get_logger("cache.memory");
-        let existed = self.store.remove(key).is_some();
-        logger.info(&format!("Memory DEL: {} (existed={})", key, existed));
+        let slot = self.index.remove(key);
+        if let Some(slot) = slot {
+            self.unlink(slot);
+            self.nodes[slot].value = None;
+            self.free.push(slot);
+        }
+        let existed = slot.is_some();
+        logger.info(format_args!("Memory DEL: {} (existed={})", key, existed));
         existed
     }
 
     /// Clear all entries from the memory cache.
     fn clear(&mut self) -> usize {
         let logger = get_logger("cache.memory");
-        let count = self.store.len();
-        self.store.clear();
-        logger.info(&format!("Memory CLEAR: {} entries", count));
+        let count = self.index.len();
+        self.index.clear();
+        self.nodes.clear();
+        self.free.clear();
+        self.head.set(NIL);
+        self.tail.set(NIL);
+        logger.info(format_args!("Memory CLEAR: {} entries", count));
         count
     }
 }
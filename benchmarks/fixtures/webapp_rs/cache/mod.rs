@@ -1,10 +1,13 @@
+use std::sync::Arc;
+
 pub mod redis;
 pub mod memory;
 
 /// Trait defining the interface for all cache implementations.
 pub trait Cache {
-    /// Retrieve a value by key from the cache.
-    fn get(&self, key: &str) -> Option<String>;
+    /// Retrieve a value by key from the cache. The value is shared, so a hit
+    /// costs a reference count bump rather than a copy.
+    fn get(&self, key: &str) -> Option<Arc<str>>;
 
     /// Store a key-value pair in the cache with optional TTL.
     fn set(&mut self, key: &str, value: &str, ttl_secs: Option<u64>);
@@ -1,13 +1,17 @@
-use std::collections::HashMap;
+use std::sync::Arc;
+
+use rustc_hash::FxHashMap;
+
 use crate::utils::helpers::get_logger;
+use crate::utils::intern::intern;
 use crate::cache::Cache;
 
 /// A simulated Redis-backed cache implementation.
 pub struct RedisCache {
-    /// The Redis connection URL.
-    url: String,
+    /// The Redis connection URL, shared with other caches on the same server.
+    url: Arc<str>,
     /// In-memory store simulating Redis.
-    store: HashMap<String, String>,
+    store: FxHashMap<String, Arc<str>>,
     /// Whether the cache is connected.
     connected: bool,
 }
@@ -16,10 +20,10 @@ impl RedisCache {
     /// Create a new Redis cache with the given connection URL.
     pub fn new(url: &str) -> Self {
         let logger = get_logger("cache.redis");
-        logger.info(&format!("Creating RedisCache: url={}", url));
+        logger.info(format_args!("Creating RedisCache: url={}", url));
         Self {
-            url: url.to_string(),
-            store: HashMap::new(),
+            url: intern(url),
+            store: FxHashMap::default(),
             connected: false,
         }
     }
@@ -47,13 +51,13 @@ impl RedisCache {
 
 impl Cache for RedisCache {
     /// Get a value from Redis by key.
-    fn get(&self, key: &str) -> Option<String> {
+    fn get(&self, key: &str) -> Option<Arc<str>> {
         let logger = get_logger("cache.redis");
         let result = self.store.get(key).cloned();
         if result.is_some() {
-            logger.info(&format!("Redis GET hit: {}", key));
+            logger.info(format_args!("Redis GET hit: {}", key));
         } else {
-            logger.info(&format!("Redis GET miss: {}", key));
+            logger.info(format_args!("Redis GET miss: {}", key));
         }
         result
     }
@@ -61,15 +65,22 @@ impl Cache for RedisCache {
     /// Set a value in Redis.
     fn set(&mut self, key: &str, value: &str, _ttl_secs: Option<u64>) {
         let logger = get_logger("cache.redis");
-        self.store.insert(key.to_string(), value.to_string());
-        logger.info(&format!("Redis SET: {}", key));
+        // Replace the value on update; only a new key needs its own String.
+        let value: Arc<str> = Arc::from(value);
+        match self.store.get_mut(key) {
+            Some(existing) => *existing = value,
+            None => {
+                self.store.insert(key.to_string(), value);
+            }
+        }
+        logger.info(format_args!("Redis SET: {}", key));
     }
 
     /// Delete a key from Redis.
     fn delete(&mut self, key: &str) -> bool {
         let logger = get_logger("cache.redis");
         let existed = self.store.remove(key).is_some();
-        logger.info(&format!("Redis DEL: {} (existed={})", key, existed));
+        logger.info(format_args!("Redis DEL: {} (existed={})", key, existed));
         existed
     }
 
@@ -78,7 +89,7 @@ impl Cache for RedisCache {
         let logger = get_logger("cache.redis");
         let count = self.store.len();
         self.store.clear();
-        logger.info(&format!("Redis FLUSHALL: {} keys", count));
+        logger.info(format_args!("Redis FLUSHALL: {} keys", count));
         count
     }
 }
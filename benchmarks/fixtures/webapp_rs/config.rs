@@ -1,19 +1,28 @@
+use std::sync::{Arc, OnceLock};
+
 pub const DEFAULT_PORT: u16 = 8080;
 pub const TOKEN_EXPIRY_SECS: u64 = 3600;
 
+#[derive(Clone)]
 pub struct Config {
     pub port: u16,
-    pub secret_key: String,
-    pub db_url: String,
+    pub secret_key: Arc<str>,
+    pub db_url: Arc<str>,
     pub token_expiry: u64,
 }
 
 impl Config {
+    // Built once per process; each call hands out a copy that shares the strings.
     pub fn load() -> Self {
+        static LOADED: OnceLock<Config> = OnceLock::new();
+        LOADED.get_or_init(Self::read).clone()
+    }
+
+    fn read() -> Self {
         Self {
             port: DEFAULT_PORT,
-            secret_key: "super-secret".to_string(),
-            db_url: "postgres://localhost/webapp".to_string(),
+            secret_key: Arc::from("super-secret"),
+            db_url: Arc::from("postgres://localhost/webapp"),
             token_expiry: TOKEN_EXPIRY_SECS,
         }
     }
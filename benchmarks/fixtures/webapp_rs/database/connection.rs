@@ -1,16 +1,49 @@
+use std::collections::HashMap;
+use std::sync::Arc;
+
 use crate::utils::helpers::get_logger;
 use crate::database::pool::ConnectionPool;
 
 /// The result of a database query.
 pub struct QueryResult {
-    /// Rows returned as key-value pairs.
-    pub rows: Vec<Vec<(String, String)>>,
+    /// Column names, stored once and shared by every row.
+    pub column_names: Vec<Arc<str>>,
+    /// Row values; `values[row][col]` belongs to `column_names[col]`.
+    pub values: Vec<Vec<String>>,
     /// Number of rows affected.
     pub affected: usize,
     /// Duration of the query in milliseconds.
     pub duration_ms: u64,
 }
 
+impl QueryResult {
+    /// Look up a value by row index and column name.
+    pub fn get(&self, row: usize, column: &str) -> Option<&str> {
+        let col = self.column_names.iter().position(|name| &**name == column)?;
+        self.values.get(row).map(|values| values[col].as_str())
+    }
+
+    /// Build a map from each value of `column` to its row index, for callers
+    /// that look up many keys in one result. The first row wins on duplicate values.
+    pub fn index_by(&self, column: &str) -> Option<HashMap<&str, usize>> {
+        let col = self.column_names.iter().position(|name| &**name == column)?;
+        let mut index = HashMap::with_capacity(self.values.len());
+        for (row, values) in self.values.iter().enumerate() {
+            index.entry(values[col].as_str()).or_insert(row);
+        }
+        Some(index)
+    }
+
+    /// Keep only the first row, or return None when there are no rows.
+    pub fn first(mut self) -> Option<QueryResult> {
+        if self.values.is_empty() {
+            return None;
+        }
+        self.values.truncate(1);
+        Some(self)
+    }
+}
+
 /// A high-level database connection wrapping a connection pool.
 pub struct DatabaseConnection {
     /// The underlying connection pool.
@@ -34,51 +67,78 @@ impl DatabaseConnection {
     pub fn execute_query(&mut self, sql: &str, _params: &[&str]) -> Result<QueryResult, String> {
         let logger = get_logger("database.connection");
         let _handle = self.pool.get_connection()?;
-        logger.info(&format!("Executing: {}...", &sql[..sql.len().min(80)]));
+        // Back off to a char boundary so multi-byte SQL cannot panic the slice.
+        let mut n = sql.len().min(80);
+        while !sql.is_char_boundary(n) {
+            n -= 1;
+        }
+        logger.info(format_args!("Executing: {}...", &sql[..n]));
         Ok(QueryResult {
-            rows: Vec::new(),
+            column_names: Vec::new(),
+            values: Vec::new(),
             affected: 0,
             duration_ms: 1,
         })
     }
 
     /// Find a single record by its ID.
-    pub fn find_by_id(&mut self, table: &str, id: &str) -> Result<Option<Vec<(String, String)>>, String> {
+    pub fn find_by_id(&mut self, table: &str, id: &str) -> Result<Option<QueryResult>, String> {
         let logger = get_logger("database.connection");
-        logger.info(&format!("Finding {} by id {}", table, id));
+        logger.info(format_args!("Finding {} by id {}", table, id));
         let result = self.execute_query(
             &format!("SELECT * FROM {} WHERE id = ?", table),
             &[id],
         )?;
-        Ok(result.rows.into_iter().next())
+        Ok(result.first())
     }
 
     /// Insert a new record into the given table.
     pub fn insert(&mut self, table: &str, data: &[(&str, &str)]) -> Result<String, String> {
         let logger = get_logger("database.connection");
-        let cols: Vec<&str> = data.iter().map(|(k, _)| *k).collect();
+        let mut sql = String::with_capacity(32 + table.len() + 16 * data.len());
+        sql.push_str("INSERT INTO ");
+        sql.push_str(table);
+        sql.push_str(" (");
+        for (i, (k, _)) in data.iter().enumerate() {
+            if i > 0 {
+                sql.push_str(", ");
+            }
+            sql.push_str(k);
+        }
+        sql.push_str(") VALUES (");
+        for i in 0..data.len() {
+            if i > 0 {
+                sql.push_str(", ");
+            }
+            sql.push('?');
+        }
+        sql.push(')');
         let vals: Vec<&str> = data.iter().map(|(_, v)| *v).collect();
-        let sql = format!(
-            "INSERT INTO {} ({}) VALUES ({})",
-            table,
-            cols.join(", "),
-            vals.iter().map(|_| "?").collect::<Vec<_>>().join(", ")
-        );
         self.execute_query(&sql, &vals)?;
-        logger.info(&format!("Inserted into {}", table));
+        logger.info(format_args!("Inserted into {}", table));
         Ok("generated-id".to_string())
     }
 
     /// Update a record by its ID.
     pub fn update(&mut self, table: &str, id: &str, data: &[(&str, &str)]) -> Result<usize, String> {
         let logger = get_logger("database.connection");
-        let sets: Vec<String> = data.iter().map(|(k, _)| format!("{} = ?", k)).collect();
-        let vals: Vec<&str> = data.iter().map(|(_, v)| *v).collect();
-        let sql = format!("UPDATE {} SET {} WHERE id = ?", table, sets.join(", "));
-        let mut params = vals;
+        let mut sql = String::with_capacity(32 + table.len() + 20 * data.len());
+        sql.push_str("UPDATE ");
+        sql.push_str(table);
+        sql.push_str(" SET ");
+        for (i, (k, _)) in data.iter().enumerate() {
+            if i > 0 {
+                sql.push_str(", ");
+            }
+            sql.push_str(k);
+            sql.push_str(" = ?");
+        }
+        sql.push_str(" WHERE id = ?");
+        let mut params: Vec<&str> = Vec::with_capacity(data.len() + 1);
+        params.extend(data.iter().map(|(_, v)| *v));
         params.push(id);
         let result = self.execute_query(&sql, &params)?;
-        logger.info(&format!("Updated {} row(s) in {}", result.affected, table));
+        logger.info(format_args!("Updated {} row(s) in {}", result.affected, table));
         Ok(result.affected)
     }
 
@@ -87,7 +147,7 @@ impl DatabaseConnection {
         let logger = get_logger("database.connection");
         let sql = format!("DELETE FROM {} WHERE id = ?", table);
         let result = self.execute_query(&sql, &[id])?;
-        logger.info(&format!("Deleted from {}: affected={}", table, result.affected));
+        logger.info(format_args!("Deleted from {}: affected={}", table, result.affected));
         Ok(result.affected > 0)
     }
 
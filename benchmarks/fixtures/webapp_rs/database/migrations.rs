@@ -54,25 +54,24 @@ impl MigrationRunner {
         Self { db, migrations }
     }
 
-    /// Run all pending migrations, returning the count applied.
+    /// Run all pending migrations in a single transaction, returning the
+    /// count applied. A failure rolls back the whole batch.
     pub fn run_pending(&mut self) -> Result<u32, String> {
         let logger = get_logger("database.migrations");
         let mut count = 0u32;
+        self.db.begin_transaction()?;
         for migration in &self.migrations {
-            logger.info(&format!("Applying migration {}: {}", migration.version, migration.name));
-            self.db.begin_transaction()?;
+            logger.info(format_args!("Applying migration {}: {}", migration.version, migration.name));
             match self.db.execute_query(&migration.sql, &[]) {
-                Ok(_) => {
-                    self.db.commit()?;
-                    count += 1;
-                }
+                Ok(_) => count += 1,
                 Err(e) => {
                     self.db.rollback()?;
                     return Err(format!("Migration {} failed: {}", migration.version, e));
                 }
             }
         }
-        logger.info(&format!("{} migrations applied", count));
+        self.db.commit()?;
+        logger.info(format_args!("{} migrations applied", count));
         Ok(count)
     }
 
@@ -80,7 +79,7 @@ impl MigrationRunner {
     pub fn status(&self) -> (usize, usize) {
         let logger = get_logger("database.migrations");
         let total = self.migrations.len();
-        logger.info(&format!("{} total migrations", total));
+        logger.info(format_args!("{} total migrations", total));
         (0, total)
     }
 }
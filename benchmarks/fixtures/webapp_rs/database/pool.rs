@@ -1,3 +1,5 @@
+use std::collections::HashMap;
+
 use crate::utils::helpers::get_logger;
 
 /// A handle representing a single borrowed connection from the pool.
@@ -18,6 +20,10 @@ pub struct ConnectionPool {
     max_size: usize,
     /// All connection handles managed by this pool.
     connections: Vec<ConnectionHandle>,
+    /// Indices of idle handles; the next one to hand out is on top.
+    free: Vec<usize>,
+    /// Connection ID to index in `connections`, built once at initialization.
+    id_index: HashMap<Box<str>, usize>,
     /// Whether the pool has been initialized.
     initialized: bool,
 }
@@ -26,11 +32,13 @@ impl ConnectionPool {
     /// Create a new connection pool with the given DSN and size.
     pub fn new(dsn: &str, max_size: usize) -> Self {
         let logger = get_logger("database.pool");
-        logger.info(&format!("Creating pool: dsn={}, size={}", dsn, max_size));
+        logger.info(format_args!("Creating pool: dsn={}, size={}", dsn, max_size));
         Self {
             dsn: dsn.to_string(),
             max_size,
             connections: Vec::new(),
+            free: Vec::new(),
+            id_index: HashMap::new(),
             initialized: false,
         }
     }
@@ -41,15 +49,21 @@ impl ConnectionPool {
         if self.initialized {
             return Ok(());
         }
+        self.connections.reserve(self.max_size);
+        self.id_index.reserve(self.max_size);
         for i in 0..self.max_size {
+            let id = format!("conn-{}", i);
+            self.id_index.insert(id.as_str().into(), i);
             self.connections.push(ConnectionHandle {
-                id: format!("conn-{}", i),
+                id,
                 in_use: false,
                 query_count: 0,
             });
         }
+        // Reversed so that pops hand out conn-0 first, as the old scan did.
+        self.free.extend((0..self.max_size).rev());
         self.initialized = true;
-        logger.info(&format!("Pool initialized with {} connections", self.max_size));
+        logger.info(format_args!("Pool initialized with {} connections", self.max_size));
         Ok(())
     }
 
@@ -59,13 +73,12 @@ impl ConnectionPool {
         if !self.initialized {
             self.initialize()?;
         }
-        for conn in &mut self.connections {
-            if !conn.in_use {
-                conn.in_use = true;
-                conn.query_count += 1;
-                logger.info(&format!("Acquired connection {}", conn.id));
-                return Ok(conn);
-            }
+        if let Some(idx) = self.free.pop() {
+            let conn = &mut self.connections[idx];
+            conn.in_use = true;
+            conn.query_count += 1;
+            logger.info(format_args!("Acquired connection {}", conn.id));
+            return Ok(conn);
         }
         Err("Connection pool exhausted".to_string())
     }
@@ -73,19 +86,21 @@ impl ConnectionPool {
     /// Release a connection back to the pool by ID.
     pub fn release_connection(&mut self, conn_id: &str) {
         let logger = get_logger("database.pool");
-        for conn in &mut self.connections {
-            if conn.id == conn_id {
+        if let Some(&idx) = self.id_index.get(conn_id) {
+            let conn = &mut self.connections[idx];
+            // Guard against double release pushing the same index twice.
+            if conn.in_use {
                 conn.in_use = false;
-                logger.info(&format!("Released connection {}", conn_id));
-                return;
+                self.free.push(idx);
+                logger.info(format_args!("Released connection {}", conn_id));
             }
         }
     }
 
     /// Return pool statistics.
     pub fn stats(&self) -> (usize, usize, usize) {
-        let active = self.connections.iter().filter(|c| c.in_use).count();
-        let idle = self.connections.len() - active;
+        let idle = self.free.len();
+        let active = self.connections.len() - idle;
         (self.connections.len(), active, idle)
     }
 
@@ -93,6 +108,8 @@ impl ConnectionPool {
     pub fn shutdown(&mut self) {
         let logger = get_logger("database.pool");
         self.connections.clear();
+        self.free.clear();
+        self.id_index.clear();
         self.initialized = false;
         logger.info("Pool shut down");
     }
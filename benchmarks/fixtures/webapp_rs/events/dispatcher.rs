@@ -2,17 +2,20 @@ use std::collections::HashMap;
 use crate::utils::helpers::get_logger;
 
 /// An event that can be dispatched through the system.
-pub struct Event {
+///
+/// Events borrow their strings from the `emit` call and only live for the
+/// dispatch; a handler that needs to keep one copies what it needs.
+pub struct Event<'a> {
     /// The event type identifier.
-    pub event_type: String,
+    pub event_type: &'a str,
     /// The event payload as a string.
-    pub payload: String,
+    pub payload: &'a str,
     /// Timestamp of when the event was created.
     pub timestamp: u64,
 }
 
 /// A callback type for event handlers.
-pub type EventHandler = fn(&Event);
+pub type EventHandler = fn(&Event<'_>);
 
 /// Dispatches events to registered handlers.
 pub struct EventDispatcher {
@@ -36,14 +39,14 @@ impl EventDispatcher {
     /// Emit an event to all registered handlers.
     pub fn emit(&mut self, event_type: &str, payload: &str) {
         let logger = get_logger("events.dispatcher");
-        let event = Event {
-            event_type: event_type.to_string(),
-            payload: payload.to_string(),
-            timestamp: 0,
-        };
         self.dispatch_count += 1;
-        logger.info(&format!("Emitting event: {} (total: {})", event_type, self.dispatch_count));
+        logger.info(format_args!("Emitting event: {} (total: {})", event_type, self.dispatch_count));
         if let Some(handler_list) = self.handlers.get(event_type) {
+            let event = Event {
+                event_type,
+                payload,
+                timestamp: 0,
+            };
             for handler in handler_list {
                 handler(&event);
             }
@@ -53,7 +56,7 @@ impl EventDispatcher {
     /// Register a handler for a specific event type.
     pub fn on(&mut self, event_type: &str, handler: EventHandler) {
         let logger = get_logger("events.dispatcher");
-        logger.info(&format!("Registering handler for: {}", event_type));
+        logger.info(format_args!("Registering handler for: {}", event_type));
         self.handlers
             .entry(event_type.to_string())
             .or_insert_with(Vec::new)
@@ -64,7 +67,7 @@ impl EventDispatcher {
     pub fn off(&mut self, event_type: &str) {
         let logger = get_logger("events.dispatcher");
         self.handlers.remove(event_type);
-        logger.info(&format!("Removed all handlers for: {}", event_type));
+        logger.info(format_args!("Removed all handlers for: {}", event_type));
     }
 
     /// Return the total number of events dispatched.
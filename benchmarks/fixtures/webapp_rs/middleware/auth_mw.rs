@@ -3,14 +3,12 @@ use crate::auth::middleware::{auth_middleware, extract_token};
 use crate::error::AppError;
 use crate::Request;
 
-/// Paths that do not require authentication.
-const PUBLIC_PATHS: &[&str] = &["/health", "/login", "/register", "/docs"];
-
 /// Check if a request path is public (no auth required).
 pub fn is_public_path(path: &str) -> bool {
     let logger = get_logger("middleware.auth");
-    let is_public = PUBLIC_PATHS.contains(&path);
-    logger.info(&format!("Path {} is public: {}", path, is_public));
+    // Paths that do not require authentication.
+    let is_public = matches!(path, "/health" | "/login" | "/register" | "/docs");
+    logger.info(format_args!("Path {} is public: {}", path, is_public));
     is_public
 }
 
@@ -1,17 +1,15 @@
 use crate::utils::helpers::get_logger;
 use crate::Response;
 
-/// Allowed origins for CORS requests.
-const ALLOWED_ORIGINS: &[&str] = &["http://localhost:3000", "https://app.example.com"];
-
 /// Allowed HTTP methods for CORS.
 const ALLOWED_METHODS: &[&str] = &["GET", "POST", "PUT", "DELETE", "OPTIONS"];
 
 /// Check if an origin is allowed by the CORS policy.
 pub fn is_origin_allowed(origin: &str) -> bool {
     let logger = get_logger("middleware.cors");
-    let allowed = ALLOWED_ORIGINS.contains(&origin);
-    logger.info(&format!("CORS origin check: {} = {}", origin, allowed));
+    // Allowed origins for CORS requests.
+    let allowed = matches!(origin, "http://localhost:3000" | "https://app.example.com");
+    logger.info(format_args!("CORS origin check: {} = {}", origin, allowed));
     allowed
 }
 
@@ -19,16 +17,16 @@ pub fn is_origin_allowed(origin: &str) -> bool {
 pub fn add_cors_headers(response: &mut Response, origin: &str) {
     let logger = get_logger("middleware.cors");
     if is_origin_allowed(origin) {
-        logger.info(&format!("Adding CORS headers for origin: {}", origin));
+        logger.info(format_args!("Adding CORS headers for origin: {}", origin));
     } else {
-        logger.warn(&format!("Rejected CORS origin: {}", origin));
+        logger.warn(format_args!("Rejected CORS origin: {}", origin));
     }
 }
 
 /// Handle a CORS preflight OPTIONS request.
 pub fn handle_preflight(origin: &str) -> Response {
     let logger = get_logger("middleware.cors");
-    logger.info(&format!("Handling CORS preflight for: {}", origin));
+    logger.info(format_args!("Handling CORS preflight for: {}", origin));
     if is_origin_allowed(origin) {
         Response::ok("OK".to_string())
     } else {
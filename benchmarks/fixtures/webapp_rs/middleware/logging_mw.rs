@@ -6,7 +6,7 @@ use crate::Response;
 pub fn log_request(request: &Request) -> String {
     let logger = get_logger("middleware.logging");
     let request_id = generate_request_id();
-    logger.info(&format!(
+    logger.info(format_args!(
         "[{}] {} {}",
         request_id,
         "GET",
@@ -18,7 +18,7 @@ pub fn log_request(request: &Request) -> String {
 /// Log an outgoing response with status and request ID.
 pub fn log_response(request_id: &str, response: &Response) {
     let logger = get_logger("middleware.logging");
-    logger.info(&format!(
+    logger.info(format_args!(
         "[{}] Response: status={}",
         request_id,
         response.status,
@@ -28,7 +28,7 @@ pub fn log_response(request_id: &str, response: &Response) {
 /// Log an error that occurred during request processing.
 pub fn log_error(request_id: &str, error: &str) {
     let logger = get_logger("middleware.logging");
-    logger.error(&format!("[{}] Error: {}", request_id, error));
+    logger.error(format_args!("[{}] Error: {}", request_id, error));
 }
 
 /// Middleware that wraps a handler with request/response logging.
@@ -38,7 +38,7 @@ pub fn with_logging(
 ) -> Response {
     let logger = get_logger("middleware.logging");
     let request_id = log_request(request);
-    logger.info(&format!("[{}] Processing request", request_id));
+    logger.info(format_args!("[{}] Processing request", request_id));
     let response = handler(request);
     log_response(&request_id, &response);
     response
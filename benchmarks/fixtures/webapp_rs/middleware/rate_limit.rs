@@ -1,56 +1,98 @@
+use std::collections::hash_map::RandomState;
 use std::collections::HashMap;
+use std::hash::BuildHasher;
+use std::sync::atomic::{AtomicU64, Ordering};
+use std::sync::{PoisonError, RwLock};
 use crate::utils::helpers::get_logger;
 use crate::app_errors::AppErrorExt;
 
+/// Number of independently locked shards of the counter map; a power of two.
+const SHARDS: usize = 16;
+
+/// One shard of the counter map.
+type Shard = RwLock<HashMap<String, AtomicU64>>;
+
 /// A sliding-window rate limiter tracking request counts per key.
+///
+/// Shared between request threads: `check` takes `&self`, known clients only
+/// take a shard's read lock, and the counter itself is an atomic.
 pub struct RateLimiter {
     /// Maximum requests allowed in the window.
     max_requests: u64,
     /// Window size in seconds.
     window_secs: u64,
-    /// Request counts per client key.
-    counts: HashMap<String, u64>,
+    /// Request counts per client key, split by key hash so clients in
+    /// different shards never touch the same lock.
+    shards: [Shard; SHARDS],
+    /// Keyed hasher that picks a key's shard.
+    hasher: RandomState,
 }
 
 impl RateLimiter {
     /// Create a new rate limiter with the given limits.
     pub fn new(max_requests: u64, window_secs: u64) -> Self {
         let logger = get_logger("middleware.rate_limit");
-        logger.info(&format!("RateLimiter: max={}, window={}s", max_requests, window_secs));
+        logger.info(format_args!("RateLimiter: max={}, window={}s", max_requests, window_secs));
         Self {
             max_requests,
             window_secs,
-            counts: HashMap::new(),
+            shards: std::array::from_fn(|_| RwLock::new(HashMap::new())),
+            hasher: RandomState::new(),
         }
     }
 
+    /// The shard responsible for `key`.
+    fn shard_for(&self, key: &str) -> &Shard {
+        let hash = self.hasher.hash_one(key);
+        &self.shards[(hash >> 32) as usize & (SHARDS - 1)]
+    }
+
     /// Check if a request from the given key should be allowed.
-    pub fn check(&mut self, key: &str) -> Result<(), AppErrorExt> {
+    pub fn check(&self, key: &str) -> Result<(), AppErrorExt> {
         let logger = get_logger("middleware.rate_limit");
-        let count = self.counts.entry(key.to_string()).or_insert(0);
-        *count += 1;
-        if *count > self.max_requests {
-            logger.warn(&format!("Rate limit exceeded for {}", key));
-            return Err(AppErrorExt::RateLimit {
-                retry_after: self.window_secs,
-            });
+        let shard = self.shard_for(key);
+        // A client already being tracked needs only the shared lock and no
+        // allocation; only a new key takes the write lock and is copied.
+        let seen = shard
+            .read()
+            .unwrap_or_else(PoisonError::into_inner)
+            .get(key)
+            .map(|count| count.fetch_add(1, Ordering::Relaxed) + 1);
+        let count = match seen {
+            Some(count) => count,
+            // Another thread may have added the key between the two locks.
+            None => shard
+                .write()
+                .unwrap_or_else(PoisonError::into_inner)
+                .entry(key.to_string())
+                .or_default()
+                .fetch_add(1, Ordering::Relaxed)
+                + 1,
+        };
+        if count > self.max_requests {
+            logger.warn(format_args!("Rate limit exceeded for {}", key));
+            return Err(AppErrorExt::rate_limit(self.window_secs));
         }
-        logger.info(&format!("Rate limit OK for {}: {}/{}", key, count, self.max_requests));
+        logger.info(format_args!("Rate limit OK for {}: {}/{}", key, count, self.max_requests));
         Ok(())
     }
 
     /// Reset the counter for a specific key.
-    pub fn reset(&mut self, key: &str) {
+    pub fn reset(&self, key: &str) {
         let logger = get_logger("middleware.rate_limit");
-        self.counts.remove(key);
-        logger.info(&format!("Rate limit reset for {}", key));
+        self.shard_for(key).write().unwrap_or_else(PoisonError::into_inner).remove(key);
+        logger.info(format_args!("Rate limit reset for {}", key));
     }
 
     /// Reset all counters.
-    pub fn reset_all(&mut self) {
+    pub fn reset_all(&self) {
         let logger = get_logger("middleware.rate_limit");
-        let count = self.counts.len();
-        self.counts.clear();
-        logger.info(&format!("All rate limits reset: {} keys", count));
+        let mut count = 0;
+        for shard in &self.shards {
+            let mut shard = shard.write().unwrap_or_else(PoisonError::into_inner);
+            count += shard.len();
+            shard.clear();
+        }
+        logger.info(format_args!("All rate limits reset: {} keys", count));
     }
 }
@@ -35,7 +35,7 @@ impl EventRecord {
     /// Create a new event record.
     pub fn new(id: u64, event_type: EventType, payload: &str, actor_id: Option<u64>) -> Self {
         let logger = get_logger("models.event");
-        logger.info(&format!("Creating event: {:?}", event_type));
+        logger.info(format_args!("Creating event: {:?}", event_type));
         Self {
             id,
             event_type,
@@ -48,14 +48,14 @@ impl EventRecord {
     /// Find events by type (simulated).
     pub fn find_by_type(event_type: &EventType) -> Vec<EventRecord> {
         let logger = get_logger("models.event");
-        logger.info(&format!("Looking up events of type: {:?}", event_type));
+        logger.info(format_args!("Looking up events of type: {:?}", event_type));
         Vec::new()
     }
 
     /// Find events by actor (simulated).
     pub fn find_by_actor(actor_id: u64) -> Vec<EventRecord> {
         let logger = get_logger("models.event");
-        logger.info(&format!("Looking up events for actor: {}", actor_id));
+        logger.info(format_args!("Looking up events for actor: {}", actor_id));
         Vec::new()
     }
 }
@@ -33,7 +33,7 @@ impl Notification {
     /// Create a new unread notification.
     pub fn new(id: u64, user_id: u64, channel: NotificationChannel, subject: &str, body: &str) -> Self {
         let logger = get_logger("models.notification");
-        logger.info(&format!("Creating notification {} for user {}", id, user_id));
+        logger.info(format_args!("Creating notification {} for user {}", id, user_id));
         Self {
             id,
             user_id,
@@ -48,13 +48,13 @@ impl Notification {
     pub fn mark_read(&mut self) {
         let logger = get_logger("models.notification");
         self.read = true;
-        logger.info(&format!("Notification {} marked as read", self.id));
+        logger.info(format_args!("Notification {} marked as read", self.id));
     }
 
     /// Find notifications for a user (simulated).
     pub fn find_by_user(user_id: u64) -> Vec<Notification> {
         let logger = get_logger("models.notification");
-        logger.info(&format!("Looking up notifications for user {}", user_id));
+        logger.info(format_args!("Looking up notifications for user {}", user_id));
         Vec::new()
     }
 }
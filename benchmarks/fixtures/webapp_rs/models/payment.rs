@@ -35,7 +35,7 @@ impl Payment {
     /// Create a new pending payment.
     pub fn new(id: u64, user_id: u64, amount: f64, currency: &str, txn_id: &str) -> Self {
         let logger = get_logger("models.payment");
-        logger.info(&format!("Creating payment: {} {} {}", id, amount, currency));
+        logger.info(format_args!("Creating payment: {} {} {}", id, amount, currency));
         Self {
             id,
             user_id,
@@ -50,21 +50,21 @@ impl Payment {
     pub fn complete(&mut self) {
         let logger = get_logger("models.payment");
         self.status = PaymentStatus::Completed;
-        logger.info(&format!("Payment {} completed", self.transaction_id));
+        logger.info(format_args!("Payment {} completed", self.transaction_id));
     }
 
     /// Mark the payment as failed.
     pub fn fail(&mut self, reason: &str) {
         let logger = get_logger("models.payment");
         self.status = PaymentStatus::Failed;
-        logger.info(&format!("Payment {} failed: {}", self.transaction_id, reason));
+        logger.info(format_args!("Payment {} failed: {}", self.transaction_id, reason));
     }
 
     /// Refund the payment.
     pub fn refund(&mut self) {
         let logger = get_logger("models.payment");
         self.status = PaymentStatus::Refunded;
-        logger.info(&format!("Payment {} refunded", self.transaction_id));
+        logger.info(format_args!("Payment {} refunded", self.transaction_id));
     }
 
     /// Check if the payment is completed.
@@ -75,7 +75,7 @@ impl Payment {
     /// Find a payment by transaction ID (simulated).
     pub fn find_by_transaction_id(txn_id: &str) -> Option<Payment> {
         let logger = get_logger("models.payment");
-        logger.info(&format!("Looking up payment by txn: {}", txn_id));
+        logger.info(format_args!("Looking up payment by txn: {}", txn_id));
         None
     }
 }
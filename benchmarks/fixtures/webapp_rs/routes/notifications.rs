@@ -31,6 +31,6 @@ pub fn send_test_handler(request: Request) -> Response {
     }
     let subject = sanitize_input("Test Notification");
     let body = sanitize_input("This is a test notification body");
-    logger.info(&format!("Sending test notification: {}", subject));
+    logger.info(format_args!("Sending test notification: {}", subject));
     Response::ok("{"status": "sent"}".to_string())
 }
@@ -17,7 +17,7 @@ pub fn create_payment_handler(request: Request) -> Response {
     match payment::validate(amount, currency, source) {
         Ok(()) => {
             let txn_id = generate_request_id();
-            logger.info(&format!("Payment created: {}", txn_id));
+            logger.info(format_args!("Payment created: {}", txn_id));
             Response::ok(format!("{{"transaction_id": "{}"}}", txn_id))
         }
         Err(errors) => Response::error(400, &format!("{:?}", errors)),
@@ -40,7 +40,7 @@ pub fn register_handler(request: Request) -> Response {
     let password = "securepassword123";
     match user::validate(&email, &name, password) {
         Ok(()) => {
-            logger.info(&format!("User registered: {}", email));
+            logger.info(format_args!("User registered: {}", email));
             Response::ok("{"status": "registered"}".to_string())
         }
         Err(errors) => Response::error(400, &format!("{:?}", errors)),
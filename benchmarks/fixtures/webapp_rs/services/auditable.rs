@@ -1,14 +1,24 @@
+use std::collections::VecDeque;
+use std::sync::Arc;
+
+use rustc_hash::FxHashMap;
+
 use crate::utils::helpers::get_logger;
 use crate::services::base::{Service, ServiceHealth, BaseServiceImpl};
 
 /// An entry in the audit trail.
+///
+/// Action, actor and resource repeat across entries, so they are stored as
+/// ids into the owning service's symbol table (see `AuditableService::symbol`).
+/// That keeps the row small and makes a resource filter an integer compare.
+/// An id is only meaningful while its entry is still in the log.
 pub struct AuditEntry {
-    /// The action that was performed.
-    pub action: String,
-    /// Who performed the action.
-    pub actor: String,
-    /// The resource affected.
-    pub resource: String,
+    /// Symbol id of the action that was performed.
+    pub action: u32,
+    /// Symbol id of who performed the action.
+    pub actor: u32,
+    /// Symbol id of the resource affected.
+    pub resource: u32,
     /// Additional details about the action.
     pub details: String,
     /// Timestamp of the action.
@@ -24,22 +34,94 @@ pub trait Auditable {
     fn get_audit_trail(&self, resource: Option<&str>, limit: usize) -> Vec<&AuditEntry>;
 }
 
+/// Number of audit entries retained; older entries are dropped first.
+const MAX_AUDIT: usize = 4096;
+
+/// Entries compared per step of a filtered trail scan; one bit each in a u32.
+const LANES: usize = 32;
+
+/// Bitmask of the positions in `column` (at most `LANES` long) equal to `id`.
+/// Built without branches so the compiler can turn it into a vector compare.
+fn match_mask(column: &[u32], id: u32) -> u32 {
+    column
+        .iter()
+        .enumerate()
+        .fold(0, |mask, (i, &r)| mask | (u32::from(r == id) << i))
+}
+
 /// A service that automatically records an audit trail.
 pub struct AuditableService {
     /// The underlying service implementation.
     inner: BaseServiceImpl,
-    /// The stored audit log entries.
-    audit_log: Vec<AuditEntry>,
+    /// The most recent audit entries, oldest at the front.
+    audit_log: VecDeque<AuditEntry>,
+    /// Resource id of each entry in `audit_log`, as a dense column so a
+    /// filtered scan reads four bytes per entry and touches only the rows
+    /// that match.
+    audit_resources: VecDeque<u32>,
+    /// Distinct action, actor and resource names, indexed by symbol id.
+    symbols: Vec<Arc<str>>,
+    /// Number of retained entry fields using each symbol id.
+    symbol_refs: Vec<u32>,
+    /// Ids whose last entry has left the log, reused before new ones so the
+    /// table never outgrows the names the log still holds.
+    free_symbols: Vec<u32>,
+    /// Name to symbol id; keys share their allocation with `symbols`.
+    symbol_ids: FxHashMap<Arc<str>, u32>,
 }
 
 impl AuditableService {
     /// Create a new auditable service with the given name.
     pub fn new(name: &str) -> Self {
         let logger = get_logger("services.auditable");
-        logger.info(&format!("Creating AuditableService: {}", name));
+        logger.info(format_args!("Creating AuditableService: {}", name));
         Self {
             inner: BaseServiceImpl::new(name),
-            audit_log: Vec::new(),
+            audit_log: VecDeque::with_capacity(MAX_AUDIT),
+            audit_resources: VecDeque::with_capacity(MAX_AUDIT),
+            symbols: Vec::new(),
+            symbol_refs: Vec::new(),
+            free_symbols: Vec::new(),
+            symbol_ids: FxHashMap::default(),
+        }
+    }
+
+    /// Return the name behind a symbol id taken from an `AuditEntry`.
+    pub fn symbol(&self, id: u32) -> &str {
+        &self.symbols[id as usize]
+    }
+
+    /// Return the symbol id for `name` and count one more use of it,
+    /// assigning a free or new id if the name is not in the table.
+    fn symbol_id(&mut self, name: &str) -> u32 {
+        if let Some(&id) = self.symbol_ids.get(name) {
+            self.symbol_refs[id as usize] += 1;
+            return id;
+        }
+        let name: Arc<str> = Arc::from(name);
+        let id = match self.free_symbols.pop() {
+            Some(id) => {
+                self.symbols[id as usize] = Arc::clone(&name);
+                self.symbol_refs[id as usize] = 1;
+                id
+            }
+            None => {
+                self.symbols.push(Arc::clone(&name));
+                self.symbol_refs.push(1);
+                (self.symbols.len() - 1) as u32
+            }
+        };
+        self.symbol_ids.insert(name, id);
+        id
+    }
+
+    /// Drop one use of a symbol id, evicting its name once no entry uses it.
+    fn release_symbol(&mut self, id: u32) {
+        let refs = &mut self.symbol_refs[id as usize];
+        *refs -= 1;
+        if *refs == 0 {
+            self.symbol_ids.remove(&self.symbols[id as usize]);
+            self.free_symbols.push(id);
         }
     }
 }
@@ -48,26 +130,57 @@ impl Auditable for AuditableService {
     /// Record an audit entry.
     fn record_audit(&mut self, action: &str, actor: &str, resource: &str, details: &str) {
         let logger = get_logger("services.auditable");
-        logger.info(&format!("Audit: {} {} on {}", actor, action, resource));
-        self.audit_log.push(AuditEntry {
-            action: action.to_string(),
-            actor: actor.to_string(),
-            resource: resource.to_string(),
+        logger.info(format_args!("Audit: {} {} on {}", actor, action, resource));
+        if self.audit_log.len() == MAX_AUDIT {
+            if let Some(oldest) = self.audit_log.pop_front() {
+                self.audit_resources.pop_front();
+                self.release_symbol(oldest.action);
+                self.release_symbol(oldest.actor);
+                self.release_symbol(oldest.resource);
+            }
+        }
+        let entry = AuditEntry {
+            action: self.symbol_id(action),
+            actor: self.symbol_id(actor),
+            resource: self.symbol_id(resource),
             details: details.to_string(),
             timestamp: 0,
-        });
+        };
+        self.audit_resources.push_back(entry.resource);
+        self.audit_log.push_back(entry);
     }
 
     /// Get the audit trail, optionally filtered by resource.
     fn get_audit_trail(&self, resource: Option<&str>, limit: usize) -> Vec<&AuditEntry> {
         let logger = get_logger("services.auditable");
-        logger.info(&format!("Getting audit trail, limit={}", limit));
-        self.audit_log
-            .iter()
-            .filter(|e| resource.map_or(true, |r| e.resource == r))
-            .rev()
-            .take(limit)
-            .collect()
+        logger.info(format_args!("Getting audit trail, limit={}", limit));
+        let mut trail = Vec::with_capacity(limit.min(self.audit_log.len()));
+        let Some(resource) = resource else {
+            trail.extend(self.audit_log.iter().rev().take(limit));
+            return trail;
+        };
+        // A resource with no entry left in the log matches nothing.
+        let Some(&id) = self.symbol_ids.get(resource) else {
+            return trail;
+        };
+        // Newest first: the back slice holds the more recent entries.
+        let (front, back) = self.audit_resources.as_slices();
+        for (base, column) in [(front.len(), back), (0, front)] {
+            let mut start = column.len();
+            for chunk in column.rchunks(LANES) {
+                start -= chunk.len();
+                let mut mask = match_mask(chunk, id);
+                while mask != 0 {
+                    if trail.len() == limit {
+                        return trail;
+                    }
+                    let bit = 31 - mask.leading_zeros() as usize;
+                    mask ^= 1 << bit;
+                    trail.push(&self.audit_log[base + start + bit]);
+                }
+            }
+        }
+        trail
     }
 }
 
@@ -30,7 +30,7 @@ impl AuthenticationService {
         self.inner.require_initialized()
             .map_err(|e| AppError::Internal(e))?;
         let clean_email = sanitize_input(email);
-        logger.info(&format!("Authentication attempt for {}", clean_email));
+        logger.info(format_args!("Authentication attempt for {}", clean_email));
         self.auth.login(&clean_email, password)
     }
 
@@ -34,7 +34,7 @@ impl BaseServiceImpl {
     /// Create a new base service with the given name.
     pub fn new(name: &str) -> Self {
         let logger = get_logger("services.base");
-        logger.info(&format!("Creating service: {}", name));
+        logger.info(format_args!("Creating service: {}", name));
         Self {
             name: name.to_string(),
             initialized: false,
@@ -42,12 +42,21 @@ impl BaseServiceImpl {
     }
 
     /// Check whether the service is initialized and return an error if not.
+    #[inline]
     pub fn require_initialized(&self) -> Result<(), String> {
         if !self.initialized {
-            return Err(format!("{} not initialized", self.name));
+            return Err(self.not_initialized());
         }
         Ok(())
     }
+
+    /// Build the error for a call made before `initialize`. Kept out of line
+    /// and cold so callers inline only the flag test.
+    #[cold]
+    #[inline(never)]
+    fn not_initialized(&self) -> String {
+        format!("{} not initialized", self.name)
+    }
 }
 
 impl Service for BaseServiceImpl {
@@ -55,7 +64,7 @@ impl Service for BaseServiceImpl {
     fn initialize(&mut self) -> Result<(), String> {
         let logger = get_logger("services.base");
         self.initialized = true;
-        logger.info(&format!("{} initialized", self.name));
+        logger.info(format_args!("{} initialized", self.name));
         Ok(())
     }
 
@@ -63,7 +72,7 @@ impl Service for BaseServiceImpl {
     fn shutdown(&mut self) -> Result<(), String> {
         let logger = get_logger("services.base");
         self.initialized = false;
-        logger.info(&format!("{} shut down", self.name));
+        logger.info(format_args!("{} shut down", self.name));
         Ok(())
     }
 
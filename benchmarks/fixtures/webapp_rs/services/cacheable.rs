@@ -1,4 +1,4 @@
-use std::collections::HashMap;
+use rustc_hash::FxHashMap;
 
 use crate::utils::helpers::get_logger;
 use crate::services::base::{Service, ServiceHealth, BaseServiceImpl};
@@ -7,20 +7,23 @@ use crate::services::base::{Service, ServiceHealth, BaseServiceImpl};
 pub struct CacheableService {
     /// The underlying service implementation.
     inner: BaseServiceImpl,
-    /// The in-memory cache store.
-    cache: HashMap<String, String>,
+    /// The in-memory cache store, keyed with FxHash rather than SipHash.
+    cache: FxHashMap<Box<str>, String>,
     /// Default time-to-live in seconds for cache entries.
     default_ttl: u64,
 }
 
+/// Entries the cache can hold before its first rehash.
+const INITIAL_CAPACITY: usize = 1024;
+
 impl CacheableService {
     /// Create a new cacheable service with the given name.
     pub fn new(name: &str) -> Self {
         let logger = get_logger("services.cacheable");
-        logger.info(&format!("Creating CacheableService: {}", name));
+        logger.info(format_args!("Creating CacheableService: {}", name));
         Self {
             inner: BaseServiceImpl::new(name),
-            cache: HashMap::new(),
+            cache: FxHashMap::with_capacity_and_hasher(INITIAL_CAPACITY, Default::default()),
             default_ttl: 300,
         }
     }
@@ -30,11 +33,11 @@ impl CacheableService {
         let logger = get_logger("services.cacheable");
         match self.cache.get(key) {
             Some(val) => {
-                logger.info(&format!("Cache hit: {}", key));
+                logger.info(format_args!("Cache hit: {}", key));
                 Some(val)
             }
             None => {
-                logger.info(&format!("Cache miss: {}", key));
+                logger.info(format_args!("Cache miss: {}", key));
                 None
             }
         }
@@ -43,8 +46,17 @@ impl CacheableService {
     /// Store a value in the cache with the given key.
     pub fn cache_set(&mut self, key: &str, value: &str) {
         let logger = get_logger("services.cacheable");
-        self.cache.insert(key.to_string(), value.to_string());
-        logger.info(&format!("Cache set: {} (ttl={}s)", key, self.default_ttl));
+        // Overwrite in place on update; only a new key needs its own allocation.
+        match self.cache.get_mut(key) {
+            Some(existing) => {
+                existing.clear();
+                existing.push_str(value);
+            }
+            None => {
+                self.cache.insert(key.into(), value.to_string());
+            }
+        }
+        logger.info(format_args!("Cache set: {} (ttl={}s)", key, self.default_ttl));
     }
 
     /// Remove all entries from the cache, returning the number removed.
@@ -52,7 +64,7 @@ impl CacheableService {
         let logger = get_logger("services.cacheable");
         let count = self.cache.len();
         self.cache.clear();
-        logger.info(&format!("Cache cleared: {} entries", count));
+        logger.info(format_args!("Cache cleared: {} entries", count));
         count
     }
 }
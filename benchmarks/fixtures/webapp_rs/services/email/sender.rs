@@ -13,6 +13,34 @@ pub struct EmailMessage {
     pub message_id: String,
 }
 
+/// Substitute `{{key}}` placeholders from `vars` in one left-to-right pass.
+/// Placeholders with no matching var are left as written.
+fn render_template(template: &str, vars: &[(&str, &str)]) -> String {
+    let mut out = String::with_capacity(template.len());
+    let mut rest = template;
+    while let Some(open) = rest.find("{{") {
+        out.push_str(&rest[..open]);
+        let after = &rest[open + 2..];
+        let found = after.find("}}").and_then(|close| {
+            let key = &after[..close];
+            vars.iter().find(|(k, _)| *k == key).map(|(_, value)| (close, *value))
+        });
+        match found {
+            Some((close, value)) => {
+                out.push_str(value);
+                rest = &after[close + 2..];
+            }
+            None => {
+                // Not a known placeholder: keep one brace and rescan after it.
+                out.push('{');
+                rest = &rest[open + 1..];
+            }
+        }
+    }
+    out.push_str(rest);
+    out
+}
+
 /// Sends emails using a configured SMTP-like backend.
 pub struct EmailSender {
     /// The underlying service state.
@@ -27,7 +55,7 @@ impl EmailSender {
     /// Create a new email sender with the given from address.
     pub fn new(from_address: &str) -> Self {
         let logger = get_logger("services.email");
-        logger.info(&format!("Creating EmailSender from={}", from_address));
+        logger.info(format_args!("Creating EmailSender from={}", from_address));
         Self {
             inner: BaseServiceImpl::new("email_sender"),
             from_address: from_address.to_string(),
@@ -42,12 +70,12 @@ impl EmailSender {
         let clean_subject = sanitize_input(subject);
         let clean_body = sanitize_input(body);
         let message_id = generate_request_id();
-        logger.info(&format!("Sending email to={}, subject={}", to, clean_subject));
+        logger.info(format_args!("Sending email to={}, subject={}", to, clean_subject));
         self.sent_count += 1;
         Ok(EmailMessage {
             to: to.to_string(),
-            subject: clean_subject,
-            body: clean_body,
+            subject: clean_subject.into_owned(),
+            body: clean_body.into_owned(),
             message_id,
         })
     }
@@ -61,11 +89,8 @@ impl EmailSender {
     ) -> Result<EmailMessage, String> {
         let logger = get_logger("services.email");
         self.inner.require_initialized()?;
-        let mut body = template.to_string();
-        for (key, value) in vars {
-            body = body.replace(&format!("{{{{{}}}}}", key), value);
-        }
-        logger.info(&format!("Sending template email to={}", to));
+        let body = render_template(template, vars);
+        logger.info(format_args!("Sending template email to={}", to));
         self.send(to, template, &body)
     }
 
@@ -6,17 +6,28 @@ pub struct Notification {
     /// The target user ID.
     pub user_id: String,
     /// The delivery channel (email, sms, push, in_app).
-    pub channel: String,
+    pub channel: &'static str,
     /// The notification subject.
     pub subject: String,
     /// The notification body.
     pub body: String,
     /// Current delivery status.
-    pub status: String,
+    pub status: &'static str,
 }
 
-/// Valid notification channels.
-const VALID_CHANNELS: &[&str] = &["email", "sms", "push", "in_app"];
+/// Return the canonical name of a valid notification channel.
+///
+/// A `match` on the string compiles to a length dispatch followed by a single
+/// compare, and every channel name has a different length.
+fn valid_channel(channel: &str) -> Option<&'static str> {
+    match channel {
+        "email" => Some("email"),
+        "sms" => Some("sms"),
+        "push" => Some("push"),
+        "in_app" => Some("in_app"),
+        _ => None,
+    }
+}
 
 /// Manages notification creation and delivery.
 pub struct NotificationManager {
@@ -44,36 +55,35 @@ impl NotificationManager {
         channel: &str,
         subject: &str,
         body: &str,
-    ) -> Result<&Notification, String> {
+    ) -> Result<&mut Notification, String> {
         let logger = get_logger("services.notification");
         self.inner.require_initialized()?;
-        if !VALID_CHANNELS.contains(&channel) {
-            return Err(format!("Invalid channel: {}", channel));
-        }
-        logger.info(&format!("Queuing notification for {} via {}", user_id, channel));
+        let channel = match valid_channel(channel) {
+            Some(valid) => valid,
+            None => return Err(format!("Invalid channel: {}", channel)),
+        };
+        logger.info(format_args!("Queuing notification for {} via {}", user_id, channel));
+        let idx = self.queue.len();
         self.queue.push(Notification {
             user_id: user_id.to_string(),
-            channel: channel.to_string(),
-            subject: sanitize_input(subject),
-            body: sanitize_input(body),
-            status: "pending".to_string(),
+            channel,
+            subject: sanitize_input(subject).into_owned(),
+            body: sanitize_input(body).into_owned(),
+            status: "pending",
         });
-        Ok(self.queue.last().unwrap())
+        Ok(&mut self.queue[idx])
     }
 
     /// Process all pending notifications in the queue.
     pub fn process_queue(&mut self) -> (usize, usize) {
         let logger = get_logger("services.notification");
-        logger.info(&format!("Processing {} notifications", self.queue.len()));
-        let mut sent = 0usize;
-        let mut failed = 0usize;
-        for notification in &mut self.queue {
-            if notification.status == "pending" {
-                notification.status = "sent".to_string();
-                sent += 1;
-            }
-        }
-        self.queue.retain(|n| n.status == "pending");
+        logger.info(format_args!("Processing {} notifications", self.queue.len()));
+        let sent = self.queue.iter().filter(|n| n.status == "pending").count();
+        let failed = 0usize;
+        // Every pending entry is delivered and nothing else stays queued, so
+        // one count plus clear() replaces mark-then-retain and keeps the
+        // queue's allocation for the next batch.
+        self.queue.clear();
         (sent, failed)
     }
 }
@@ -1,4 +1,7 @@
+use std::sync::Arc;
+
 use crate::utils::helpers::{get_logger, generate_request_id};
+use crate::utils::intern::intern;
 
 /// The result of a gateway API call.
 pub struct GatewayResponse {
@@ -10,12 +13,22 @@ pub struct GatewayResponse {
     pub message: String,
 }
 
-/// A payment gateway client for charging and refunding.
-pub struct PaymentGateway {
+/// Gateway settings that are fixed at construction and never read on the
+/// charge path.
+struct GatewayConfig {
     /// The API key for gateway authentication.
-    api_key: String,
+    api_key: Arc<str>,
     /// The environment (sandbox or production).
-    environment: String,
+    environment: Arc<str>,
+}
+
+/// A payment gateway client for charging and refunding.
+///
+/// The cold configuration lives behind a box so the client itself is just
+/// a pointer and the request counter that `charge` updates.
+pub struct PaymentGateway {
+    /// Construction-time settings.
+    config: Box<GatewayConfig>,
     /// Total number of API requests made.
     request_count: u64,
 }
@@ -24,10 +37,12 @@ impl PaymentGateway {
     /// Create a new payment gateway client.
     pub fn new(api_key: &str, environment: &str) -> Self {
         let logger = get_logger("services.payment.gateway");
-        logger.info(&format!("Gateway initialized: env={}", environment));
+        logger.info(format_args!("Gateway initialized: env={}", environment));
         Self {
-            api_key: api_key.to_string(),
-            environment: environment.to_string(),
+            config: Box::new(GatewayConfig {
+                api_key: Arc::from(api_key),
+                environment: intern(environment),
+            }),
             request_count: 0,
         }
     }
@@ -35,7 +50,7 @@ impl PaymentGateway {
     /// Charge a payment source for the given amount.
     pub fn charge(&mut self, amount: f64, currency: &str, source: &str) -> GatewayResponse {
         let logger = get_logger("services.payment.gateway");
-        logger.info(&format!("Charging {} {} from {}", amount, currency, source));
+        logger.info(format_args!("Charging {} {} from {}", amount, currency, source));
         self.request_count += 1;
         let txn_id = generate_request_id();
         if amount > 10000.0 {
@@ -55,7 +70,7 @@ impl PaymentGateway {
     /// Refund a previously created charge.
     pub fn refund_charge(&mut self, charge_id: &str) -> GatewayResponse {
         let logger = get_logger("services.payment.gateway");
-        logger.info(&format!("Refunding charge {}", charge_id));
+        logger.info(format_args!("Refunding charge {}", charge_id));
         self.request_count += 1;
         GatewayResponse {
             success: true,
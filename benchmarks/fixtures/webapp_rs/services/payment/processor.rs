@@ -2,9 +2,7 @@ use crate::utils::helpers::{get_logger, generate_request_id};
 use crate::services::base::{Service, ServiceHealth, BaseServiceImpl};
 use crate::services::payment::gateway::PaymentGateway;
 use crate::app_errors::AppErrorExt;
-
-/// Supported payment currencies.
-const SUPPORTED_CURRENCIES: &[&str] = &["USD", "EUR", "GBP", "JPY", "CAD"];
+use crate::validators::payment::is_supported_currency;
 
 /// The result of a payment processing operation.
 pub struct PaymentResult {
@@ -47,21 +45,15 @@ impl PaymentProcessor {
     ) -> Result<PaymentResult, AppErrorExt> {
         let logger = get_logger("services.payment.processor");
         self.inner.require_initialized()
-            .map_err(|e| AppErrorExt::Payment {
-                transaction_id: None,
-                message: e,
-            })?;
+            .map_err(|e| AppErrorExt::payment(None, e))?;
         self.validate_payment(amount, currency)?;
-        logger.info(&format!("Processing payment: user={}, amount={} {}", user_id, amount, currency));
+        logger.info(format_args!("Processing payment: user={}, amount={} {}", user_id, amount, currency));
         let txn_id = generate_request_id();
         let gateway_result = self.gateway.charge(amount, currency, source);
         if !gateway_result.success {
-            return Err(AppErrorExt::Payment {
-                transaction_id: Some(txn_id),
-                message: gateway_result.message,
-            });
+            return Err(AppErrorExt::payment(Some(txn_id), gateway_result.message));
         }
-        logger.info(&format!("Payment completed: txn={}", txn_id));
+        logger.info(format_args!("Payment completed: txn={}", txn_id));
         Ok(PaymentResult {
             transaction_id: txn_id,
             status: "completed".to_string(),
@@ -73,13 +65,13 @@ impl PaymentProcessor {
     /// Refund a previously completed payment.
     pub fn refund(&mut self, transaction_id: &str, reason: &str) -> Result<PaymentResult, AppErrorExt> {
         let logger = get_logger("services.payment.processor");
-        logger.info(&format!("Refunding payment: txn={}, reason={}", transaction_id, reason));
+        logger.info(format_args!("Refunding payment: txn={}, reason={}", transaction_id, reason));
         let gateway_result = self.gateway.refund_charge(transaction_id);
         if !gateway_result.success {
-            return Err(AppErrorExt::Payment {
-                transaction_id: Some(transaction_id.to_string()),
-                message: gateway_result.message,
-            });
+            return Err(AppErrorExt::payment(
+                Some(transaction_id.to_string()),
+                gateway_result.message,
+            ));
         }
         Ok(PaymentResult {
             transaction_id: transaction_id.to_string(),
@@ -91,23 +83,17 @@ impl PaymentProcessor {
 
     /// Validate payment parameters before processing.
     fn validate_payment(&self, amount: f64, currency: &str) -> Result<(), AppErrorExt> {
-        if !SUPPORTED_CURRENCIES.contains(&currency) {
-            return Err(AppErrorExt::Validation {
-                field: "currency".to_string(),
-                message: format!("Unsupported currency: {}", currency),
-            });
+        if !is_supported_currency(currency) {
+            return Err(AppErrorExt::validation(
+                "currency",
+                format!("Unsupported currency: {}", currency),
+            ));
         }
         if amount <= 0.0 {
-            return Err(AppErrorExt::Validation {
-                field: "amount".to_string(),
-                message: "Amount must be positive".to_string(),
-            });
+            return Err(AppErrorExt::validation("amount", "Amount must be positive".to_string()));
         }
         if amount > 999999.0 {
-            return Err(AppErrorExt::Validation {
-                field: "amount".to_string(),
-                message: "Amount exceeds maximum".to_string(),
-            });
+            return Err(AppErrorExt::validation("amount", "Amount exceeds maximum".to_string()));
         }
         Ok(())
     }
@@ -27,7 +27,7 @@ impl CleanupTask {
         logger.info("Running cleanup task");
         let cleared = self.cache.clear();
         self.runs += 1;
-        logger.info(&format!("Cleanup complete: {} entries cleared, run #{}", cleared, self.runs));
+        logger.info(format_args!("Cleanup complete: {} entries cleared, run #{}", cleared, self.runs));
         Ok(cleared)
     }
 
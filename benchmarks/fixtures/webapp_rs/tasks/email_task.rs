@@ -28,7 +28,7 @@ impl EmailTask {
         logger.info("Running email task");
         self.sender.send("user@example.com", "Welcome", "Hello!")?;
         self.processed += 1;
-        logger.info(&format!("Email task complete: {} processed", self.processed));
+        logger.info(format_args!("Email task complete: {} processed", self.processed));
         Ok(self.processed)
     }
 
@@ -31,10 +31,10 @@ impl PaymentTask {
         match self.processor.process_payment("user-1", 99.99, "USD", "card_test") {
             Ok(result) => {
                 self.processed += 1;
-                logger.info(&format!("Payment processed: txn={}", result.transaction_id));
+                logger.info(format_args!("Payment processed: txn={}", result.transaction_id));
             }
             Err(e) => {
-                logger.error(&format!("Payment failed: {}", e));
+                logger.error(format_args!("Payment failed: {}", e));
             }
         }
         Ok(self.processed)
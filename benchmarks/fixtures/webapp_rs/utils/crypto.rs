@@ -1,11 +1,15 @@
 /// Cryptographic utility functions.
 
-/// Hash a password using a simple simulated algorithm.
+use sha2::{Digest, Sha256};
+
+/// Hash a password with SHA-256, returned as lowercase hex.
 pub fn hash_password(password: &str) -> String {
-    format!("hashed:{}", password.len())
+    let mut hasher = Sha256::new();
+    hasher.update(password.as_bytes());
+    format!("{:x}", hasher.finalize())
 }
 
 /// Verify a password against a stored hash.
 pub fn verify_password(password: &str, hash: &str) -> bool {
-    hash == &format!("hashed:{}", password.len())
+    hash == hash_password(password)
 }
@@ -1,26 +1,67 @@
-use std::fmt;
+use std::borrow::Cow;
+use std::fmt::{self, Write};
+use std::sync::atomic::{AtomicU64, Ordering};
+use std::sync::OnceLock;
 use std::time::{SystemTime, UNIX_EPOCH};
 
 /// A simple logger that prefixes messages with a module name.
+#[derive(Clone, Copy)]
 pub struct Logger {
     /// The name of the module this logger belongs to.
-    pub name: String,
+    pub name: &'static str,
 }
 
+/// Log severities, least severe first.
+#[derive(Clone, Copy, PartialEq, Eq, PartialOrd, Ord)]
+pub enum Level {
+    /// Informational messages.
+    Info,
+    /// Warnings.
+    Warn,
+    /// Errors.
+    Error,
+}
+
+/// Lowest level that gets printed, read once from `LOG_LEVEL` (info, warn,
+/// error or off; defaults to info).
+fn min_level() -> u8 {
+    static MIN_LEVEL: OnceLock<u8> = OnceLock::new();
+    *MIN_LEVEL.get_or_init(|| match std::env::var("LOG_LEVEL").as_deref() {
+        Ok("warn") => Level::Warn as u8,
+        Ok("error") => Level::Error as u8,
+        Ok("off") => u8::MAX,
+        _ => Level::Info as u8,
+    })
+}
+
+/// Logging methods take any `Display` value, so callers can pass a string
+/// literal or `format_args!(...)` without allocating a `String`. Arguments
+/// are only formatted when their level is enabled.
 impl Logger {
+    /// Whether messages at `level` are printed.
+    pub fn enabled(&self, level: Level) -> bool {
+        level as u8 >= min_level()
+    }
+
     /// Log an informational message.
-    pub fn info(&self, msg: &str) {
-        println!("[{}] INFO: {}", self.name, msg);
+    pub fn info(&self, msg: impl fmt::Display) {
+        if self.enabled(Level::Info) {
+            println!("[{}] INFO: {}", self.name, msg);
+        }
     }
 
     /// Log a warning message.
-    pub fn warn(&self, msg: &str) {
-        println!("[{}] WARN: {}", self.name, msg);
+    pub fn warn(&self, msg: impl fmt::Display) {
+        if self.enabled(Level::Warn) {
+            println!("[{}] WARN: {}", self.name, msg);
+        }
     }
 
     /// Log an error message.
-    pub fn error(&self, msg: &str) {
-        eprintln!("[{}] ERROR: {}", self.name, msg);
+    pub fn error(&self, msg: impl fmt::Display) {
+        if self.enabled(Level::Error) {
+            eprintln!("[{}] ERROR: {}", self.name, msg);
+        }
     }
 }
 
@@ -30,11 +71,12 @@ impl fmt::Display for Logger {
     }
 }
 
-/// Create a new logger instance for the given module name.
-pub fn get_logger(name: &str) -> Logger {
-    Logger {
-        name: name.to_string(),
-    }
+/// Create a logger for the given module name.
+///
+/// Borrows the name instead of copying it, so calling this at the top of a
+/// hot method costs nothing; it is also usable in `static` initializers.
+pub const fn get_logger(name: &'static str) -> Logger {
+    Logger { name }
 }
 
 /// Validate that a request has required fields (path, method).
@@ -48,36 +90,101 @@ pub fn validate_request(path: &str, method: &str) -> Result<(), String> {
     Ok(())
 }
 
-/// Generate a unique request identifier based on timestamp.
+/// Process start time in milliseconds, read once by `generate_request_id`.
+static REQUEST_ID_SEED: OnceLock<u64> = OnceLock::new();
+/// Sequence number for request identifiers within this process.
+static REQUEST_ID_SEQ: AtomicU64 = AtomicU64::new(0);
+
+/// Generate a unique request identifier from the process start time and a
+/// per-process sequence number; the clock is only read on the first call.
 pub fn generate_request_id() -> String {
-    let ts = SystemTime::now()
-        .duration_since(UNIX_EPOCH)
-        .unwrap_or_default()
-        .as_millis();
-    format!("req-{}-{}", ts, ts % 1000)
+    let seed = *REQUEST_ID_SEED.get_or_init(|| {
+        SystemTime::now()
+            .duration_since(UNIX_EPOCH)
+            .unwrap_or_default()
+            .as_millis() as u64
+    });
+    let seq = REQUEST_ID_SEQ.fetch_add(1, Ordering::Relaxed);
+    let mut id = String::with_capacity(40);
+    let _ = write!(id, "req-{}-{}", seed, seq);
+    id
 }
 
 /// Sanitize user input by removing control characters and trimming.
-pub fn sanitize_input(value: &str) -> String {
-    value
-        .chars()
-        .filter(|c| !c.is_control())
-        .collect::<String>()
-        .trim()
-        .to_string()
+///
+/// Clean input comes back borrowed; a copy is made only when control
+/// characters have to be removed.
+pub fn sanitize_input(value: &str) -> Cow<'_, str> {
+    // Control characters outside the trimmed slice are all whitespace, so
+    // when the slice itself has none it is already the answer.
+    let trimmed = value.trim();
+    let clean = if trimmed.is_ascii() {
+        !trimmed.bytes().any(|b| b.is_ascii_control())
+    } else {
+        !trimmed.chars().any(char::is_control)
+    };
+    if clean {
+        return Cow::Borrowed(trimmed);
+    }
+    // Single pass over the bytes while the input is ASCII; the first
+    // non-ASCII byte is a char boundary, so the rest goes through chars().
+    let mut out = String::with_capacity(value.len());
+    for (i, &b) in value.as_bytes().iter().enumerate() {
+        if !b.is_ascii() {
+            out.extend(value[i..].chars().filter(|c| !c.is_control()));
+            break;
+        }
+        if !b.is_ascii_control() {
+            out.push(b as char);
+        }
+    }
+    // Trim in place rather than copying the trimmed slice.
+    let end = out.trim_end().len();
+    out.truncate(end);
+    let start = out.len() - out.trim_start().len();
+    out.drain(..start);
+    Cow::Owned(out)
 }
 
 /// Paginate a slice of items, returning the requested page.
 pub fn paginate<T: Clone>(items: &[T], page: usize, per_page: usize) -> Vec<T> {
-    let start = (page.saturating_sub(1)) * per_page;
-    items.iter().skip(start).take(per_page).cloned().collect()
+    let start = page.saturating_sub(1).saturating_mul(per_page);
+    if start >= items.len() {
+        return Vec::new();
+    }
+    let end = start.saturating_add(per_page).min(items.len());
+    items[start..end].to_vec()
 }
 
 /// Mask sensitive fields in a string value for safe logging.
 pub fn mask_sensitive(value: &str) -> String {
-    if value.len() > 4 {
-        format!("{}***{}", &value[..2], &value[value.len() - 2..])
-    } else {
-        "***".to_string()
+    // Keep the first and last two chars (not bytes) of values longer than
+    // four chars, so multi-byte input never splits a code point.
+    let head_end = value.char_indices().nth(1).map(|(i, c)| i + c.len_utf8());
+    let tail_start = value.char_indices().rev().nth(1).map(|(i, _)| i);
+    match (head_end, tail_start) {
+        (Some(h), Some(t)) if h < t => {
+            let mut masked = String::with_capacity(h + 3 + value.len() - t);
+            masked.push_str(&value[..h]);
+            masked.push_str("***");
+            masked.push_str(&value[t..]);
+            masked
+        }
+        _ => "***".to_string(),
     }
 }
+
+/// Room reserved for the literal part of a `json_body` template.
+const JSON_TEMPLATE_RESERVE: usize = 64;
+
+/// Render a small JSON response body around one value of `value_len` bytes.
+///
+/// `format!` can only guess its output size and may regrow the buffer; a
+/// response template plus its one value fits the reservation made here, so
+/// the body is written with a single allocation. The value is inserted as
+/// is, so it must not need JSON escaping.
+pub fn json_body(value_len: usize, args: fmt::Arguments<'_>) -> String {
+    let mut body = String::with_capacity(JSON_TEMPLATE_RESERVE + value_len);
+    let _ = body.write_fmt(args);
+    body
+}
@@ -0,0 +1,26 @@
+/// String interning for small, highly repetitive values.
+
+use std::sync::{Arc, Mutex, OnceLock, PoisonError};
+
+use rustc_hash::FxHashSet;
+
+/// Process-wide pool of interned strings. Only constructors intern, so one
+/// lock is plenty.
+static POOL: OnceLock<Mutex<FxHashSet<Arc<str>>>> = OnceLock::new();
+
+/// Return the shared copy of `value`, allocating only the first time it is seen.
+///
+/// Interned strings live for the rest of the process, so only intern values
+/// drawn from a small set (actions, actors, resource names), never raw input.
+pub fn intern(value: &str) -> Arc<str> {
+    let mut pool = POOL
+        .get_or_init(|| Mutex::new(FxHashSet::default()))
+        .lock()
+        .unwrap_or_else(PoisonError::into_inner);
+    if let Some(existing) = pool.get(value) {
+        return Arc::clone(existing);
+    }
+    let interned: Arc<str> = Arc::from(value);
+    pool.insert(Arc::clone(&interned));
+    interned
+}
@@ -4,7 +4,7 @@ use crate::utils::helpers::get_logger;
 pub fn validate_not_empty(field: &str, value: &str) -> Result<(), String> {
     let logger = get_logger("validators.common");
     if value.trim().is_empty() {
-        logger.warn(&format!("Validation failed: {} is empty", field));
+        logger.warn(format_args!("Validation failed: {} is empty", field));
         return Err(format!("{} cannot be empty", field));
     }
     Ok(())
@@ -14,7 +14,7 @@ pub fn validate_not_empty(field: &str, value: &str) -> Result<(), String> {
 pub fn validate_max_length(field: &str, value: &str, max: usize) -> Result<(), String> {
     let logger = get_logger("validators.common");
     if value.len() > max {
-        logger.warn(&format!("Validation failed: {} exceeds max length {}", field, max));
+        logger.warn(format_args!("Validation failed: {} exceeds max length {}", field, max));
         return Err(format!("{} exceeds maximum length of {}", field, max));
     }
     Ok(())
@@ -24,17 +24,33 @@ pub fn validate_max_length(field: &str, value: &str, max: usize) -> Result<(), S
 pub fn validate_min_length(field: &str, value: &str, min: usize) -> Result<(), String> {
     let logger = get_logger("validators.common");
     if value.len() < min {
-        logger.warn(&format!("Validation failed: {} below min length {}", field, min));
+        logger.warn(format_args!("Validation failed: {} below min length {}", field, min));
         return Err(format!("{} must be at least {} characters", field, min));
     }
     Ok(())
 }
 
+/// Check that an email contains both an '@' and a '.'.
+pub fn has_email_separators(email: &str) -> bool {
+    // One pass for both separators: bit 0 marks '@', bit 1 marks '.'. Each
+    // chunk folds without branches so it vectorizes; stop once both are seen.
+    let mut seen = 0u8;
+    for chunk in email.as_bytes().chunks(16) {
+        seen |= chunk
+            .iter()
+            .fold(0, |acc, &b| acc | u8::from(b == b'@') | (u8::from(b == b'.') << 1));
+        if seen == 0b11 {
+            break;
+        }
+    }
+    seen == 0b11
+}
+
 /// Validate that a value is a valid email format (simple check).
 pub fn validate_email_format(email: &str) -> Result<(), String> {
     let logger = get_logger("validators.common");
-    if !email.contains('@') || !email.contains('.') {
-        logger.warn(&format!("Invalid email format: {}", email));
+    if !has_email_separators(email) {
+        logger.warn(format_args!("Invalid email format: {}", email));
         return Err("Invalid email format".to_string());
     }
     Ok(())
@@ -44,7 +60,7 @@ pub fn validate_email_format(email: &str) -> Result<(), String> {
 pub fn validate_range(field: &str, value: f64, min: f64, max: f64) -> Result<(), String> {
     let logger = get_logger("validators.common");
     if value < min || value > max {
-        logger.warn(&format!("Validation failed: {} out of range [{}, {}]", field, min, max));
+        logger.warn(format_args!("Validation failed: {} out of range [{}, {}]", field, min, max));
         return Err(format!("{} must be between {} and {}", field, min, max));
     }
     Ok(())
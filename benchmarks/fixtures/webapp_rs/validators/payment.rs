@@ -1,18 +1,45 @@
 use crate::utils::helpers::get_logger;
 use crate::validators::common::{validate_not_empty, validate_range};
 
-/// Supported payment currencies.
-const SUPPORTED_CURRENCIES: &[&str] = &["USD", "EUR", "GBP", "JPY", "CAD"];
+/// Pack a three-letter currency code into a u32 (little-endian, top byte zero).
+const fn currency_code(code: &[u8; 3]) -> u32 {
+    u32::from_le_bytes([code[0], code[1], code[2], 0])
+}
+
+/// Supported payment currencies, as packed codes.
+const USD: u32 = currency_code(b"USD");
+const EUR: u32 = currency_code(b"EUR");
+const GBP: u32 = currency_code(b"GBP");
+const JPY: u32 = currency_code(b"JPY");
+const CAD: u32 = currency_code(b"CAD");
+
+/// Check a currency with one integer match instead of a string compare per
+/// supported code.
+pub fn is_supported_currency(currency: &str) -> bool {
+    match *currency.as_bytes() {
+        [a, b, c] => matches!(u32::from_le_bytes([a, b, c, 0]), USD | EUR | GBP | JPY | CAD),
+        _ => false,
+    }
+}
 
 /// Validate payment request parameters.
 pub fn validate(amount: f64, currency: &str, source: &str) -> Result<(), Vec<String>> {
     let logger = get_logger("validators.payment");
-    logger.info(&format!("Validating payment: {} {} from {}", amount, currency, source));
+    logger.info(format_args!("Validating payment: {} {} from {}", amount, currency, source));
+    // Same single-branch fast path as the user validator.
+    let failed = (amount < 0.01)
+        | (amount > 999999.0)
+        | !is_supported_currency(currency)
+        | source.trim().is_empty();
+    if !failed {
+        logger.info("Payment validation passed");
+        return Ok(());
+    }
     let mut errors = Vec::new();
     if let Err(e) = validate_range("amount", amount, 0.01, 999999.0) {
         errors.push(e);
     }
-    if !SUPPORTED_CURRENCIES.contains(&currency) {
+    if !is_supported_currency(currency) {
         errors.push(format!("Unsupported currency: {}", currency));
     }
     if let Err(e) = validate_not_empty("source", source) {
@@ -22,7 +49,7 @@ pub fn validate(amount: f64, currency: &str, source: &str) -> Result<(), Vec<Str
         logger.info("Payment validation passed");
         Ok(())
     } else {
-        logger.warn(&format!("Payment validation failed: {} errors", errors.len()));
+        logger.warn(format_args!("Payment validation failed: {} errors", errors.len()));
         Err(errors)
     }
 }
@@ -30,7 +57,7 @@ pub fn validate(amount: f64, currency: &str, source: &str) -> Result<(), Vec<Str
 /// Validate refund request parameters.
 pub fn validate_refund(transaction_id: &str, reason: &str) -> Result<(), Vec<String>> {
     let logger = get_logger("validators.payment");
-    logger.info(&format!("Validating refund for txn: {}", transaction_id));
+    logger.info(format_args!("Validating refund for txn: {}", transaction_id));
     let mut errors = Vec::new();
     if let Err(e) = validate_not_empty("transaction_id", transaction_id) {
         errors.push(e);
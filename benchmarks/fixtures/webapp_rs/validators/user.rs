@@ -1,12 +1,25 @@
 use crate::utils::helpers::get_logger;
 use crate::validators::common::{
-    validate_email_format, validate_max_length, validate_min_length, validate_not_empty,
+    has_email_separators, validate_email_format, validate_max_length, validate_min_length,
+    validate_not_empty,
 };
 
 /// Validate user registration input fields.
 pub fn validate(email: &str, name: &str, password: &str) -> Result<(), Vec<String>> {
     let logger = get_logger("validators.user");
-    logger.info(&format!("Validating user registration: {}", email));
+    logger.info(format_args!("Validating user registration: {}", email));
+    // Evaluate every rule with a non-short-circuit `|` and branch once; the
+    // messages are only built when something failed. An email with an '@'
+    // is never blank, so the separator check covers the email rules.
+    let failed = !has_email_separators(email)
+        | name.trim().is_empty()
+        | (name.len() > 100)
+        | (password.len() < 8)
+        | (password.len() > 128);
+    if !failed {
+        logger.info("User validation passed");
+        return Ok(());
+    }
     let mut errors = Vec::new();
     if let Err(e) = validate_not_empty("email", email) {
         errors.push(e);
@@ -30,7 +43,7 @@ pub fn validate(email: &str, name: &str, password: &str) -> Result<(), Vec<Strin
         logger.info("User validation passed");
         Ok(())
     } else {
-        logger.warn(&format!("User validation failed: {} errors", errors.len()));
+        logger.warn(format_args!("User validation failed: {} errors", errors.len()));
         Err(errors)
     }
 }
@@ -0,0 +1,24 @@
+# frozen_string_literal: true
+
+# Behaviour checks for the Ruby fixture that `ruby -c` cannot catch.
+
+require 'minitest/autorun'
+require_relative '../../fixtures/webapp_rb/cache/memory_cache'
+require_relative '../../fixtures/webapp_rb/middleware/rate_limit'
+
+class RateLimitTest < Minitest::Test
+  # A full MemoryCache must still store new counters: TinyLFU admission
+  # would otherwise reject them and every request would look like the first.
+  def test_limit_enforced_when_cache_is_full
+    cache = MemoryCache.new(4)
+    4.times do |i|
+      key = "hot:#{i}"
+      10.times { cache.set(key, i) }
+    end
+    assert_equal 4, cache.size
+
+    limiter = RateLimiter.new(cache, limit: 3, window: 60)
+    allowed = Array.new(6) { limiter.check('client')[:allowed] }
+    assert_equal [true, true, true, false, false, false], allowed
+  end
+end